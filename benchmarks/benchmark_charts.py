@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+
+#Created on Sun Oct 18 20:05:33 2026
+"""
+
+########################################################################################################################
+#
+# Module: benchmark_charts.py
+#
+# Description:
+# Benchmarks rendering each chart function of chart.py. The arguments of each are those output.py passes it when
+# profiling countries from synthetic datafiles, made by generate_data.py with a fixed seed, so every run plots the
+# same series. These are recorded once, before timing, by running the pipeline with output.save_chart() replaced. Each
+# chart is then plotted and saved as SVG, as output.save_chart() does, and as PNG, several times, into memory so that
+# disk speed doesn't affect times. The median time of plotting and saving each format, the SVG size and the figure's
+# artist count are reported, and can be saved as a baseline, and compared with one.
+#
+# Usage:
+# python benchmarks/benchmark_charts.py run [--repeat N] [--only FUNCTION ...] [--output FILE]
+#                                           [--save-baseline NAME] [--compare NAME [--threshold FRACTION]]
+# python benchmarks/benchmark_charts.py compare RESULTS BASELINE [--threshold FRACTION]
+# RESULTS and BASELINE are files saved by --output, or names of baselines saved by --save-baseline.
+#
+########################################################################################################################
+
+# Import Python modules.
+import argparse
+import contextlib
+import inspect
+import io
+import os
+import statistics
+import sys
+import tempfile
+
+# Import benchmark modules, and user modules from the package directory above this one.
+import benchmark_results
+import generate_data
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+import chart
+import output
+import world_energy_data
+
+# Measures reported and compared for each chart function.
+MEASURES = ('svg_median_s', 'png_median_s', 'svg_bytes', 'artists')
+
+# Countries profiled to record the arguments of chart functions.
+COUNTRIES = ['Total World', 'China']
+
+# Seed of the synthetic datafiles generated.
+SEED = 0
+
+# Functions of chart.py that don't plot charts.
+NON_CHART_FUNCTIONS = ('new_figure', 'show_figure', 'style_fingerprint')
+
+
+########################################################################################################################
+#
+# Function: parse_args()
+#
+# Description:
+# Parses command line arguments selecting the command, run or compare, and its options.
+#
+########################################################################################################################
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks rendering each chart function of chart.py.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='Run benchmarks.')
+    run_parser.add_argument('-n', '--repeat', type=int, default=5,
+                            help='Number of times each chart is plotted in each format. Default: %(default)s.')
+    run_parser.add_argument('--only', nargs='+', metavar='FUNCTION', help='Benchmark only the chart functions named.')
+    benchmark_results.add_result_arguments(run_parser)
+    benchmark_results.add_compare_command(commands)
+    return parser.parse_args(argv)
+
+
+########################################################################################################################
+#
+# Function: chart_functions()
+#
+# Description:
+# Returns the names of all functions of chart.py that plot charts.
+#
+########################################################################################################################
+def chart_functions():
+    return [name for name, function in inspect.getmembers(chart, inspect.isfunction)
+            if function.__module__ == chart.__name__ and name not in NON_CHART_FUNCTIONS]
+
+
+########################################################################################################################
+#
+# Function: record_chart_calls()
+#
+# Description:
+# Generates synthetic datafiles in a temporary directory and profiles COUNTRIES, with output.save_chart() replaced by a
+# function recording the first call of each chart function, instead of plotting it. An empty file is saved in place
+# of each chart, so that charts linked into other folders are found. Returns the calls recorded, by function name, as
+# tuples of chart filename, arguments, keyword arguments and whether the chart is cropped.
+#
+########################################################################################################################
+def record_chart_calls():
+    calls = {}
+
+    def record_chart(fig_path, chart_function, *args, tight=True, **kwargs):
+        calls.setdefault(chart_function.__name__, (os.path.basename(fig_path), args, kwargs, tight))
+        open(fig_path, 'w').close()
+
+    working_dir = os.getcwd()
+    save_chart = output.save_chart
+    with tempfile.TemporaryDirectory() as data_dir:
+        try:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                generate_data.generate(data_dir, generate_data.DEFAULT_COUNTRIES, generate_data.DEFAULT_VARS,
+                                       generate_data.DEFAULT_YEARS, SEED)
+                os.chdir(data_dir)
+                output.save_chart = record_chart
+                world_energy_data.main(['--countries', *COUNTRIES, '--workers', '1'])
+        finally:
+            output.save_chart = save_chart
+            os.chdir(working_dir)
+    return calls
+
+
+########################################################################################################################
+#
+# Function: add_derived_calls()
+#
+# Description:
+# Adds calls of chart functions that output.py doesn't use, with arguments taken from those of similar functions, so
+# that every chart function is benchmarked. line_6_subplots() plots the first six series of line_10_subplots(), and
+# treemap_1_subplot() the shares plotted on the left by treemap_2_subplots(). output.py only calls
+# treemap_1_subplot() for final energy of countries without electricity generation data, which aren't profiled.
+#
+########################################################################################################################
+def add_derived_calls(calls):
+    if 'line_6_subplots' not in calls and 'line_10_subplots' in calls:
+        filename, args, kwargs, tight = calls['line_10_subplots']
+        # Arguments are 10 series, 10 colours, country and title, 10 subplot titles, and then the same as
+        # line_6_subplots().
+        series, colors, subplot_titles = args[:6], args[10:16], args[22:28]
+        calls['line_6_subplots'] = (filename, (*series, *colors, *args[20:22], *subplot_titles, *args[32:]), kwargs,
+                                    tight)
+    if 'treemap_1_subplot' not in calls and 'treemap_2_subplots' in calls:
+        filename, args, kwargs, tight = calls['treemap_2_subplots']
+        # Arguments are 2 dataframes, 2 subplot titles, country, title and footer.
+        df0, df1, subplot0_title, subplot1_title, country, title, footer_text = args
+        calls['treemap_1_subplot'] = (filename, (df0, subplot0_title, country, title, '', footer_text), kwargs, tight)
+
+
+########################################################################################################################
+#
+# Function: render()
+#
+# Description:
+# Plots a chart and saves it in the format given to memory, as output.save_chart() does to a file, and returns the
+# figure and the bytes saved.
+#
+########################################################################################################################
+def render(chart_function, args, kwargs, tight, file_format):
+    fig = chart_function(*args, **kwargs)
+    buffer = io.BytesIO()
+    if tight is True:
+        fig.savefig(buffer, format=file_format, bbox_inches='tight', pad_inches=0.2)
+    else:
+        fig.savefig(buffer, format=file_format)
+    return fig, buffer.getvalue()
+
+
+########################################################################################################################
+#
+# Function: run()
+#
+# Description:
+# Records the arguments of chart functions, then plots and saves each selected chart the number of times given in each
+# format, and returns the results. Chart functions without a recorded call, or raising an exception, are reported as
+# not benchmarked, and the others are still run.
+#
+########################################################################################################################
+def run(repeat, only):
+    print('Recording arguments of chart functions.')
+    calls = record_chart_calls()
+    add_derived_calls(calls)
+    results = benchmark_results.new_results('charts', {'countries': COUNTRIES, 'seed': SEED, 'repeat': repeat})
+
+    for name in chart_functions():
+        if only is not None and name not in only:
+            continue
+        if name not in calls:
+            print('Not benchmarked, as no arguments were recorded: ' + name)
+            continue
+        print('Running: ' + name)
+        filename, args, kwargs, tight = calls[name]
+        chart_function = getattr(chart, name)
+        result = {'chart': filename}
+        try:
+            for file_format in ('svg', 'png'):
+                times = benchmark_results.time_call(render, repeat,
+                                                    lambda: (chart_function, args, kwargs, tight, file_format))
+                result[file_format + '_median_s'] = statistics.median(times)
+                result[file_format + '_times_s'] = times
+            fig, svg = render(chart_function, args, kwargs, tight, 'svg')
+        except Exception as error:
+            print('Not benchmarked, as plotting failed: ' + name + ': ' + repr(error))
+            continue
+        result['svg_bytes'] = len(svg)
+        result['artists'] = len(fig.findobj())
+        results['results'][name] = result
+    return results
+
+
+########################################################################################################################
+#
+# Function: main()
+#
+# Description:
+# Runs benchmarks and prints, saves or compares their results, or compares saved results with a baseline. Exits with
+# status 1 if a comparison finds a regression.
+#
+########################################################################################################################
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        paths = benchmark_results.result_paths(args)
+        results = run(args.repeat, args.only)
+        sys.exit(benchmark_results.report(results, paths, MEASURES, args.threshold))
+    sys.exit(benchmark_results.compare_saved(args, MEASURES))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+
+#Created on Sun Oct 18 19:10:54 2026
+"""
+
+########################################################################################################################
+#
+# Module: benchmark_pipeline.py
+#
+# Description:
+# Benchmarks the stages of importing, collating and processing data, and the end-to-end profile of a country, using
+# input datafiles in a directory, such as those made by generate_data.py. Each benchmark is run several times from the
+# same state, and the median and minimum times are reported. Results can be saved as a baseline, and compared with
+# one, to show speedups or catch regressions.
+#
+# Usage:
+# python benchmarks/benchmark_pipeline.py run DIR [--repeat N] [--country NAME] [--only NAME ...] [--output FILE]
+#                                                 [--save-baseline NAME] [--compare NAME [--threshold FRACTION]]
+# python benchmarks/benchmark_pipeline.py compare RESULTS BASELINE [--threshold FRACTION]
+# RESULTS and BASELINE are files saved by --output, or names of baselines saved by --save-baseline.
+#
+########################################################################################################################
+
+# Import Python modules.
+import argparse
+import contextlib
+import copy
+import os
+import shutil
+import sys
+import tempfile
+
+# Import benchmark modules, and user modules from the package directory above this one.
+import benchmark_results
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+import user_globals
+import collate
+import process
+import world_energy_data
+
+# Measures reported and compared for each benchmark.
+MEASURES = ('median_s', 'min_s')
+
+
+########################################################################################################################
+#
+# Function: parse_args()
+#
+# Description:
+# Parses command line arguments selecting the command, run or compare, and its options.
+#
+########################################################################################################################
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks importing, collating and processing data.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run_parser = commands.add_parser('run', help='Run benchmarks.')
+    run_parser.add_argument('directory', help='Directory of input datafiles, e.g. made by generate_data.py.')
+    run_parser.add_argument('-n', '--repeat', type=int, default=5,
+                            help='Number of times each benchmark is run. Default: %(default)s.')
+    run_parser.add_argument('-c', '--country', default='China',
+                            help='EI name of the country collated and profiled. Default: %(default)s.')
+    run_parser.add_argument('--only', nargs='+', metavar='NAME', help='Run only the benchmarks named.')
+    benchmark_results.add_result_arguments(run_parser)
+    benchmark_results.add_compare_command(commands)
+    return parser.parse_args(argv)
+
+
+########################################################################################################################
+#
+# Function: clear_cache()
+#
+# Description:
+# Deletes the cache directory, so that datasets are parsed and collated from input files.
+#
+########################################################################################################################
+def clear_cache():
+    if user_globals.Constant.CACHE_DIR.value is not None:
+        shutil.rmtree(user_globals.Constant.CACHE_DIR.value, ignore_errors=True)
+
+
+########################################################################################################################
+#
+# Function: profile_country()
+#
+# Description:
+# Runs world_energy_data.py from input files, without cached data, to generate all chart groups of a country's profile
+# in a new output directory, which is deleted afterwards.
+#
+########################################################################################################################
+def profile_country(country):
+    output_dir = tempfile.mkdtemp(prefix='benchmark_charts_', dir='.')
+    try:
+        world_energy_data.main(['--countries', country, '--charts', *world_energy_data.PROFILE_CHART_GROUPS,
+                                '--output-dir', output_dir, '--workers', '1'])
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+########################################################################################################################
+#
+# Function: benchmarks()
+#
+# Description:
+# Returns the benchmarks run, as tuples of name, function, and setup function (or None) returning the arguments of
+# function (see benchmark_results.time_call()). Datasets used by several benchmarks are imported and collated once,
+# before any are timed.
+#
+########################################################################################################################
+def benchmarks(country):
+    clear_cache()
+    gcp_data, gcp_co2_rcp_pathways, esrl_data, ei_data, wb_data = collate.import_gcp_esrl_ei_pop_data()
+    ei_cube = collate.build_ei_cube(ei_data)
+    pc_emissions = collate.per_capita_emissions(ei_cube, wb_data)
+    co2_by_sector_Mt, tfc_TJ = collate.import_iea_data(country)
+    producer_shares = collate.fossil_fuel_producer_shares(ei_data)
+
+    # Returns a newly collated energy system of the country, which process functions modify.
+    def energy_system():
+        return (collate.populate_energy_system(country, ei_cube, copy.deepcopy(co2_by_sector_Mt),
+                                               copy.deepcopy(tfc_TJ), pc_emissions),)
+
+    return [
+        ('import_gcp_esrl_ei_pop_data (uncached)', collate.import_gcp_esrl_ei_pop_data,
+         lambda: clear_cache() or ()),
+        ('import_gcp_esrl_ei_pop_data (cached)', collate.import_gcp_esrl_ei_pop_data, None),
+        ('build_ei_cube', collate.build_ei_cube, lambda: (ei_data,)),
+        ('co2_data', collate.co2_data, lambda: (ei_cube, gcp_data, gcp_co2_rcp_pathways, esrl_data)),
+        ('per_capita_emissions', collate.per_capita_emissions, lambda: (ei_cube, wb_data)),
+        ('rankings', collate.rankings, lambda: (ei_cube,)),
+        ('import_iea_data', collate.import_iea_data, lambda: (country,)),
+        ('populate_energy_system', collate.populate_energy_system,
+         lambda: (country, ei_cube, copy.deepcopy(co2_by_sector_Mt), copy.deepcopy(tfc_TJ), pc_emissions)),
+        ('process.primary_energy', process.primary_energy, energy_system),
+        ('process.electricity', process.electricity, energy_system),
+        ('process.final_energy', process.final_energy, energy_system),
+        ('fossil_fuel_producer_shares', collate.fossil_fuel_producer_shares, lambda: (ei_data,)),
+        ('major_fossil_fuel_production', collate.major_fossil_fuel_production,
+         lambda: (*producer_shares, ei_cube)),
+        ('profile (end to end)', profile_country, lambda: clear_cache() or (country,)),
+    ]
+
+
+########################################################################################################################
+#
+# Function: run()
+#
+# Description:
+# Runs the benchmarks selected in the directory of input datafiles, and returns their results. Output printed by the
+# functions benchmarked is discarded.
+#
+########################################################################################################################
+def run(directory, repeat, country, only):
+    os.chdir(directory)
+    results = benchmark_results.new_results('pipeline', {
+        'ei_file_bytes': os.path.getsize(user_globals.Constant.EI_FILENAME.value),
+        'country': country,
+        'repeat': repeat,
+    })
+    with open(os.devnull, 'w') as devnull:
+        with contextlib.redirect_stdout(devnull):
+            selected = [benchmark for benchmark in benchmarks(country) if only is None or benchmark[0] in only]
+        for name, function, setup in selected:
+            print('Running: ' + name)
+            with contextlib.redirect_stdout(devnull):
+                times = benchmark_results.time_call(function, repeat, setup)
+            results['results'][name] = benchmark_results.summarise_times(times)
+    return results
+
+
+########################################################################################################################
+#
+# Function: main()
+#
+# Description:
+# Runs benchmarks and prints, saves or compares their results, or compares saved results with a baseline. Exits with
+# status 1 if a comparison finds a regression.
+#
+########################################################################################################################
+def main(argv=None):
+    args = parse_args(argv)
+    if args.command == 'run':
+        # Resolve paths of results before changing to the directory of input datafiles.
+        paths = benchmark_results.result_paths(args)
+        results = run(args.directory, args.repeat, args.country, args.only)
+        sys.exit(benchmark_results.report(results, paths, MEASURES, args.threshold))
+    sys.exit(benchmark_results.compare_saved(args, MEASURES))
+
+
+if __name__ == '__main__':
+    main()
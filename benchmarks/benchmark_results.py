@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+
+#Created on Sun Oct 18 18:40:27 2026
+"""
+
+########################################################################################################################
+#
+# Module: benchmark_results.py
+#
+# Description:
+# Times benchmarks, and saves, prints and compares their results, for the benchmark scripts in this folder. Results of
+# a run are saved as JSON, with the parameters of the run and the machine, and may also be saved as a named baseline in
+# the folder baselines, against which later runs are compared. Baselines are specific to the machine on which they're
+# made, so they aren't committed.
+#
+########################################################################################################################
+
+# Import Python modules.
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+# Folder of saved baselines.
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines')
+
+# Fractional increase of a measure, relative to the baseline, that's reported as a regression.
+REGRESSION_THRESHOLD = 0.1
+
+
+########################################################################################################################
+#
+# Function: add_result_arguments()
+#
+# Description:
+# Adds the options of a benchmark script's run command that save results, or compare them with a baseline.
+#
+########################################################################################################################
+def add_result_arguments(run_parser):
+    run_parser.add_argument('-o', '--output', help='File in which results are saved as JSON.')
+    run_parser.add_argument('--save-baseline', metavar='NAME', help='Save results as the baseline named.')
+    run_parser.add_argument('--compare', metavar='NAME', help='Compare results with a baseline or results file.')
+    add_threshold_argument(run_parser)
+
+
+########################################################################################################################
+#
+# Function: add_compare_command()
+#
+# Description:
+# Adds a benchmark script's compare command, which compares saved results with a baseline.
+#
+########################################################################################################################
+def add_compare_command(commands):
+    compare_parser = commands.add_parser('compare', help='Compare saved results with a baseline.')
+    compare_parser.add_argument('results', help='Results file, or name of baseline.')
+    compare_parser.add_argument('baseline', help='Baseline file, or name of baseline.')
+    add_threshold_argument(compare_parser)
+
+
+########################################################################################################################
+#
+# Function: add_threshold_argument()
+#
+# Description:
+# Adds the option setting the fractional increase of a measure reported as a regression by comparisons.
+#
+########################################################################################################################
+def add_threshold_argument(parser):
+    parser.add_argument('-t', '--threshold', type=float, default=REGRESSION_THRESHOLD,
+                        help='Fractional increase reported as a regression. Default: %(default)s.')
+
+
+########################################################################################################################
+#
+# Function: time_call()
+#
+# Description:
+# Calls function the number of times given, and returns a list of the wall time in seconds of each call. If setup is
+# given, it's called before each call, untimed, and function is called with the tuple of arguments it returns, so that
+# each call starts from the same state.
+#
+########################################################################################################################
+def time_call(function, repeat, setup=None):
+    times = []
+    for i in range(repeat):
+        args = setup() if setup is not None else ()
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+########################################################################################################################
+#
+# Function: summarise_times()
+#
+# Description:
+# Returns the result of a benchmark from its times: the median and minimum, and all times in seconds.
+#
+########################################################################################################################
+def summarise_times(times):
+    return {'median_s': statistics.median(times), 'min_s': min(times), 'times_s': times}
+
+
+########################################################################################################################
+#
+# Function: new_results()
+#
+# Description:
+# Returns a dictionary recording the results of a benchmark run, with the name of the benchmark script, the
+# parameters of the run, and the versions of Python and the platform. Results of each benchmark are added to
+# 'results', by name.
+#
+########################################################################################################################
+def new_results(benchmark, parameters):
+    return {
+        'benchmark': benchmark,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'machine': platform.node(),
+        'parameters': parameters,
+        'results': {},
+    }
+
+
+########################################################################################################################
+#
+# Function: baseline_path()
+#
+# Description:
+# Returns the path of a results file. Names without a folder or extension are those of baselines in BASELINE_DIR.
+#
+########################################################################################################################
+def baseline_path(name):
+    if os.path.dirname(name) == '' and not name.endswith('.json'):
+        return os.path.join(BASELINE_DIR, name + '.json')
+    return name
+
+
+########################################################################################################################
+#
+# Function: save_results()
+#
+# Description:
+# Saves results as JSON, to a file or as a named baseline (see baseline_path()).
+#
+########################################################################################################################
+def save_results(results, name):
+    path = baseline_path(name)
+    directory = os.path.dirname(path)
+    if directory != '':
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=1)
+    print('Results saved to: ' + path)
+
+
+########################################################################################################################
+#
+# Function: load_results()
+#
+# Description:
+# Loads results saved by save_results(), from a file or a named baseline.
+#
+########################################################################################################################
+def load_results(name):
+    with open(baseline_path(name)) as f:
+        return json.load(f)
+
+
+########################################################################################################################
+#
+# Function: format_measure()
+#
+# Description:
+# Returns a measure formatted for tables, with times in seconds to three decimal places and other measures as integers.
+#
+########################################################################################################################
+def format_measure(measure, value):
+    if value is None:
+        return '-'
+    return '{:.3f}'.format(value) if measure.endswith('_s') else '{:.0f}'.format(value)
+
+
+########################################################################################################################
+#
+# Function: print_results()
+#
+# Description:
+# Prints a table of the measures given for each benchmark of results.
+#
+########################################################################################################################
+def print_results(results, measures):
+    row = '{:<44}' + '{:>14}' * len(measures)
+    print('\n' + row.format('Benchmark', *measures))
+    for name, result in results['results'].items():
+        print(row.format(name[:44], *[format_measure(measure, result.get(measure)) for measure in measures]))
+
+
+########################################################################################################################
+#
+# Function: compare_results()
+#
+# Description:
+# Prints a table comparing the measures given of each benchmark in both results with the baseline, as the ratio of the
+# current value to that of the baseline. Increases of more than threshold, as a fraction of the baseline, are marked
+# as regressions. Differing parameters, Python versions or platforms are reported first, since they make results
+# incomparable. Returns the names of benchmarks with regressions.
+#
+########################################################################################################################
+def compare_results(results, baseline, measures, threshold=REGRESSION_THRESHOLD):
+    for field in ('benchmark', 'parameters', 'python', 'platform', 'machine'):
+        if results.get(field) != baseline.get(field):
+            print('Warning: ' + field + ' differs from baseline: ' + str(results.get(field)) + ' (baseline ' +
+                  str(baseline.get(field)) + ')')
+
+    regressions = []
+    row = '{:<44}' + '{:>22}' * len(measures) + '  {}'
+    print('\n' + row.format('Benchmark', *[measure + ' (ratio)' for measure in measures], ''))
+    for name, result in results['results'].items():
+        if name not in baseline['results']:
+            print(row.format(name[:44], *['new'] * len(measures), ''))
+            continue
+        columns = []
+        regressed = False
+        for measure in measures:
+            value = result.get(measure)
+            base_value = baseline['results'][name].get(measure)
+            if value is None or base_value is None:
+                columns.append('-')
+                continue
+            ratio = value / base_value if base_value != 0 else float('inf') if value != 0 else 1.0
+            regressed = regressed or ratio > 1 + threshold
+            columns.append(format_measure(measure, value) + ' (' + '{:.2f}'.format(ratio) + ')')
+        if regressed:
+            regressions.append(name)
+        print(row.format(name[:44], *columns, 'REGRESSION' if regressed else ''))
+    for name in baseline['results']:
+        if name not in results['results']:
+            print(row.format(name[:44], *['missing'] * len(measures), ''))
+
+    if regressions:
+        print('\n' + str(len(regressions)) + ' benchmark(s) regressed by more than ' +
+              '{:.0%}'.format(threshold) + ' of the baseline.')
+    else:
+        print('\nNo regressions of more than ' + '{:.0%}'.format(threshold) + ' of the baseline.')
+    return regressions
+
+
+########################################################################################################################
+#
+# Function: result_paths()
+#
+# Description:
+# Returns the absolute paths of the output file, baseline saved and baseline compared given by the options of a run
+# command (None where not given), so that they're unaffected by benchmarks changing the working directory.
+#
+########################################################################################################################
+def result_paths(args):
+    return [os.path.abspath(baseline_path(name)) if name is not None else None
+            for name in (args.output, args.save_baseline, args.compare)]
+
+
+########################################################################################################################
+#
+# Function: report()
+#
+# Description:
+# Prints the results of a run, saves them to the output file and as a baseline, and compares them with a baseline, as
+# given by result_paths(), reporting increases of more than threshold as regressions. Returns the exit status of the
+# script, which is 1 if there are regressions.
+#
+########################################################################################################################
+def report(results, paths, measures, threshold=REGRESSION_THRESHOLD):
+    output, baseline, compare = paths
+    print_results(results, measures)
+    if output is not None:
+        save_results(results, output)
+    if baseline is not None:
+        save_results(results, baseline)
+    if compare is not None and compare_results(results, load_results(compare), measures, threshold):
+        return 1
+    return 0
+
+
+########################################################################################################################
+#
+# Function: compare_saved()
+#
+# Description:
+# Compares saved results with a baseline, as given by the options of the compare command. Returns the exit status of
+# the script, which is 1 if there are regressions.
+#
+########################################################################################################################
+def compare_saved(args, measures):
+    regressions = compare_results(load_results(args.results), load_results(args.baseline), measures, args.threshold)
+    return 1 if regressions else 0
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+
+#Created on Sun Oct 18 18:02:11 2026
+"""
+
+########################################################################################################################
+#
+# Module: generate_data.py
+#
+# Description:
+# Generates synthetic input datafiles, in the formats read by collate.py, at a configurable scale, so that the
+# pipeline can be benchmarked without the published datasets, and with larger ones than are published today. Files
+# are named as in user_globals.Constant, in the directory given:
+# 1. Energy Institute (EI) narrow format CSV, of countries x variables x years, including all variables used and
+#    further unused ones, which are parsed but dropped by collate.import_ei_data().
+# 2. IEA CO2 emissions by sector and total final consumption CSVs for each named country.
+# 3. Global Carbon Project (GCP) workbook, with the sheets and header rows read by collate.import_gcp_data().
+# 4. World Bank population CSV, with a row for every country in the EI data and the world.
+# NOAA ESRL datafiles and GCP emission pathways are copied from this package, as their size doesn't depend on the
+# number of countries.
+# Values are random, from a seeded generator, but totals are consistent (e.g. 'Total World' is the sum of countries).
+#
+# Usage: python benchmarks/generate_data.py DIR [--scale F] [--countries N] [--vars N] [--years N] [--seed N]
+#
+########################################################################################################################
+
+# Import Python modules.
+import argparse
+import os
+import shutil
+import sys
+import numpy as np
+import pandas as pd
+
+# Import user modules, from the package directory above this one.
+PACKAGE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PACKAGE_DIR)
+import user_globals
+import collate
+
+# Default dimensions of the EI data generated, similar to those of the published dataset. --scale multiplies the
+# number of countries, and so the number of rows of the EI and World Bank data and the number of IEA files.
+DEFAULT_COUNTRIES = 110
+DEFAULT_VARS = 90
+DEFAULT_YEARS = 61
+
+# Final year of generated data.
+END_YEAR = 2025
+
+# First years of electricity data, and of the GCP fossil emissions and carbon budget sheets, as in published data.
+# Earlier start years are used if more years are generated.
+ELECTRICITY_START_YR = 1985
+GCP_EMISSIONS_START_YR = 1850
+GCP_BUDGET_START_YR = 1959
+
+# Named countries, with their ISO codes, for which IEA files are generated. Charts assign colours to these, and they
+# include those profiled by benchmarks. Further countries are named 'Country N'.
+NAMED_COUNTRIES = {
+    'China': 'CHN', 'US': 'USA', 'India': 'IND', 'Russian Federation': 'RUS', 'Japan': 'JPN', 'Iran': 'IRN',
+    'Indonesia': 'IDN', 'Saudi Arabia': 'SAU', 'South Korea': 'KOR', 'Germany': 'DEU', 'Canada': 'CAN',
+    'Mexico': 'MEX', 'Brazil': 'BRA', 'Turkiye': 'TUR', 'South Africa': 'ZAF', 'Australia': 'AUS', 'Kuwait': 'KWT',
+    'Iraq': 'IRQ', 'United Arab Emirates': 'ARE', 'Norway': 'NOR', 'Algeria': 'DZA', 'Qatar': 'QAT',
+    'France': 'FRA', 'United Kingdom': 'GBR', 'Singapore': 'SGP',
+}
+
+# Regions, which have no ISO code, and are excluded from 'Total World'.
+REGIONS = ('Total Africa', 'Other Africa', 'Total Asia Pacific', 'Other Asia Pacific', 'USSR')
+
+# EI variables whose rows are omitted for some countries, as not every country produces fossil fuels or generates
+# nuclear power.
+SPARSE_VARS = ('coalprod_ej', 'oilprod_mt', 'gasprod_ej', 'nuclear_tes_ej', 'nuclear_twh')
+
+# Population of countries in World Bank data but not EI data, as a fraction of that of countries in both.
+WB_OTHER_POPULATION_SHARE = 0.05
+
+# Columns of the GCP sheets, after the year, in the order of the published workbook.
+GCP_EMISSIONS_COLUMNS = ('fossil.emissions.excluding.carbonation', 'Coal', 'Oil', 'Gas', 'Cement.emission', 'Flaring',
+                         'Other', 'Per.Capita')
+GCP_BUDGET_COLUMNS = ('fossil emissions excluding carbonation', 'land-use change emissions', 'atmospheric growth',
+                      'ocean sink', 'land sink', 'cement carbonation sink', 'budget imbalance',
+                      'fossil emissions including carbonation')
+
+# Columns of the IEA files, after the year.
+IEA_CO2_COLUMNS = ('Electricity and heat producers', 'Other energy industries', 'Transport Sector', 'Industry Sector',
+                   'Commercial and Public Services', 'Residential', 'Agriculture/Forestry', 'Fishing',
+                   'Non-specified (Other)')
+IEA_TFC_COLUMNS = ('Coal and coal products', 'Primary oil', 'Oil products', 'Natural gas',
+                   'Solar, wind and other renewables', 'Biofuels and waste', 'Electricity', 'Heat')
+
+
+########################################################################################################################
+#
+# Function: parse_args()
+#
+# Description:
+# Parses command line arguments giving the output directory and the dimensions of the data generated.
+#
+########################################################################################################################
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Generates synthetic input datafiles for benchmarking.')
+    parser.add_argument('directory', help='Directory in which datafiles are saved. Created if needed.')
+    parser.add_argument('-s', '--scale', type=float, default=1.0,
+                        help='Multiplies the default number of countries. Default: %(default)s.')
+    parser.add_argument('-c', '--countries', type=int,
+                        help='Number of countries, including named countries and regions. Overrides --scale.')
+    parser.add_argument('-v', '--vars', type=int, default=DEFAULT_VARS,
+                        help='Number of EI variables, including all those used. Default: %(default)s.')
+    parser.add_argument('-y', '--years', type=int, default=DEFAULT_YEARS,
+                        help='Number of years of EI data, ending in ' + str(END_YEAR) + '. Default: %(default)s.')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of random values. Default: %(default)s.')
+    return parser.parse_args(argv)
+
+
+########################################################################################################################
+#
+# Function: country_list()
+#
+# Description:
+# Returns the names and ISO codes of the number of countries given, which are the named countries, the regions, and
+# then countries named 'Country N', whose four letter codes don't coincide with real ISO codes. 'Total World' is
+# added by ei_data().
+#
+########################################################################################################################
+def country_list(number):
+    names = list(NAMED_COUNTRIES) + list(REGIONS)
+    codes = list(NAMED_COUNTRIES.values()) + [None] * len(REGIONS)
+    for i in range(number - len(names)):
+        names.append('Country ' + str(i + 1))
+        codes.append('X' + ''.join(chr(ord('A') + i // 26 ** power % 26) for power in (2, 1, 0)))
+    return names[:max(number, len(NAMED_COUNTRIES))], codes[:max(number, len(NAMED_COUNTRIES))]
+
+
+########################################################################################################################
+#
+# Function: ei_data()
+#
+# Description:
+# Returns a dataframe of EI data in narrow format, with a row per country, year and variable. Each country's values
+# are its own size, times a factor per variable, growing over time with noise. Electricity variables start in
+# ELECTRICITY_START_YR, and variables in SPARSE_VARS are omitted for some countries other than those named. Rows of
+# 'Total World' are the sum of all countries other than regions.
+#
+########################################################################################################################
+def ei_data(rng, names, codes, ei_vars, years):
+    n_countries, n_vars, n_years = len(names), len(ei_vars), len(years)
+    size = rng.uniform(0.5, 20, n_countries)
+    size[:len(NAMED_COUNTRIES)] = rng.uniform(100, 1000, len(NAMED_COUNTRIES))
+    size[names.index('China')] = 3000
+    size[names.index('US')] = 2000
+    var_factor = rng.uniform(0.1, 1.0, n_vars)
+    var_factor[ei_vars.index('elect_twh')] *= 8
+    growth = 1 + 0.02 * (years - years[0])
+    values = (size[:, np.newaxis, np.newaxis] * var_factor[np.newaxis, :, np.newaxis] * growth *
+              rng.uniform(0.95, 1.05, (n_countries, n_vars, n_years))).round(4)
+
+    present = np.ones(values.shape, dtype=bool)
+    electricity_vars = np.array([var.endswith('_twh') or var.startswith('electbyfuel') for var in ei_vars])
+    present[:, electricity_vars, :] &= years >= min(ELECTRICITY_START_YR, years[-1])
+    for var in SPARSE_VARS:
+        omitted = rng.random(n_countries) < 0.3
+        omitted[:len(NAMED_COUNTRIES)] = False
+        present[omitted, ei_vars.index(var), :] = False
+
+    # Add 'Total World', summing countries but not regions.
+    countries_only = np.array([name not in REGIONS for name in names])
+    world = np.where(present[countries_only], values[countries_only], 0).sum(axis=0).round(4)
+    values = np.concatenate([values, world[np.newaxis]])
+    present = np.concatenate([present, present[countries_only].any(axis=0)[np.newaxis]])
+    names = names + ['Total World']
+    codes = codes + ['WLD']
+
+    country_i, var_i, year_i = np.nonzero(present)
+    region = np.where(countries_only, 'Synthetic Region', 'Region')
+    return pd.DataFrame({
+        'Country': np.array(names, dtype=object)[country_i],
+        'Year': years[year_i],
+        'ISO3166_alpha3': np.array(codes, dtype=object)[country_i],
+        'Region': np.append(region, 'World')[country_i],
+        'OECD': 0,
+        'Var': np.array(ei_vars, dtype=object)[var_i],
+        'Value': values[country_i, var_i, year_i],
+    })
+
+
+########################################################################################################################
+#
+# Function: write_iea_files()
+#
+# Description:
+# Saves the IEA CO2 emissions by sector and total final consumption files of each named country and the world, with
+# the three lines of source and licence text before the header that collate.import_iea_data() skips. Years end one
+# year before EI data, as IEA data is published later.
+#
+########################################################################################################################
+def write_iea_files(rng, directory, years):
+    iea_years = years[:-1]
+    for country in ['Total World'] + list(NAMED_COUNTRIES):
+        co2_filename, tfc_filename = collate.iea_filenames(country)
+        for filename, columns, units, size in ((co2_filename, IEA_CO2_COLUMNS, 'MtCO2', 100),
+                                               (tfc_filename, IEA_TFC_COLUMNS, 'TJ', 1e5)):
+            data = pd.DataFrame(
+                (size * rng.uniform(0.1, 1.0, len(columns)) * rng.uniform(0.9, 1.1, (len(iea_years), len(columns))))
+                .round(3), index=iea_years, columns=columns)
+            data['Units'] = units
+            with open(os.path.join(directory, filename), 'w') as f:
+                f.write('Source: Synthetic data generated for benchmarking\nNot IEA data\n\n')
+                data.to_csv(f)
+
+
+########################################################################################################################
+#
+# Function: write_gcp_workbook()
+#
+# Description:
+# Saves a GCP workbook with the sheets read by collate.import_gcp_data(), each with its header on the row that
+# collate.import_gcp_data() expects and a units row above it. Values are in GtC/yr, growing over time.
+#
+########################################################################################################################
+def write_gcp_workbook(rng, directory, years):
+    path = os.path.join(directory, user_globals.Constant.GCP_FILENAME.value)
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        for sheet_name, header_row, start_year, columns in (
+                ('Fossil Emissions by Category', 8, GCP_EMISSIONS_START_YR, GCP_EMISSIONS_COLUMNS),
+                ('Global Carbon Budget', 21, GCP_BUDGET_START_YR, GCP_BUDGET_COLUMNS)):
+            gcp_years = np.arange(min(start_year, years[0]), years[-1] + 1)
+            growth = np.linspace(0.05, 1, len(gcp_years))[:, np.newaxis]
+            data = pd.DataFrame(10 * growth * rng.uniform(0.05, 1.0, len(columns)), columns=columns)
+            data.insert(0, 'Year', gcp_years)
+            pd.DataFrame([['Synthetic data generated for benchmarking'], ['GtC/yr']]).to_excel(
+                writer, sheet_name=sheet_name, startrow=header_row - 2, index=False, header=False)
+            data.to_excel(writer, sheet_name=sheet_name, startrow=header_row, index=False)
+
+
+########################################################################################################################
+#
+# Function: write_wb_file()
+#
+# Description:
+# Saves a World Bank population CSV, with the lines before the header that collate.import_wb_data() skips, and a row
+# for each country with an ISO code, and the world ('WLD'). As in published data, world population includes that of
+# countries not in EI data, taken to be WB_OTHER_POPULATION_SHARE of the total of those that are.
+#
+########################################################################################################################
+def write_wb_file(rng, directory, names, codes, years):
+    named = [(name, code) for name, code in zip(names, codes) if code is not None]
+    population = rng.uniform(1e5, 1e8, (len(named), 1)) * np.linspace(0.5, 1, len(years))
+    population = np.vstack([population, population.sum(axis=0) * (1 + WB_OTHER_POPULATION_SHARE)]).round()
+    data = pd.DataFrame(population, columns=[str(year) for year in years])
+    data.insert(0, 'Country Name', [name for name, code in named] + ['World'])
+    data.insert(1, 'Country Code', [code for name, code in named] + ['WLD'])
+    data.insert(2, 'Indicator Name', 'Population, total')
+    data.insert(3, 'Indicator Code', 'SP.POP.TOTL')
+    with open(os.path.join(directory, user_globals.Constant.WB_FILENAME.value), 'w') as f:
+        f.write('"Data Source","Synthetic data generated for benchmarking",\n\n"Last Updated Date","",\n\n')
+        data.to_csv(f, index=False)
+
+
+########################################################################################################################
+#
+# Function: generate()
+#
+# Description:
+# Saves all input datafiles in the directory given, with the number of EI countries, variables and years given.
+# Returns the number of rows of EI data.
+#
+########################################################################################################################
+def generate(directory, countries, ei_var_count, year_count, seed):
+    rng = np.random.default_rng(seed)
+    os.makedirs(directory, exist_ok=True)
+    used_vars = list(collate.ei_var_whitelist())
+    ei_vars = used_vars + ['synthetic_var_' + str(i + 1) for i in range(ei_var_count - len(used_vars))]
+    years = np.arange(END_YEAR - year_count + 1, END_YEAR + 1)
+    names, codes = country_list(countries)
+
+    data = ei_data(rng, names, codes, ei_vars, years)
+    data.to_csv(os.path.join(directory, user_globals.Constant.EI_FILENAME.value), index=False)
+    write_iea_files(rng, directory, years)
+    write_gcp_workbook(rng, directory, years)
+    write_wb_file(rng, directory, names, codes, years)
+    for filename in (user_globals.Constant.GCP_PATHWAYS_FILENAME.value,
+                     user_globals.Constant.ESRL_CONC_FILENAME.value,
+                     user_globals.Constant.ESRL_CHANGE_FILENAME.value):
+        shutil.copyfile(os.path.join(PACKAGE_DIR, filename), os.path.join(directory, filename))
+    return len(data)
+
+
+########################################################################################################################
+#
+# Function: main()
+#
+# Description:
+# Generates datafiles with the dimensions given on the command line.
+#
+########################################################################################################################
+def main(argv=None):
+    args = parse_args(argv)
+    countries = args.countries if args.countries is not None else round(DEFAULT_COUNTRIES * args.scale)
+    rows = generate(args.directory, countries, args.vars, args.years, args.seed)
+    print('Generated ' + str(rows) + ' rows of EI data for ' + str(countries) + ' countries, ' + str(args.vars) +
+          ' variables and ' + str(args.years) + ' years in: ' + args.directory)
+
+
+if __name__ == '__main__':
+    main()
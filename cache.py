@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+
+#Created on Sun Oct 18 09:12:37 2026
+"""
+
+########################################################################################################################
+#
+# Module: cache.py
+#
+# Description:
+# Caches imported datasets on disk as typed columnar copies, keyed by the content hash of the source file, so that
+# unchanged input files aren't re-parsed on every run. Also stores the outputs of pipeline tasks as pickled objects,
+# keyed by the task's fingerprint, and hashes the data plotted by charts so that unchanged charts aren't re-rendered.
+#
+########################################################################################################################
+
+# Import Python modules.
+import glob
+import hashlib
+import os
+import pickle
+import numpy as np
+import pandas as pd
+
+# Import user modules.
+import user_globals
+
+# Version of the cached file layout. Increment when the layout, or what's cached, changes to invalidate old copies.
+CACHE_FORMAT_VERSION = 3
+
+
+########################################################################################################################
+#
+# Function: file_hash()
+#
+# Description:
+# Returns the SHA-256 hex digest of a file's content, read in blocks to avoid loading large files into memory.
+#
+########################################################################################################################
+def file_hash(filename):
+    sha = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+########################################################################################################################
+#
+# Function: cache_key()
+#
+# Description:
+# Combines a name prefix with a digest of all other arguments (e.g. source file hash and import options) to form the
+# filename stem of a cached copy.
+#
+########################################################################################################################
+def cache_key(prefix, *parts):
+    sha = hashlib.sha256(str(CACHE_FORMAT_VERSION).encode())
+    for part in parts:
+        sha.update(repr(part).encode())
+    return prefix + '_' + sha.hexdigest()[:16]
+
+
+########################################################################################################################
+#
+# Function: save_frame()
+#
+# Description:
+# Saves a dataframe as a NumPy .npz file. Numeric columns are stored as typed arrays and string columns as integer
+# codes with a separate array of unique strings, so no Python objects need to be pickled. Categorical columns are
+# stored using their own codes and categories, and restored as categoricals. Earlier copies with the same prefix are
+# deleted, since they were made from a previous version of the source file.
+#
+########################################################################################################################
+def save_frame(key, df):
+    os.makedirs(user_globals.Constant.CACHE_DIR.value, exist_ok=True)
+    prefix = key.rsplit('_', 1)[0]
+    for old_file in glob.glob(os.path.join(user_globals.Constant.CACHE_DIR.value, prefix + '_*.npz')):
+        os.remove(old_file)
+
+    df = df.reset_index()
+    arrays = {'__columns__': np.array(df.columns, dtype=str), '__index__': np.array(df.columns[:1], dtype=str)}
+    categorical_columns = []
+    for i, column in enumerate(df.columns):
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categorical_columns.append(column)
+            arrays['codes_' + str(i)] = values.cat.codes.to_numpy().astype(np.int32)
+            arrays['uniques_' + str(i)] = np.array(values.cat.categories, dtype=str)
+        elif pd.api.types.is_numeric_dtype(values.dtype):
+            arrays['values_' + str(i)] = values.to_numpy()
+        else:
+            codes, uniques = pd.factorize(values)
+            arrays['codes_' + str(i)] = codes.astype(np.int32)
+            arrays['uniques_' + str(i)] = np.array(uniques, dtype=str)
+    arrays['__categorical__'] = np.array(categorical_columns, dtype=str)
+
+    # Write to a temporary file first so that an interrupted run never leaves a truncated copy behind.
+    path = os.path.join(user_globals.Constant.CACHE_DIR.value, key + '.npz')
+    with open(path + '.tmp', 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(path + '.tmp', path)
+
+
+########################################################################################################################
+#
+# Function: load_frame()
+#
+# Description:
+# Loads a dataframe saved by save_frame(). Returns None if there's no cached copy for the key.
+#
+########################################################################################################################
+def load_frame(key):
+    path = os.path.join(user_globals.Constant.CACHE_DIR.value, key + '.npz')
+    if not os.path.exists(path):
+        return None
+    with np.load(path, allow_pickle=False) as arrays:
+        columns = arrays['__columns__'].tolist()
+        categorical_columns = arrays['__categorical__'].tolist()
+        data = {}
+        for i, column in enumerate(columns):
+            if 'values_' + str(i) in arrays:
+                data[column] = arrays['values_' + str(i)]
+            elif column in categorical_columns:
+                data[column] = pd.Categorical.from_codes(arrays['codes_' + str(i)],
+                                                         categories=arrays['uniques_' + str(i)].astype(object))
+            else:
+                codes = arrays['codes_' + str(i)]
+                strings = arrays['uniques_' + str(i)].astype(object)[codes]
+                # Restore missing values, which pd.factorize() assigned the code -1.
+                strings[codes == -1] = np.nan
+                data[column] = strings
+        index_name = arrays['__index__'][0]
+    return pd.DataFrame(data, columns=columns).set_index(index_name)
+
+
+########################################################################################################################
+#
+# Function: object_exists()
+#
+# Description:
+# Returns whether an object has been saved by save_object() for the key. A saved file whose size doesn't match the
+# lengths in its header, e.g. if truncated when a disk filled, is deleted and treated as missing.
+#
+########################################################################################################################
+def object_exists(key):
+    path = os.path.join(user_globals.Constant.CACHE_DIR.value, key + '.pkl')
+    if not os.path.exists(path):
+        return False
+    try:
+        with open(path, 'rb') as f:
+            lengths = pickle.load(f)
+            complete = os.fstat(f.fileno()).st_size == f.tell() + sum(lengths)
+    except (EOFError, pickle.UnpicklingError):
+        complete = False
+    if not complete:
+        os.remove(path)
+    return complete
+
+
+########################################################################################################################
+#
+# Function: save_object()
+#
+# Description:
+# Saves any picklable object, such as the output of a pipeline task, to a single file by write_object(). As with
+# save_frame(), earlier copies with the same prefix are deleted.
+#
+########################################################################################################################
+def save_object(key, obj):
+    os.makedirs(user_globals.Constant.CACHE_DIR.value, exist_ok=True)
+    prefix = key.rsplit('_', 1)[0]
+    for old_file in glob.glob(os.path.join(user_globals.Constant.CACHE_DIR.value, glob.escape(prefix) + '_*.pkl')):
+        os.remove(old_file)
+    write_object(os.path.join(user_globals.Constant.CACHE_DIR.value, key + '.pkl'), obj)
+
+
+########################################################################################################################
+#
+# Function: load_object()
+#
+# Description:
+# Loads an object saved by save_object(). Returns None if there's no saved copy for the key. An incomplete copy is
+# deleted, and also treated as missing.
+#
+########################################################################################################################
+def load_object(key):
+    path = os.path.join(user_globals.Constant.CACHE_DIR.value, key + '.pkl')
+    if not os.path.exists(path):
+        return None
+    try:
+        return read_object(path)
+    except (EOFError, pickle.UnpicklingError):
+        os.remove(path)
+        return None
+
+
+########################################################################################################################
+#
+# Function: write_object()
+#
+# Description:
+# Saves a picklable object to the file path given. The object is pickled using protocol 5 with out-of-band buffers, so
+# the data of NumPy arrays (including those of dataframes) is written directly after the pickle rather than copied into
+# it. The file begins with a short pickle of the lengths of the pickle and each buffer. It's written to a temporary
+# file first, so that an interrupted write doesn't leave a partial file at the path.
+#
+########################################################################################################################
+def write_object(path, obj):
+    buffers = []
+    data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    raw_buffers = [buffer.raw() for buffer in buffers]
+    with open(path + '.tmp', 'wb') as f:
+        pickle.dump([len(data)] + [raw_buffer.nbytes for raw_buffer in raw_buffers], f, protocol=5)
+        f.write(data)
+        for raw_buffer in raw_buffers:
+            f.write(raw_buffer)
+    os.replace(path + '.tmp', path)
+
+
+########################################################################################################################
+#
+# Function: read_object()
+#
+# Description:
+# Loads an object saved by write_object() from the file path given. Each buffer is read from the file straight into an
+# uninitialised, writable array, which the restored arrays then use without further copies. Raises EOFError if the
+# file ends before the pickle or any buffer is complete, so that partly read buffers are never restored.
+#
+########################################################################################################################
+def read_object(path):
+    with open(path, 'rb') as f:
+        lengths = pickle.load(f)
+        data = f.read(lengths[0])
+        if len(data) != lengths[0]:
+            raise EOFError('Incomplete pickle in saved object: ' + path)
+        buffers = []
+        for length in lengths[1:]:
+            buffer = np.empty(length, dtype=np.uint8)
+            if f.readinto(memoryview(buffer)) != length:
+                raise EOFError('Incomplete buffer in saved object: ' + path)
+            buffers.append(buffer)
+    return pickle.loads(data, buffers=buffers)
+
+
+########################################################################################################################
+#
+# Function: data_hash()
+#
+# Description:
+# Returns the SHA-256 hex digest of the content of an object, such as the data and parameters of a chart. Dataframes,
+# series, indexes and arrays are hashed by value, with their labels and dtypes. Lists, tuples and dictionaries are
+# hashed element by element, objects of user classes by their attributes, and anything else by its repr().
+#
+########################################################################################################################
+def data_hash(obj):
+    sha = hashlib.sha256()
+    update_data_hash(sha, obj)
+    return sha.hexdigest()
+
+
+########################################################################################################################
+#
+# Function: update_data_hash()
+#
+# Description:
+# Adds the content of an object to a hashlib object, as described for data_hash().
+#
+########################################################################################################################
+def update_data_hash(sha, obj):
+    sha.update(type(obj).__name__.encode())
+    if isinstance(obj, pd.DataFrame):
+        sha.update(repr((obj.shape, [str(dtype) for dtype in obj.dtypes])).encode())
+        update_data_hash(sha, obj.columns)
+        update_data_hash(sha, obj.index)
+        sha.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+    elif isinstance(obj, pd.Series):
+        sha.update(repr((obj.name, str(obj.dtype))).encode())
+        update_data_hash(sha, obj.index)
+        sha.update(pd.util.hash_pandas_object(obj, index=False).to_numpy().tobytes())
+    elif isinstance(obj, pd.Index):
+        sha.update(repr((obj.names, str(obj.dtype))).encode())
+        sha.update(pd.util.hash_pandas_object(obj).to_numpy().tobytes())
+    elif isinstance(obj, np.ndarray):
+        sha.update(repr((obj.shape, str(obj.dtype))).encode())
+        sha.update(repr(obj.tolist()).encode() if obj.dtype == object else np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        sha.update(str(len(obj)).encode())
+        for item in obj:
+            update_data_hash(sha, item)
+    elif isinstance(obj, dict):
+        sha.update(str(len(obj)).encode())
+        for key in sorted(obj, key=repr):
+            update_data_hash(sha, key)
+            update_data_hash(sha, obj[key])
+    elif hasattr(obj, '__dict__') and not callable(obj):
+        update_data_hash(sha, vars(obj))
+    else:
+        sha.update(repr(obj).encode())
@@ -16,7 +16,12 @@
 ########################################################################################################################
 
 # Import Python modules.
-import matplotlib.pyplot as plt
+import importlib.metadata
+import matplotlib
+import matplotlib.backends.backend_agg
+import matplotlib.figure
+import matplotlib.patches
+import matplotlib.style
 import numpy as np
 import mpl_extra.treemap as tr
 # Location:
@@ -29,6 +34,91 @@ import pandas as pd
 
 # Import user modules.
 import user_globals
+import cache
+
+# Chart style settings are applied when this module is imported, which output.py delays until the first chart is
+# plotted, so that runs only collating or saving data don't import plotting libraries.
+
+# Set global font parameters.
+# If you add a font to the OS, be sure to delete all matplotlib's font cache files in ~/.matplotlib.
+matplotlib.rcParams['font.sans-serif'] = 'Google Sans'
+
+# All prebuilt chart styles: https://python-charts.com/matplotlib/styles/#list
+# Python chart gallery: https://python-graph-gallery.com/
+# Matplotlib universal settings:
+# https://matplotlib.org/stable/api/matplotlib_configuration_api.html#matplotlib.rcParams
+rc = {
+    'xtick.direction': 'out',
+    'xtick.color': 'grey',
+    'xtick.labelcolor': 'black',
+    'ytick.direction': 'out',
+    'ytick.color': 'grey',
+    'ytick.labelcolor': 'black',
+}
+matplotlib.style.use(('bmh', rc))
+
+# Digest of chart style settings shared by all charts, calculated once per process by style_fingerprint().
+style_digest = None
+
+
+########################################################################################################################
+#
+# Function: new_figure()
+#
+# Description:
+# Creates the figure of a chart. Unless charts are displayed, this is a matplotlib.figure.Figure with its own Agg
+# canvas, independent of pyplot's global state, so charts don't share a current figure or axes and pyplot's GUI backend
+# isn't loaded. pyplot is only used to create figures that can be shown on screen when Constant.DISPLAY_CHARTS is True.
+#
+########################################################################################################################
+def new_figure(**kwargs):
+    if user_globals.Constant.DISPLAY_CHARTS.value is True:
+        import matplotlib.pyplot as plt
+        return plt.figure(**kwargs)
+    fig = matplotlib.figure.Figure(**kwargs)
+    matplotlib.backends.backend_agg.FigureCanvasAgg(fig)
+    return fig
+
+
+########################################################################################################################
+#
+# Function: show_figure()
+#
+# Description:
+# Shows a figure created by new_figure() on screen, if charts are displayed, then closes it.
+#
+########################################################################################################################
+def show_figure(fig):
+    if user_globals.Constant.DISPLAY_CHARTS.value is True:
+        import matplotlib.pyplot as plt
+        plt.show()
+        plt.close(fig)
+
+
+########################################################################################################################
+#
+# Function: style_fingerprint()
+#
+# Description:
+# Returns a digest of the code and settings affecting the appearance of every chart: the content of this file, including
+# helpers shared by chart functions, the versions of Matplotlib and Matplotlib-extra (which lays out treemaps), the
+# rcParams (excluding the backend), and the constants and colors in user_globals.
+#
+########################################################################################################################
+def style_fingerprint():
+    global style_digest
+    if style_digest is None:
+        try:
+            mpl_extra_version = importlib.metadata.version('mpl-extra')
+        except importlib.metadata.PackageNotFoundError:
+            # Installed without package metadata, e.g. from a source folder.
+            mpl_extra_version = None
+        rc_params = sorted((key, repr(value)) for key, value in dict.items(matplotlib.rcParams) if
+                           not key.startswith('backend'))
+        style_digest = cache.data_hash((cache.file_hash(__file__), matplotlib.__version__, mpl_extra_version,
+                                        rc_params, [(member.name, member.value) for member in user_globals.Constant],
+                                        [(member.name, member.value) for member in user_globals.Color]))
+    return style_digest
 
 
 ########################################################################################################################
@@ -41,14 +131,13 @@ import user_globals
 #
 ########################################################################################################################
 def line_plot(title, x_label, y_label, footer_text, text, series_labels, *colors, **series):
-    fig, ax = plt.subplots(
-        1,
-        1,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_SINGLE_PLOT.value,
             user_globals.Constant.FIG_VSIZE_SINGLE_PLOT.value,
         ),
     )
+    ax = fig.subplots(1, 1)
     # Cycle through and plot input series.
     series_number = 0
     series_qty = len(series)
@@ -120,7 +209,8 @@ def line_plot(title, x_label, y_label, footer_text, text, series_labels, *colors
             x_ticks.append(year)
 
     ax.set_xticks(x_ticks)
-    plt.xticks(rotation=90)
+    for label in ax.get_xticklabels():
+        label.set_rotation(90)
     ax.set_xlim(min_all_series_x, max_all_series_x)
     ax.set_xlabel(x_label)
     ax.margins(x=0)
@@ -128,7 +218,7 @@ def line_plot(title, x_label, y_label, footer_text, text, series_labels, *colors
     ax.set_ylim(0, max(ax.get_yticks()))
     ax.set_ylabel(y_label)
 
-    plt.subplots_adjust(left=0, right=1, top=0.96, bottom=0.09)
+    fig.subplots_adjust(left=0, right=1, top=0.96, bottom=0.09)
 
     fig.text(
         0.065,
@@ -157,6 +247,7 @@ def line_plot(title, x_label, y_label, footer_text, text, series_labels, *colors
         fontweight=user_globals.Constant.TITLE_ADDITION_FONT_WEIGHT.value,
     )
     t.set_bbox(dict(facecolor='white', edgecolor='lightgrey', pad=5))
+    return fig
 
 
 ########################################################################################################################
@@ -183,14 +274,13 @@ def line_2_subplots(
         x_axis0_interval,
         x_axis1_interval,
 ):
-    fig, ax = plt.subplots(
-        1,
-        2,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.MAJOR_EMITTER_FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
         ),
     )
+    ax = fig.subplots(1, 2)
 
     # Subplot0, line plot, series0
     ax[0].plot(
@@ -301,7 +391,7 @@ def line_2_subplots(
         ax[1].spines[axis].set_color('black')
 
     # Adjust whitespace around plot area.
-    plt.subplots_adjust(left=0, right=1, wspace=0, top=0.91, bottom=0.04)
+    fig.subplots_adjust(left=0, right=1, wspace=0, top=0.91, bottom=0.04)
 
     if country == 'Russian Federation':
         country = 'USSR & Russian Federation'
@@ -313,6 +403,7 @@ def line_2_subplots(
         fontsize=user_globals.Constant.MAJOR_EMITTER_TITLE_FONT_SIZE.value,
         fontweight=user_globals.Constant.MAJOR_EMITTER_TITLE_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -333,14 +424,13 @@ def legend_for_major_emitter_charts(
         color2,
         color3,
 ):
-    fig, ax = plt.subplots(
-        1,
-        1,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.MAJOR_EMITTER_FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
         ),
     )
+    ax = fig.subplots(1, 1)
 
     # Subplot0, line plot, series0
     ax.plot(
@@ -399,6 +489,7 @@ def legend_for_major_emitter_charts(
                'Gas Consumption (joule)'],
               loc='upper left', frameon=True, prop={'size': 14}, framealpha=1, facecolor='white',
               ncols=1, mode='expand', borderpad=2)
+    return fig
 
 
 ########################################################################################################################
@@ -411,14 +502,13 @@ def legend_for_major_emitter_charts(
 ########################################################################################################################
 def column_subplot(series, highlight_bar, ref_line, ref_label, country, title, subplot_title, y_label, footer_text,
                    color, highlight_color):
-    fig, ax = plt.subplots(
-        1,
-        1,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_CHANGE_COLUMN_PLOT.value,
             user_globals.Constant.FIG_VSIZE_CHANGE_COLUMN_PLOT.value,
         ),
     )
+    ax = fig.subplots(1, 1)
     p0 = ax.bar(
         series.index,
         series,
@@ -454,7 +544,7 @@ def column_subplot(series, highlight_bar, ref_line, ref_label, country, title, s
     ax.set_yticks([ref_line], [ref_label], fontsize=8)
     ax.set_ylabel(y_label, labelpad=-20)
 
-    plt.subplots_adjust(left=0.03, right=0.99, top=0.89, bottom=0.35, hspace=0.1)
+    fig.subplots_adjust(left=0.03, right=0.99, top=0.89, bottom=0.35, hspace=0.1)
 
     fig.suptitle(
         country,
@@ -487,6 +577,7 @@ def column_subplot(series, highlight_bar, ref_line, ref_label, country, title, s
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -515,14 +606,13 @@ def column_2_subplots(
         footer_text,
         equiv_yscale,
 ):
-    fig, ax = plt.subplots(
-        1,
-        2,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
         ),
     )
+    ax = fig.subplots(1, 2)
     # Grey edges for black columns.
     if color0 == 'black':
         edge_color0 = 'dimgrey'
@@ -651,7 +741,7 @@ def column_2_subplots(
         )
 
     # Adjust whitespace around plot area.
-    plt.subplots_adjust(left=0.18, right=0.82, wspace=0.13, top=1, bottom=0.02)
+    fig.subplots_adjust(left=0.18, right=0.82, wspace=0.13, top=1, bottom=0.02)
 
     # Add plot text.
     ax[0].text(1960, 37000, chart_text)
@@ -694,6 +784,7 @@ def column_2_subplots(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -722,14 +813,13 @@ def line_column(
         chart_text,
         footer_text,
 ):
-    fig, ax = plt.subplots(
-        1,
-        2,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
         ),
     )
+    ax = fig.subplots(1, 2)
 
     # Grey edges for black columns.
     if color1 == 'black':
@@ -822,7 +912,7 @@ def line_column(
     ax[1].set_axisbelow(True)
 
     # Adjust whitespace around plot area.
-    plt.subplots_adjust(left=0.18, right=0.82, wspace=0.13, top=1, bottom=0.02)
+    fig.subplots_adjust(left=0.18, right=0.82, wspace=0.13, top=1, bottom=0.02)
 
     # Add text to chart and after force the uppermost tick to be equal to next tick after.
     ax[0].text(2005, 425, chart_text)
@@ -865,6 +955,7 @@ def line_column(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -890,7 +981,7 @@ def line_treemap(
         additional_text0,
         footer_text,
 ):
-    fig = plt.figure(
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
@@ -959,7 +1050,7 @@ def line_treemap(
     )
 
     ax0.margins(x=0)
-    plt.subplots_adjust(
+    fig.subplots_adjust(
         left=0.18, right=0.82, wspace=0.13, top=1, bottom=0.02, hspace=0.05
     )
     ax0.set_title(
@@ -1026,6 +1117,7 @@ def line_treemap(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -1051,7 +1143,7 @@ def column_treemap(
         additional_text1,
         footer_text,
 ):
-    fig = plt.figure(
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
@@ -1134,7 +1226,7 @@ def column_treemap(
     ax0.margins(x=0)
     ax1.axis('off')
 
-    plt.subplots_adjust(
+    fig.subplots_adjust(
         left=0.18, right=0.82, wspace=0.13, top=1, bottom=0.02, hspace=0.05
     )
 
@@ -1204,6 +1296,7 @@ def column_treemap(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 ########################################################################################################################
 #
@@ -1232,14 +1325,13 @@ def column_3_subplots(
         equiv_yscale,
         x_tick_label_size
 ):
-    fig, ax = plt.subplots(
-        1,
-        3,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
         ),
     )
+    ax = fig.subplots(1, 3)
 
     # Grey edges for black columns.
     if color0 == 'black':
@@ -1419,7 +1511,7 @@ def column_3_subplots(
     ax[2].tick_params(axis='y', labelleft=False, length=0)
 
     # Adjust whitespace around plot area.
-    plt.subplots_adjust(left=0.05, right=0.98, top=0.99, bottom=0.065, wspace=0.15)
+    fig.subplots_adjust(left=0.05, right=0.98, top=0.99, bottom=0.065, wspace=0.15)
 
     # Add plot text.
     ax[0].set_title(
@@ -1474,6 +1566,7 @@ def column_3_subplots(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -1510,14 +1603,13 @@ def line_6_subplots(
         footer_text,
         equiv_yscale,
 ):
-    fig, ax = plt.subplots(
-        2,
-        3,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_2_ROW.value,
             user_globals.Constant.FIG_VSIZE_2_ROW.value,
         ),
     )
+    ax = fig.subplots(2, 3)
 
     ax[0, 0].plot(
         series0.truncate(before=start_yr).index,
@@ -1559,9 +1651,9 @@ def line_6_subplots(
     ax[0, 0].set_facecolor('whitesmoke')
     ax[0, 1].set_facecolor('whitesmoke')
     ax[0, 2].set_facecolor('whitesmoke')
-    ax[0, 3].set_facecolor('whitesmoke')
-    ax[0, 4].set_facecolor('whitesmoke')
-    ax[0, 5].set_facecolor('whitesmoke')
+    ax[1, 0].set_facecolor('whitesmoke')
+    ax[1, 1].set_facecolor('whitesmoke')
+    ax[1, 2].set_facecolor('whitesmoke')
 
     # Create list x_ticks and fill with start year of each decade.
     x_ticks = [start_yr]
@@ -1634,7 +1726,7 @@ def line_6_subplots(
     ax[1, 1].set_box_aspect(1)
     ax[1, 2].set_box_aspect(1)
 
-    plt.subplots_adjust(
+    fig.subplots_adjust(
         left=0, right=0.68, top=0.92, bottom=0.1, wspace=0, hspace=0.14
     )
 
@@ -1700,6 +1792,7 @@ def line_6_subplots(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -1737,14 +1830,13 @@ def column_6_subplots(
         footer_text,
         equiv_yscale,
 ):
-    fig, ax = plt.subplots(
-        2,
-        3,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_2_ROW.value,
             user_globals.Constant.FIG_VSIZE_2_ROW.value,
         ),
     )
+    ax = fig.subplots(2, 3)
     if color0 == 'black':
         edge_color0 = 'dimgrey'
     else:
@@ -2032,7 +2124,7 @@ def column_6_subplots(
     ax[1, 0].yaxis.set_major_formatter(
         matplotlib.ticker.FuncFormatter(lambda x, p: format(decimal.Decimal(x), ',')))
 
-    plt.subplots_adjust(left=0.04, right=0.72, top=0.945, bottom=0.105, hspace=0.03, wspace=0)
+    fig.subplots_adjust(left=0.04, right=0.72, top=0.945, bottom=0.105, hspace=0.03, wspace=0)
 
     ax[0, 0].set_title(
         subplot0_title,
@@ -2113,6 +2205,7 @@ def column_6_subplots(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -2156,14 +2249,13 @@ def column_8_subplots(
         footer_text,
         equiv_yscale,
 ):
-    fig, ax = plt.subplots(
-        2,
-        4,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_2_ROW.value,
             user_globals.Constant.FIG_VSIZE_2_ROW.value,
         ),
     )
+    ax = fig.subplots(2, 4)
     if color0 == 'black' or color0 == 'midnightblue':
         edge_color0 = 'dimgrey'
     else:
@@ -2542,7 +2634,7 @@ def column_8_subplots(
     ax[1, 0].yaxis.set_major_formatter(
         matplotlib.ticker.FuncFormatter(lambda x, p: format(decimal.Decimal(x), ',')))
 
-    plt.subplots_adjust(left=0.04, right=0.96, top=0.945, bottom=0.105, hspace=0.03, wspace=0)
+    fig.subplots_adjust(left=0.04, right=0.96, top=0.945, bottom=0.105, hspace=0.03, wspace=0)
 
     ax[0, 0].set_title(
         subplot0_title,
@@ -2650,6 +2742,7 @@ def column_8_subplots(
         fontsize='medium',
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -2698,14 +2791,13 @@ def line_10_subplots(
         footer_text,
         equiv_yscale,
 ):
-    fig, ax = plt.subplots(
-        2,
-        5,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_2_ROW.value,
             user_globals.Constant.FIG_VSIZE_2x5.value,
         ),
     )
+    ax = fig.subplots(2, 5)
     ax[0, 0].plot(
         series0.truncate(before=start_yr).index,
         series0.truncate(before=start_yr),
@@ -2978,7 +3070,7 @@ def line_10_subplots(
         y=0.98,
     )
 
-    plt.subplots_adjust(left=0.02, right=0.99, top=0.9, bottom=0.1, hspace=0.11, wspace=0)
+    fig.subplots_adjust(left=0.02, right=0.99, top=0.9, bottom=0.1, hspace=0.11, wspace=0)
 
     fig.suptitle(
         country,
@@ -3007,9 +3099,10 @@ def line_10_subplots(
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
 
-    fig.patches.extend([plt.Rectangle((0.027, 0.1), 0.38, 0.83, linewidth=1.8,
+    fig.patches.extend([matplotlib.patches.Rectangle((0.027, 0.1), 0.38, 0.83, linewidth=1.8,
                                       fill=False, color='darkslateblue', alpha=0.9, ls='dashed',
                                       transform=fig.transFigure, figure=fig)])
+    return fig
 
 
 ########################################################################################################################
@@ -3063,14 +3156,13 @@ def column_11_subplots(
         footer_text,
         equiv_yscale,
 ):
-    fig, ax = plt.subplots(
-        3,
-        5,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_3_ROW.value,
             user_globals.Constant.FIG_VSIZE_3_ROW.value,
         ),
     )
+    ax = fig.subplots(3, 5)
 
     if color0 == 'black':
         edge_color0 = 'dimgrey'
@@ -3667,7 +3759,7 @@ def column_11_subplots(
     ax[2, 0].yaxis.set_major_formatter(
         matplotlib.ticker.FuncFormatter(lambda x, p: format(decimal.Decimal(x), ',')))
 
-    plt.subplots_adjust(left=0.04, right=0.99, top=0.99, bottom=0.04, hspace=0.035, wspace=0)
+    fig.subplots_adjust(left=0.04, right=0.99, top=0.99, bottom=0.04, hspace=0.035, wspace=0)
 
     fig.suptitle(
         country,
@@ -3703,9 +3795,10 @@ def column_11_subplots(
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
 
-    fig.patches.extend([plt.Rectangle((0.043, 0.04), 0.376, 0.954, linewidth=1.8,
+    fig.patches.extend([matplotlib.patches.Rectangle((0.043, 0.04), 0.376, 0.954, linewidth=1.8,
                                       fill=False, color='darkslateblue', alpha=0.9, ls='dashed',
                                       transform=fig.transFigure, figure=fig)])
+    return fig
 
 
 ########################################################################################################################
@@ -3717,14 +3810,13 @@ def column_11_subplots(
 #
 ########################################################################################################################
 def column_grouped(country, title, y_label, footer_text, *colors, **series):
-    fig, ax = plt.subplots(
-        1,
-        1,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_CHANGE_COLUMN_PLOT.value,
             user_globals.Constant.FIG_VSIZE_CHANGE_COLUMN_PLOT.value,
         ),
     )
+    ax = fig.subplots(1, 1)
     start_yr = user_globals.Constant.CHANGE_CHART_START_YR.value
     label_pad = 2
     series_qty = len(series)
@@ -3783,7 +3875,7 @@ def column_grouped(country, title, y_label, footer_text, *colors, **series):
     ax.tick_params(axis='x', length=0)
     ax.margins(x=0.002)
     # Show x-axis line.
-    plt.axhline(0, color='black', lw=0.4)
+    ax.axhline(0, color='black', lw=0.4)
     ax.set_axisbelow(True)
     ax.set_xlabel('Year')
 
@@ -3797,7 +3889,7 @@ def column_grouped(country, title, y_label, footer_text, *colors, **series):
         matplotlib.ticker.FuncFormatter(lambda x, k: format(decimal.Decimal(x), ','))
     )
 
-    plt.subplots_adjust(left=0.05, right=0.97, top=0.9, bottom=0.18)
+    fig.subplots_adjust(left=0.05, right=0.97, top=0.9, bottom=0.18)
     fig.suptitle(
         country,
         x=0.05,
@@ -3823,6 +3915,7 @@ def column_grouped(country, title, y_label, footer_text, *colors, **series):
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -3835,14 +3928,13 @@ def column_grouped(country, title, y_label, footer_text, *colors, **series):
 ########################################################################################################################
 def column_grouped_2_subplots(country, title, y_label_top, y_label_bottom, footer_text, color_top, series_top,
                               *colors, **series):
-    fig, ax = plt.subplots(
-        2,
-        1,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_CHANGE_COLUMN_PLOT.value,
             user_globals.Constant.FIG_VSIZE_CHANGE_COLUMN_2_PLOT.value,
         ),
     )
+    ax = fig.subplots(2, 1)
     start_yr = user_globals.Constant.CHANGE_CHART_START_YR.value
     label_pad = 2
 
@@ -3953,7 +4045,7 @@ def column_grouped_2_subplots(country, title, y_label_top, y_label_bottom, foote
         matplotlib.ticker.FuncFormatter(lambda x, p: format(decimal.Decimal(x), ','))
     )
 
-    plt.subplots_adjust(left=0.05, right=0.97, top=0.9, bottom=0.17, hspace=0.1)
+    fig.subplots_adjust(left=0.05, right=0.97, top=0.9, bottom=0.17, hspace=0.1)
 
     fig.suptitle(
         country,
@@ -3980,6 +4072,7 @@ def column_grouped_2_subplots(country, title, y_label_top, y_label_bottom, foote
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -3993,15 +4086,13 @@ def column_grouped_2_subplots(country, title, y_label_top, y_label_bottom, foote
 def treemap_1_subplot(
         df, subplot_title, country, title, title_addition, footer_text  # Dataframe
 ):
-    fig, ax = plt.subplots(
-        1,
-        1,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_1_TREE.value,
             user_globals.Constant.FIG_VSIZE_1_TREE.value,
         ),
-        subplot_kw=dict(aspect=1.1),
     )
+    ax = fig.subplots(1, 1, subplot_kw=dict(aspect=1.1))
     tr.treemap(
         ax,
         df,
@@ -4031,7 +4122,7 @@ def treemap_1_subplot(
         loc='left',
     )
 
-    plt.subplots_adjust(left=0.125, top=0.83, bottom=0.22)
+    fig.subplots_adjust(left=0.125, top=0.83, bottom=0.22)
 
     fig.suptitle(
         country,
@@ -4067,6 +4158,7 @@ def treemap_1_subplot(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -4086,15 +4178,13 @@ def treemap_2_subplots(
         title,
         footer_text,
 ):
-    fig, ax = plt.subplots(
-        1,
-        2,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_2_TREE.value,
             user_globals.Constant.FIG_VSIZE_2_TREE.value,
         ),
-        subplot_kw=dict(aspect=1.1),
     )
+    ax = fig.subplots(1, 2, subplot_kw=dict(aspect=1.1))
 
     # Plot left-hand treemap.
     tr.treemap(
@@ -4167,7 +4257,7 @@ def treemap_2_subplots(
         loc='center',
     )
 
-    plt.subplots_adjust(left=0.125, top=0.94, bottom=0.18)
+    fig.subplots_adjust(left=0.125, top=0.94, bottom=0.18)
 
     fig.suptitle(
         country,
@@ -4194,6 +4284,7 @@ def treemap_2_subplots(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -4217,15 +4308,13 @@ def treemap_3_subplots(
         footer_upper_text,
         footer_lower_text,
 ):
-    fig, ax = plt.subplots(
-        1,
-        3,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_3_TREE.value,
             user_globals.Constant.FIG_VSIZE_3_TREE.value,
         ),
-        subplot_kw=dict(aspect=1.1),
     )
+    ax = fig.subplots(1, 3, subplot_kw=dict(aspect=1.1))
 
     # Plot left-hand treemap.
     tr.treemap(
@@ -4333,6 +4422,7 @@ def treemap_3_subplots(
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
 
 
 ########################################################################################################################
@@ -4356,14 +4446,13 @@ def stacked_area_3_subplots(df0, colors0, df1, colors1, df2, colors2, subplot0_t
                             x_tick_label_size
                             ):
 
-    fig, ax = plt.subplots(
-        1,
-        3,
+    fig = new_figure(
         figsize=(
             user_globals.Constant.FIG_HSIZE_1_ROW.value,
             user_globals.Constant.FIG_VSIZE_1_ROW_TALL.value,
         ),
     )
+    ax = fig.subplots(1, 3)
 
     ax[0].stackplot(df0.truncate(before=user_globals.Constant.CHART_START_YR.value).index.values,
                     df0.truncate(before=user_globals.Constant.CHART_START_YR.value).T, labels=df0.keys(),
@@ -4449,7 +4538,7 @@ def stacked_area_3_subplots(df0, colors0, df1, colors1, df2, colors2, subplot0_t
 
     # Adjust whitespace around plot area.
     left_margin = 0.1
-    plt.subplots_adjust(left=left_margin, right=0.98, top=0.99, bottom=0.065, wspace=0.15)
+    fig.subplots_adjust(left=left_margin, right=0.98, top=0.99, bottom=0.065, wspace=0.15)
 
     ax[0].set_title(
         subplot0_title,
@@ -4504,3 +4593,4 @@ def stacked_area_3_subplots(df0, colors0, df1, colors1, df2, colors2, subplot0_t
         fontsize=user_globals.Constant.FOOTER_TEXT_FONT_SIZE.value,
         fontweight=user_globals.Constant.FOOTER_TEXT_FONT_WEIGHT.value,
     )
+    return fig
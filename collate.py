@@ -18,6 +18,8 @@
 
 
 # Import Python modules.
+import functools
+import operator
 import pandas as pd
 import numpy as np
 
@@ -25,6 +27,7 @@ import countries
 # Import user modules.
 import user_globals
 import process
+import cache
 
 
 ########################################################################################################################
@@ -34,12 +37,33 @@ import process
 # Description:
 # Data importation differs between sources:
 # Energy Institute (EI) and Global Carbon Project (GCP) datasets are imported as single files into Pandas dataframes.
+# Each dataset can also be imported alone, by the functions called here, when only some charts are generated.
 #
 ########################################################################################################################
 def import_gcp_esrl_ei_pop_data():
+    imported_gcp_data, imported_gcp_co2_rcp_pathways = import_gcp_data()
+    imported_esrl_data = import_esrl_data()
+
+    # Import Energy Institute dataset.
+    imported_ei_data = import_ei_data()
+
+    imported_wb_data = import_wb_data()
+
+    return imported_gcp_data, imported_gcp_co2_rcp_pathways, imported_esrl_data, imported_ei_data, imported_wb_data,
+
+
+########################################################################################################################
+#
+# Function: import_gcp_data()
+#
+# Description:
+# Imports Global Carbon Project (GCP) emissions, carbon budget and emission pathway datasets.
+#
+########################################################################################################################
+def import_gcp_data():
     # Import Global Carbon Project (GCP) emissions and carbon budget datasets as Pandas dataframes.
     gcp_ff_emissions_GtC = pd.read_excel(
-        io='Global_Carbon_Budget_2025_v1.0.xlsx',
+        io=user_globals.Constant.GCP_FILENAME.value,
         sheet_name='Fossil Emissions by Category',
         header=8,
         names=[
@@ -55,7 +79,7 @@ def import_gcp_esrl_ei_pop_data():
         index_col=0,
     )
     gcp_budget_GtC = pd.read_excel(
-        io='Global_Carbon_Budget_2025_v1.0.xlsx',
+        io=user_globals.Constant.GCP_FILENAME.value,
         sheet_name='Global Carbon Budget',
         header=21,
         names=[
@@ -72,7 +96,7 @@ def import_gcp_esrl_ei_pop_data():
     )
 
     imported_gcp_co2_rcp_pathways = pd.read_csv(
-        's64_2024_LinearPathways.csv', header=0, index_col=['Year'],
+        user_globals.Constant.GCP_PATHWAYS_FILENAME.value, header=0, index_col=['Year'],
         usecols=['Year', 'Historical', '1.5C / 235 GtCO2', '1.7C / 585 GtCO2', '2.0C / 1110 GtCO2']
     )
 
@@ -94,13 +118,25 @@ def import_gcp_esrl_ei_pop_data():
     # Combine GCP emissions and budget data.
     imported_gcp_data = gcp_ff_emissions_MtCO2.join(gcp_budget_MtCO2)
 
+    return imported_gcp_data, imported_gcp_co2_rcp_pathways
+
+
+########################################################################################################################
+#
+# Function: import_esrl_data()
+#
+# Description:
+# Imports NOAA ESRL atmospheric CO2 concentration and annual change datasets.
+#
+########################################################################################################################
+def import_esrl_data():
     # Import atmospheric CO2 concentration and annual change data from NOAA ESRL dataset as Pandas dataframes.
     esrl_co2_conc = pd.read_csv(
-        'co2_annmean_gl.csv', header=37, index_col=['year'], usecols=['year', 'mean']
+        user_globals.Constant.ESRL_CONC_FILENAME.value, header=37, index_col=['year'], usecols=['year', 'mean']
     )
 
     esrl_co2_change = pd.read_csv(
-        'co2_gr_gl.csv', header=43, index_col=['year'], usecols=['year', 'ann inc']
+        user_globals.Constant.ESRL_CHANGE_FILENAME.value, header=43, index_col=['year'], usecols=['year', 'ann inc']
     )
 
     # Join two datasets
@@ -110,20 +146,123 @@ def import_gcp_esrl_ei_pop_data():
     imported_esrl_data = imported_esrl_data.rename(columns={'mean': 'Mean', 'ann inc': 'Ann Inc'})
     imported_esrl_data.index.names = ['Year']
 
-    # Import Energy Institute dataset.
-    imported_ei_data = pd.read_csv(
-        'Statistical Review of World Energy Narrow format.csv', index_col=['Year'],
+    return imported_esrl_data
+
+
+########################################################################################################################
+#
+# Function: import_wb_data()
+#
+# Description:
+# Imports World Bank human population data.
+#
+########################################################################################################################
+def import_wb_data():
+    # Import World Bank human population data from all countries for all years, and arrange as a matrix with a row per
+    # year and a column per country ISO code.
+    imported_wb_data = pd.read_csv(user_globals.Constant.WB_FILENAME.value, index_col=['Country Code'], header=2)
+    imported_wb_data = imported_wb_data[[column for column in imported_wb_data.columns if column.isdigit()]].T
+    imported_wb_data.index = imported_wb_data.index.astype(int)
+    imported_wb_data.index.name = 'Year'
+
+    return imported_wb_data
+
+
+########################################################################################################################
+#
+# Function: import_ei_data()
+#
+# Description:
+# Imports the Energy Institute (EI) dataset. This is the largest input file, so it's parsed in chunks, from which only
+# rows of variables listed in user_globals.EI_VARS are kept. Once parsed, a columnar copy is cached and keyed by the
+# file's content hash and the variables kept. Later runs load the cached copy instead, until either changes.
+# Columns Country, Var and ISO3166_alpha3 are imported with the dtype set by Constant.EI_STRING_DTYPE.
+#
+########################################################################################################################
+def import_ei_data():
+    filename = user_globals.Constant.EI_FILENAME.value
+    string_dtype = user_globals.Constant.EI_STRING_DTYPE.value
+    ei_vars = ei_var_whitelist()
+    if user_globals.Constant.CACHE_DIR.value is not None:
+        key = cache.cache_key('ei', cache.file_hash(filename), string_dtype, ei_vars)
+        ei_data = cache.load_frame(key)
+        if ei_data is not None:
+            return ei_data
+
+    # Text columns are converted to string_dtype after chunks are joined, because categoricals of separate chunks
+    # would have differing categories.
+    chunks = pd.read_csv(
+        filename, index_col=['Year'],
                         usecols=['Country', 'Year', 'ISO3166_alpha3', 'Var', 'Value'],
-                        dtype={"Country":str, "Year":int, "ISO3166_alpha3":str, "Var":str, "Value":float}
+                        dtype={"Country":str, "Year":int, "ISO3166_alpha3":str, "Var":str, "Value":float},
+                        chunksize=user_globals.Constant.EI_CHUNK_ROWS.value
     )
+    ei_data = pd.concat([chunk.loc[chunk['Var'].isin(ei_vars)] for chunk in chunks])
+    ei_data = ei_data.astype({'Country': string_dtype, 'ISO3166_alpha3': string_dtype, 'Var': string_dtype})
+    if user_globals.Constant.CACHE_DIR.value is not None:
+        cache.save_frame(key, ei_data)
+    return ei_data
 
-    # Import World Bank human population data from all countries for most recent year of ei_data.
-    imported_wb_data = pd.read_csv(
-        'world_pop.csv', index_col=['Country Code'], header=2,
-        usecols=['Country Code', str(imported_ei_data.index[-1])], )
-    imported_wb_data.rename(columns={'2025': 'Population'}, inplace=True)
 
-    return imported_gcp_data, imported_gcp_co2_rcp_pathways, imported_esrl_data, imported_ei_data, imported_wb_data,
+########################################################################################################################
+#
+# Function: ei_var_whitelist()
+#
+# Description:
+# Returns a sorted tuple of all EI variables listed in the registry user_globals.EI_VARS.
+#
+########################################################################################################################
+def ei_var_whitelist():
+    return tuple(sorted({var for ei_vars in user_globals.EI_VARS.values() for var in ei_vars}))
+
+
+########################################################################################################################
+#
+# Function: build_ei_cube()
+#
+# Description:
+# Pivots the EI dataset once into a dense Country x Var x Year cube, with lookup tables of each country, variable and
+# year. All later extraction of a country's annual values is then a slice of the cube, instead of a scan of the entire
+# dataset.
+#
+########################################################################################################################
+def build_ei_cube(ei_data):
+    country_codes, country_names = pd.factorize(ei_data['Country'])
+    var_codes, var_names = pd.factorize(ei_data['Var'])
+    years, year_codes = np.unique(ei_data.index.to_numpy(), return_inverse=True)
+
+    shape = (len(country_names), len(var_names), len(years))
+    values = np.full(shape, np.nan)
+    present = np.zeros(shape, dtype=bool)
+    values[country_codes, var_codes, year_codes] = ei_data['Value'].to_numpy()
+    present[country_codes, var_codes, year_codes] = True
+
+    # Record each country's ISO code, which is the same for all its rows.
+    iso = np.empty(len(country_names), dtype=object)
+    iso[country_codes] = ei_data['ISO3166_alpha3'].to_numpy()
+
+    return user_globals.EI_Cube(
+        np.array(country_names, dtype=object),
+        np.array(var_names, dtype=object),
+        years,
+        values,
+        present,
+        iso,
+    )
+
+
+########################################################################################################################
+#
+# Function: iea_filenames()
+#
+# Description:
+# Returns the filenames of the IEA CO2 emissions by sector and total final consumption datasets of a country.
+#
+########################################################################################################################
+def iea_filenames(country_name):
+    iea_country_name = countries.translate_country_name(country_name)
+    return ('CO2 emissions by sector - ' + str(iea_country_name) + '.csv',
+            'Total final consumption (TFC) by source - ' + str(iea_country_name) + '.csv')
 
 
 ########################################################################################################################
@@ -135,9 +274,7 @@ def import_gcp_esrl_ei_pop_data():
 #
 ########################################################################################################################
 def import_iea_data(country_name):
-    iea_country_name = countries.translate_country_name(country_name)
-    filename_co2_emissions_by_sector = 'CO2 emissions by sector - ' + str(iea_country_name) + '.csv'
-    filename_tfc = 'Total final consumption (TFC) by source - ' + str(iea_country_name) + '.csv'
+    filename_co2_emissions_by_sector, filename_tfc = iea_filenames(country_name)
     try:
         co2_by_sector = pd.read_csv(filename_co2_emissions_by_sector, skiprows=3, index_col=0,
                                     dtype={'Electricity and heat producers': float, 'Other energy industries': float,
@@ -206,12 +343,12 @@ def import_iea_data(country_name):
 # 4. Final year country shares of global fossil fuel CO2 emissions treemap plot (using EI data)
 #
 ########################################################################################################################
-def co2_data(energy_data, c_budget_data, remaining_c_budget_data, conc_data):
+def co2_data(ei_cube, c_budget_data, remaining_c_budget_data, conc_data):
     country = 'World'
 
     # Calculate country shares of fossil fuel CO2 emissions for final year of EI dataset. This is used in following code
     # for generation of data required for treemap plots.
-    country_shares_fy = process.calc_country_shares_fy(energy_data)
+    country_shares_fy = process.calc_country_shares_fy(ei_cube)
 
     # Calculate all carbon related shares and organise into format required for treemap plots.
     treemap_c_budget_categories, treemap_c_budget_sources, treemap_country_emission_shares = (
@@ -240,45 +377,170 @@ def co2_data(energy_data, c_budget_data, remaining_c_budget_data, conc_data):
 #
 ########################################################################################################################
 def fossil_fuel_producer_shares(data):
-    # Extract fossil fuel production data from dataframe into separate dataframes.
-    coal_prod = data.loc[data['Var'] == 'coalprod_ej']
-    oil_prod = data.loc[data['Var'] == 'oilprod_mt']
-    gas_prod = data.loc[data['Var'] == 'gasprod_ej']
+    # Generate dataframes of producers listed in user_globals.PRODUCER_SHARES in format required by treemap plotting
+    # functions.
+    producer_shares = process.world_fossil_fuel_production(data, user_globals.PRODUCER_SHARES)
 
-    # Obtain latest world production value of each fossil fuel in order to calculate shares of each country's
-    # production.
-    # 1. Coal
-    world_coal_prod = coal_prod.loc[coal_prod['Country'] == 'Total World']
-    world_coal_prod_latest = world_coal_prod.loc[
-        world_coal_prod.index == max(world_coal_prod.index), 'Value'
-    ]
-    total_coal = float(world_coal_prod_latest.values)
-
-    # 2. Oil
-    world_oil_prod = oil_prod.loc[oil_prod['Country'] == 'Total World']
-    world_oil_prod_latest = world_oil_prod.loc[
-        world_oil_prod.index == max(world_oil_prod.index), 'Value'
-    ]
-    total_oil = float(world_oil_prod_latest.values)
+    # Output above dataframes to console.
+    for name, shares in producer_shares.items():
+        print('Large ' + name.lower() + ' producers:\n', str(shares), '\n')
 
-    # 3. Gas
-    world_gas_prod = gas_prod.loc[gas_prod['Country'] == 'Total World']
-    world_gas_prod_latest = world_gas_prod.loc[
-        world_gas_prod.index == max(world_gas_prod.index), 'Value'
-    ]
-    total_gas = float(world_gas_prod_latest.values)
-
-    # Generate dataframes of fossil fuel producers in format required by treemap plotting functions.
-    coal_producer_df, oil_producer_df, gas_producer_df = process.world_fossil_fuel_production(
-        coal_prod, oil_prod, gas_prod, total_coal, total_oil, total_gas
+    return producer_shares['Coal'], producer_shares['Oil'], producer_shares['Gas']
+
+
+########################################################################################################################
+#
+# Function: rankings()
+#
+# Description:
+# Calculates annual shares and rankings of countries for the metrics listed in user_globals.RANKING_METRICS, from
+# user_globals.Constant.RANKING_START_YR onward, and identifies overtakes in each ranking between consecutive years.
+#
+########################################################################################################################
+def rankings(ei_cube):
+    cube = process.ranking_cube(ei_cube, user_globals.RANKING_METRICS, user_globals.Constant.RANKING_START_YR.value)
+    overtakes = process.ranking_overtakes(cube)
+
+    # Output overtakes in most recent year to console.
+    fy_overtakes = overtakes.loc[overtakes['Year'] == overtakes['Year'].max()]
+    for metric, metric_overtakes in fy_overtakes.groupby('Metric', sort=False):
+        print('\n' + metric + ' overtakes in ' + str(metric_overtakes['Year'].iloc[0]) + ':')
+        for country, rank, overtaken, overtaken_rank in zip(metric_overtakes['Country'], metric_overtakes['Rank'],
+                                                            metric_overtakes['Overtaken'],
+                                                            metric_overtakes['Overtaken Rank']):
+            print(country + ' (now ' + str(rank) + ') overtook ' + overtaken + ' (now ' + str(overtaken_rank) + ')')
+
+    return user_globals.Rankings(cube, overtakes)
+
+
+########################################################################################################################
+#
+# Function: per_capita_emissions()
+#
+# Description:
+# Calculates per capita fossil fuel CO2 emissions of all countries for the final year of EI data, and organises them for
+# the per capita emissions chart, along with data for the chart's footer text. Only the column highlighted differs
+# between countries profiled, so this is done once per run, and the highlight is selected by per_capita_highlight().
+# Per capita emissions and their rankings are also calculated for all years, by dividing entire matrices of emissions
+# and population.
+#
+########################################################################################################################
+def per_capita_emissions(ei_cube, wb_data):
+    # Associated data for chart footer text.
+    pc_associated_data = {}
+    # Determine final year of EI data.
+    fy = ei_cube.years[-1]
+    # Population of each country in final year.
+    pop_data = wb_data.loc[fy].to_frame('Population')
+    # Determine world population.
+    world_population = pop_data.at['WLD', 'Population']
+    # To reduce execution time, only use most recent year of fossil fuel CO2 emissions data.
+    fy_energy_data = ei_cube.year_frame('co2_combust_mtco2', fy)
+    # Determine world FF CO2 emissions in final year.
+    world_emissions_mtco2 = fy_energy_data.loc[fy_energy_data['Country'] == 'Total World', 'Value'].values[0]
+    # Calculate world mean per capita FF CO2 emissions
+    world_pc_tco2 = world_emissions_mtco2 * 1e6 / world_population
+    # Identify those countries that appear in both datasets by joining them on ISO code, retaining the order of
+    # population data, and calculate their per capita emissions.
+    pc_data = pop_data.join(
+        fy_energy_data.dropna(subset=['ISO3166_alpha3']).set_index('ISO3166_alpha3')[['Country', 'Value']],
+        how='inner')
+    pc_data['PC tCO2'] = pc_data['Value'] * 1e6 / pc_data['Population']
+    # World is added at end of chart, so isn't plotted or tallied with countries.
+    pc_data['World'] = pc_data.index == 'WLD'
+    # Separate countries that exceed set threshold.
+    pc_data['Plotted'] = ~pc_data['World'] & (pc_data['PC tCO2'] >= user_globals.Constant.PER_CAPITA_THRESHOLD.value)
+    high = pc_data['Plotted']
+    # All per capita emissions being plotted (those below set threshold will be included in 'Other').
+    high_pc_tco2 = pd.Series(pc_data.loc[high, 'PC tCO2'].values, index=pc_data.loc[high, 'Country'].values,
+                             name='Per capita FFCO2 emissions')
+    # Tally the cumulative population and emissions of countries above threshold, and of all countries that appeared in
+    # both datasets. Values are added one at a time in order of population data, so that rounding of totals is
+    # unchanged from a running tally (unlike sum(), which compensates for rounding as of Python 3.12).
+    plotted_pop = functools.reduce(operator.add, pc_data.loc[high, 'Population'], 0)
+    plotted_emissions_mtco2 = functools.reduce(operator.add, pc_data.loc[high, 'Value'], 0)
+    assessed_population = functools.reduce(operator.add, pc_data.loc[~pc_data['World'], 'Population'], 0)
+    assessed_emissions_mtco2 = functools.reduce(
+        operator.add, pc_data.loc[pc_data['Country'] != 'Total World', 'Value'], 0)
+
+    # Calculate the share of world population assessed.
+    assessed_share_world_population = assessed_population / world_population
+    # Calculate the share of world FF CO2 emissions assessed.
+    assessed_share_world_co2_emissions = assessed_emissions_mtco2 / world_emissions_mtco2
+    # Calculate the per capita emissions of the remaining population.
+    other_pc_emissions_for_plot_tco2 = pd.Series(
+        data=[1e6 * (world_emissions_mtco2 - plotted_emissions_mtco2) / (world_population - plotted_pop)],
+        index=['Other'])
+    high_pc_tco2.sort_values(ascending=False, inplace=True)
+    world_pc_emissions_for_plot_tco2 = pd.Series(data=[world_pc_tco2], index=['World'])
+    # Concat for plotting.
+    plot_pc_tco2 = pd.concat([high_pc_tco2, other_pc_emissions_for_plot_tco2, world_pc_emissions_for_plot_tco2])
+
+    # Shorten relevant country names
+    plot_pc_tco2.rename(index={'Total World': 'World'}, inplace=True)
+    plot_pc_tco2.rename(index={'China Hong Kong SAR': 'Hong Kong'}, inplace=True)
+    plot_pc_tco2.rename(index={'United Arab Emirates': 'UAE'}, inplace=True)
+
+    # Collect associated per capita stats required for chart's footnotes.
+    pc_associated_data['Assessed Pop Share'] = assessed_share_world_population
+    pc_associated_data['Assessed FFCO2 Emissions Share'] = assessed_share_world_co2_emissions
+    pc_associated_data['World Pop'] = world_population
+    pc_associated_data['World FFCO2 Emissions MtCO2'] = world_emissions_mtco2
+    pc_associated_data['World PC tCO2'] = world_pc_tco2
+    pc_associated_data['FY'] = fy
+
+    # Construct matrix of annual emissions of each country identified by ISO code (excluding duplicates), in the same
+    # arrangement as population data, and divide matrices for all years common to both.
+    co2 = ei_cube.var_index['co2_combust_mtco2']
+    has_iso = pd.notna(ei_cube.iso)
+    unique_iso = ~pd.Index(ei_cube.iso[has_iso]).duplicated()
+    emissions_mtco2 = pd.DataFrame(ei_cube.values[has_iso, co2, :][unique_iso].T,
+                                   index=pd.Index(ei_cube.years, name='Year'), columns=ei_cube.iso[has_iso][unique_iso])
+    emissions_mtco2, population = emissions_mtco2.align(wb_data, join='inner')
+    pc_tco2_history = emissions_mtco2 * 1e6 / population
+    # Rank countries for each year, from highest per capita emissions (1) to lowest, excluding World.
+    pc_tco2_rank_history = pc_tco2_history.drop(columns='WLD', errors='ignore').rank(
+        axis=1, ascending=False, method='min')
+    # Label columns with EI country names.
+    country_names = dict(zip(ei_cube.iso[has_iso][unique_iso], ei_cube.countries[has_iso][unique_iso]))
+    pc_tco2_history = pc_tco2_history.rename(columns=country_names)
+    pc_tco2_rank_history = pc_tco2_rank_history.rename(columns=country_names)
+
+    return user_globals.Per_Capita_Emissions(
+        plot_pc_tco2,
+        pc_associated_data,
+        pc_data,
+        other_pc_emissions_for_plot_tco2.values[0],
+        world_pc_emissions_for_plot_tco2,
+        pc_tco2_history,
+        pc_tco2_rank_history,
     )
 
-    # Output above dataframes to console.
-    print('Large coal producers:\n', str(coal_producer_df))
-    print('\nLarge oil producers:\n', str(oil_producer_df))
-    print('\nLarge gas producers:\n', str(gas_producer_df), '\n')
 
-    return coal_producer_df, oil_producer_df, gas_producer_df
+########################################################################################################################
+#
+# Function: per_capita_highlight()
+#
+# Description:
+# Selects the column of the per capita emissions chart to be highlighted for the country being profiled, being its own
+# if plotted individually, 'Other' if below the per capita threshold, or 'World' if the world is being profiled.
+#
+########################################################################################################################
+def per_capita_highlight(pc_emissions, profile_country):
+    pc_data = pc_emissions.country_pc_tco2
+    if profile_country == 'Total World':
+        return {'Country': 'World', 'Value': pc_emissions.world_pc_tco2}
+
+    profile_rows = ~pc_data['World'] & (pc_data['Country'] == profile_country)
+    if (profile_rows & pc_data['Plotted']).any():
+        profile_country_pc_tco2 = {'Country': profile_country, 'Value': pc_data.loc[profile_rows, 'PC tCO2'].iloc[-1]}
+        # Rename if need be.
+        if profile_country_pc_tco2['Country'] == 'United Arab Emirates':
+            profile_country_pc_tco2['Country'] = 'UAE'
+        return profile_country_pc_tco2
+    # Country being profiled is below threshold, so 'Other' is assigned to its per capita emissions to be highlighted in
+    # the per capita chart.
+    return {'Country': 'Other', 'Value': pc_emissions.other_pc_tco2}
 
 
 ########################################################################################################################
@@ -287,22 +549,25 @@ def fossil_fuel_producer_shares(data):
 #
 # Description:
 # Calls all functions required to populate data of a specified country's energy system in the object
-# country_energy_system.
+# country_energy_system. Only the functions of process.py named in processes are called, or all if None, so that
+# calculations no selected chart uses are skipped.
 #
 ########################################################################################################################
-def energy(country, ei_data, co2_by_sector_Mt, tfc_TJ, wb_data):
-    country_energy_system = populate_energy_system(country, ei_data, co2_by_sector_Mt, tfc_TJ, wb_data)
+def energy(country, ei_cube, co2_by_sector_Mt, tfc_TJ, pc_emissions, processes=None):
+    country_energy_system = populate_energy_system(country, ei_cube, co2_by_sector_Mt, tfc_TJ, pc_emissions)
     if country_energy_system.incl_ei_flag is True:
-        # Calculate primary energy annual quantities, shares, and change.
-        process.primary_energy(country_energy_system)
-        # Calculate electricity generation shares, and change.
-        process.electricity(country_energy_system)
+        if processes is None or 'primary_energy' in processes:
+            # Calculate primary energy annual quantities, shares, and change.
+            process.primary_energy(country_energy_system)
+        if processes is None or 'electricity' in processes:
+            # Calculate electricity generation shares, and change.
+            process.electricity(country_energy_system)
     else:
         print('Country not found in EI data')
-    if country_energy_system.sector_co2_Mt is not None:
+    if country_energy_system.sector_co2_Mt is not None and (processes is None or 'sector_co2' in processes):
         # Calculate columns to be plotted.
         process.sector_co2(country_energy_system)
-    if country_energy_system.finalenergy_PJ is not None:
+    if country_energy_system.finalenergy_PJ is not None and (processes is None or 'final_energy' in processes):
         # Calculate final energy annual shares and changes.
         process.final_energy(country_energy_system)
     return country_energy_system
@@ -313,16 +578,16 @@ def energy(country, ei_data, co2_by_sector_Mt, tfc_TJ, wb_data):
 # Function: populate_energy_system()
 #
 # Description:
-# Collates country specific annual fossil fuel CO2 emissions, country per capita fossil fuel CO2 emissions for final
-# year of data, annual fossil fuel production, annual fossil fuel primary energy, and annual electricity data using
-# the Energy Institute's dataset. Collates country specific final energy data using the IEA's dataset.
+# Collates country specific annual fossil fuel CO2 emissions, the per capita fossil fuel CO2 emissions chart data with
+# the country highlighted, annual fossil fuel production, annual fossil fuel primary energy, and annual electricity data
+# using the Energy Institute's dataset. Collates country specific final energy data using the IEA's dataset.
 #
 ########################################################################################################################
-def populate_energy_system(country, ei_data, co2_by_sector_Mt, tfc_TJ, pop_data):
-    # Flag if country is included in EI data, and extract the country's data.
-    if country in ei_data['Country'].values:
+def populate_energy_system(country, ei_cube, co2_by_sector_Mt, tfc_TJ, pc_emissions):
+    # Flag if country is included in EI data. The country's data is sliced from the EI cube as required below.
+    if country in ei_cube.country_index:
         incl_ei_flag = True
-        country_data = ei_data.loc[ei_data['Country'] == country]
+        ei_country = country
 
         # Replace EI's 'Total World' label for chart titles.
         if country == 'Total World':
@@ -331,13 +596,14 @@ def populate_energy_system(country, ei_data, co2_by_sector_Mt, tfc_TJ, pop_data)
         ################################################################################################################
         # Fossil Fuel CO2 Emissions.
         ################################################################################################################
-        # Construct dataframe of fossil fuel CO2 emissions.
-        ffco2_data_Mt = country_data.loc[country_data['Var'] == 'co2_combust_mtco2', 'Value']
-        ffco2_Mt = pd.DataFrame(index=ffco2_data_Mt.index, columns=['Value', 'Change'])
-        ffco2_Gt = pd.DataFrame(index=ffco2_data_Mt.index, columns=['Value', 'Change'])
-
-        ffco2_Mt['Value'] = ffco2_data_Mt
-        ffco2_Gt['Value'] = ffco2_data_Mt / 1000
+        # Construct dataframe of fossil fuel CO2 emissions. The 'Change' column is filled by process.ffco2_change().
+        ffco2_data_Mt = ei_cube.series(ei_country, 'co2_combust_mtco2')
+        ffco2_values_Mt = ffco2_data_Mt.to_numpy(dtype=float)
+        no_change = np.full(len(ffco2_values_Mt), np.nan)
+        ffco2_Mt = pd.DataFrame(np.column_stack([ffco2_values_Mt, no_change]), index=ffco2_data_Mt.index,
+                                columns=['Value', 'Change'])
+        ffco2_Gt = pd.DataFrame(np.column_stack([ffco2_values_Mt / 1000, no_change]), index=ffco2_data_Mt.index,
+                                columns=['Value', 'Change'])
 
         # Calculate annual change.
         process.ffco2_change(ffco2_Mt)
@@ -349,212 +615,94 @@ def populate_energy_system(country, ei_data, co2_by_sector_Mt, tfc_TJ, pop_data)
             profile_country = 'Total World'
         else:
             profile_country = country
-        # Per capita emissions for specific country being profiled, dictionary.
-        profile_country_pc_tco2 = {}
-        # All per capita emissions, dictionary.
-        all_pc_tco2 = {}
-        # All per capita emissions being plotted (those below set threshold will be included in 'Other').
-        high_pc_tco2 = pd.Series(name='Per capita FFCO2 emissions')
-
-        # Associated data for chart footer text.
-        pc_associated_data = {}
-        # During calculations, tally emissions and population plotted and processed.
-        plotted_emissions_mtco2 = 0
-        plotted_pop = 0
-
-        assessed_population = 0
-        assessed_emissions_mtco2 = 0
-        # Set flag for country being profiled to be assigned per capita emissions of 'Other' unless found to be above
-        # per capita emission threshold.
-        country_below_threshold = True
-        # Determine final year of EI data.
-        fy = max(ei_data.index)
-        # Determine world population.
-        world_population = pop_data.at['WLD', 'Population']
-        # To reduce execution time, only use most recent year of energy data.
-        fy_energy_data = ei_data.loc[max(ei_data.index)]
-        # Change index to allow sorting by FF CO2.
-        fy_energy_data.set_index('Var', inplace=True)
-        # Determine world FF CO2 emissions in final year.
-        world_emissions_mtco2 = fy_energy_data.loc[
-            (fy_energy_data.index == 'co2_combust_mtco2') & (
-                    fy_energy_data['Country'] == 'Total World'), 'Value'].values[0]
-        # Calculate world mean per capita FF CO2 emissions
-        world_pc_tco2 = world_emissions_mtco2 * 1e6 / world_population
-        # Identify those countries that appear in both datasets, and calculate their per capita emissions.
-        for pop_row in pop_data.itertuples():
-            for energy_row in fy_energy_data.itertuples():
-                if pop_row.Index == energy_row.ISO3166_alpha3:
-                    # Calculate per capita emissions of each country.
-                    if energy_row.Index == 'co2_combust_mtco2':
-                        country_pc_tco2 = energy_row.Value * 1e6 / pop_row.Population
-                        all_pc_tco2[energy_row.Country] = country_pc_tco2
-                        # Save separate value for country being profiled to allow it to be highlighted in chart.
-                        if energy_row.Country == profile_country and not pop_row.Index == 'WLD':
-                            profile_country_pc_tco2['Country'] = profile_country
-                            profile_country_pc_tco2['Value'] = country_pc_tco2
-                            # Rename if need be.
-                            if profile_country_pc_tco2['Country'] == 'United Arab Emirates':
-                                profile_country_pc_tco2['Country'] = 'UAE'
-                            if profile_country_pc_tco2['Country'] == 'Total World':
-                                profile_country_pc_tco2['Country'] = 'World'
-                        # Separate countries that exceed set threshold and tally the cumulative population and
-                        # emissions.
-                        if (country_pc_tco2 >= user_globals.Constant.PER_CAPITA_THRESHOLD.value
-                                and not pop_row.Index == 'WLD'):  # World is added at end of chart.
-                            high_pc_tco2[energy_row.Country] = country_pc_tco2
-                            # If the current country is that being profiled, and is above the threshold, then disable
-                            # the flag that assigns the column to be highlighted in the chart is that of 'Other'.
-                            if energy_row.Country == profile_country:
-                                country_below_threshold = False
-                            # Tally country above threshold provided it's not World.
-                            plotted_pop += pop_row.Population
-                            plotted_emissions_mtco2 += energy_row.Value
-                        # Tally population and emissions for countries that appeared in both datasets.
-                        if not pop_row.Index == 'WLD':
-                            assessed_population += pop_row.Population
-                        if not energy_row.Country == 'Total World':
-                            assessed_emissions_mtco2 += energy_row.Value
-        # Calculate the share of world population assessed.
-        assessed_share_world_population = assessed_population / world_population
-        # Calculate the share of world FF CO2 emissions assessed.
-        assessed_share_world_co2_emissions = assessed_emissions_mtco2 / world_emissions_mtco2
-        # Calculate the per capita emissions of the remaining population.
-        other_pc_emissions_for_plot_tco2 = pd.Series(
-            data=[1e6 * (world_emissions_mtco2 - plotted_emissions_mtco2) / (world_population - plotted_pop)],
-            index=['Other'])
-        # If country being profiled is below threshold, then 'Other' are assigned to its per capita emissions to be
-        # plotted in the per capita chart.
-        if country_below_threshold is True and not profile_country == 'World':
-            profile_country_pc_tco2 = {'Country': 'Other', 'Value': other_pc_emissions_for_plot_tco2.values[0]}
-        high_pc_tco2.sort_values(ascending=False, inplace=True)
-        world_pc_emissions_for_plot_tco2 = pd.Series(data=[world_pc_tco2], index=['World'])
-        # Concat for plotting.
-        plot_pc_tco2 = pd.concat([high_pc_tco2, other_pc_emissions_for_plot_tco2, world_pc_emissions_for_plot_tco2])
-
-        # If World is being profiled, then assign world per capita emissions to it's highlighted.
-        if profile_country == 'Total World':
-            profile_country_pc_tco2 = {'Country': 'World', 'Value': world_pc_emissions_for_plot_tco2}
-
-        # Shorten relevant country names
-        plot_pc_tco2.rename(index={'Total World': 'World'}, inplace=True)
-        plot_pc_tco2.rename(index={'China Hong Kong SAR': 'Hong Kong'}, inplace=True)
-        plot_pc_tco2.rename(index={'United Arab Emirates': 'UAE'}, inplace=True)
-
-        # Collect associated per capita stats required for chart's footnotes.
-        pc_associated_data['Assessed Pop Share'] = assessed_share_world_population
-        pc_associated_data['Assessed FFCO2 Emissions Share'] = assessed_share_world_co2_emissions
-        pc_associated_data['World Pop'] = world_population
-        pc_associated_data['World FFCO2 Emissions MtCO2'] = world_emissions_mtco2
-        pc_associated_data['World PC tCO2'] = world_pc_tco2
-        pc_associated_data['FY'] = fy
+        # Per capita emissions of all countries are calculated once per run, by per_capita_emissions(). Only the column
+        # highlighted for the country being profiled is selected here. They're None if per capita charts aren't being
+        # generated.
+        if pc_emissions is not None:
+            plot_pc_tco2 = pc_emissions.pc_tco2
+            pc_associated_data = pc_emissions.associated_data
+            profile_country_pc_tco2 = per_capita_highlight(pc_emissions, profile_country)
+        else:
+            plot_pc_tco2 = None
+            pc_associated_data = None
+            profile_country_pc_tco2 = None
 
         ################################################################################################################
         # Fossil Fuel Production.
         ################################################################################################################
 
         # Identify primary energy in country data.
-        total_primary_EJ = country_data.loc[country_data['Var'] == 'tes_ej', 'Value']
+        total_primary_EJ = ei_cube.series(ei_country, 'tes_ej')
 
-        # Extract fossil fuel production data, convert to PJ, and copy to dataframe ffprod_PJ.
-        ffprod_PJ = pd.DataFrame(index=total_primary_EJ.index, columns=['Coal', 'Oil', 'Gas'])
-        ffprod_PJ['Coal'] = (
-                country_data.loc[country_data['Var'] == 'coalprod_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        oil_mt = country_data.loc[country_data['Var'] == 'oilprod_mt', 'Value']
-        ffprod_PJ['Oil'] = (
-                oil_mt
-                * 1e6
-                * user_globals.Constant.TOE_TO_GJ.value
-                * user_globals.Constant.GJ_TO_PJ.value
-        )
-        ffprod_PJ['Gas'] = (
-                country_data.loc[country_data['Var'] == 'gasprod_ej', 'Value'] * user_globals.Constant.EJ_TO_PJ.value)
-        # If nil production, create 0 series in order for chart function to plot correctly.
-        if ffprod_PJ['Coal'].empty or ffprod_PJ['Coal'].dropna().empty:
-            ffprod_PJ['Coal'] = pd.Series(data=0, index=total_primary_EJ.index)
-        if ffprod_PJ['Oil'].empty or ffprod_PJ['Oil'].dropna().empty:
-            ffprod_PJ['Oil'] = pd.Series(data=0, index=total_primary_EJ.index)
-        if ffprod_PJ['Gas'].empty or ffprod_PJ['Gas'].dropna().empty:
-            ffprod_PJ['Gas'] = pd.Series(data=0, index=total_primary_EJ.index)
+        # Extract fossil fuel production data listed in user_globals.EI_TABLES, converted to PJ, as a float block.
+        ffprod_values = extract_ei_table(ei_cube, ei_country, 'ffprod_PJ', total_primary_EJ.index).to_numpy(copy=True)
+        # If nil production, use 0 for every year in order for chart function to plot correctly.
+        ffprod_values[:, np.isnan(ffprod_values).all(axis=0)] = 0
+        ffprod_PJ = pd.DataFrame(ffprod_values, index=total_primary_EJ.index,
+                                 columns=list(user_globals.EI_TABLES['ffprod_PJ']))
 
         ################################################################################################################
         # Primary Energy.
         ################################################################################################################
 
-        # Extract primary energy data, convert to PJ, and copy to dataframe primary_PJ.
+        # Extract primary energy data listed in user_globals.EI_TABLES, converted to PJ, replacing any NaNs with 0.
+        primary_fuels = extract_ei_table(ei_cube, ei_country, 'primary_PJ', total_primary_EJ.index).fillna(0)
+        coal, oil, gas, nuclear, hydro, wind, solar, bio_geo_other = primary_fuels.to_numpy().T
+
+        # Calculate primary energy categories, and construct dataframe primary_PJ from a single float block.
         primary_PJ = pd.DataFrame(
+            np.column_stack([
+                primary_fuels.to_numpy(),
+                coal + oil + gas,
+                hydro + wind + solar,
+                total_primary_EJ.to_numpy(dtype=float) * user_globals.Constant.EJ_TO_PJ.value,
+            ]),
             index=total_primary_EJ.index,
-            columns=[
-                'Coal',
-                'Oil',
-                'Gas',
-                'Nuclear',
-                'Hydro',
-                'Wind',
-                'Solar',
-                'Bio, Geo and Other',
-                'Fossil Fuels',
-                'Renewables',
-                'Total',
-            ],
-        )
-        primary_PJ['Coal'] = (
-                country_data.loc[country_data['Var'] == 'coal_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ['Oil'] = (
-                country_data.loc[country_data['Var'] == 'oil_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ['Gas'] = (
-                country_data.loc[country_data['Var'] == 'gas_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ['Nuclear'] = (
-                country_data.loc[country_data['Var'] == 'nuclear_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ['Hydro'] = (
-                country_data.loc[country_data['Var'] == 'hydro_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ['Wind'] = (
-                country_data.loc[country_data['Var'] == 'wind_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ['Solar'] = (
-                country_data.loc[country_data['Var'] == 'solar_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
+            columns=list(primary_fuels.columns) + ['Fossil Fuels', 'Renewables', 'Total'],
         )
-        primary_PJ['Bio, Geo and Other'] = (
-                (country_data.loc[country_data['Var'] == 'biogeo_tes_ej', 'Value']
-                + country_data.loc[country_data['Var'] == 'biofuels_tes_ej', 'Value'])
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        # Replace any NaNs with 0 in fields imported into primary_PJ.
-        with pd.option_context('future.no_silent_downcasting', True):
-            primary_PJ.fillna(0, inplace=True)
-
-        # Calculate primary energy categories.
-        primary_PJ['Fossil Fuels'] = (primary_PJ['Coal'] + primary_PJ['Oil'] + primary_PJ['Gas'])
-        primary_PJ['Renewables'] = (primary_PJ['Hydro'] + primary_PJ['Wind'] + primary_PJ['Solar'])
-        primary_PJ['Total'] = total_primary_EJ * user_globals.Constant.EJ_TO_PJ.value
 
         ################################################################################################################
         # Electricity Generation.
         ################################################################################################################
 
-        # Extract electricity generation data and copy to dataframe total_elecgen_TWh.
+        # Extract electricity generation data listed in user_globals.EI_TABLES and copy to dataframe elecgen_TWh.
         # For some countries (e.g. Norway, Luxembourg), EI data contains a total for the country ('elect_twh'), but not
         # a value for every fuel. In such cases, the country's value for total electricity generation, 'elect_twh', will
         # have a value and any difference between this and the sum of electricity generation by individual fuels is
         # classified here as 'Unpublished', and appear as a share in text in the top right of the plot. Data may
         # be provided for non-combustible fuels, in which case these will are plotted and totalled.
 
-        total_elecgen_TWh = country_data.loc[country_data['Var'] == 'elect_twh']
+        total_elecgen_TWh = ei_cube.series(ei_country, 'elect_twh')
+        # Replace any NaNs with 0 in fuels.
+        elecgen_fuels = extract_ei_table(ei_cube, ei_country, 'elecgen_TWh', total_elecgen_TWh.index).fillna(0)
+        coal, oil, gas, nuclear, hydro, wind, solar, bio_geo, other = elecgen_fuels.to_numpy().T
+
+        # Calculate categories.
+        bio_geo_other = bio_geo + other
+        sum_fuels = coal + oil + gas + nuclear + hydro + wind + solar + bio_geo_other
+        # Calculate annual unpublished quantity for the country, from the country total in data and the sum of elec gen
+        # by individual fuels.
+        total_country = total_elecgen_TWh.to_numpy(dtype=float)
         elecgen_TWh = pd.DataFrame(
+            np.column_stack([
+                coal,
+                oil,
+                gas,
+                nuclear,
+                hydro,
+                wind,
+                solar,
+                bio_geo,
+                other,
+                bio_geo_other,
+                coal + oil + gas,
+                wind + solar,
+                wind + solar + hydro,
+                sum_fuels,
+                np.zeros(len(total_country)),
+                total_country,
+                total_country - sum_fuels,
+            ]),
             index=total_elecgen_TWh.index,
             columns=[
                 'Coal',
@@ -576,53 +724,13 @@ def populate_energy_system(country, ei_data, co2_by_sector_Mt, tfc_TJ, pop_data)
                 'Unpublished',
             ],
         )
-        elecgen_TWh['Coal'] = country_data.loc[country_data['Var'] == 'electbyfuel_coal', 'Value']
-        elecgen_TWh['Oil'] = country_data.loc[country_data['Var'] == 'electbyfuel_oil', 'Value']
-        elecgen_TWh['Gas'] = country_data.loc[country_data['Var'] == 'electbyfuel_gas', 'Value']
-        elecgen_TWh['Nuclear'] = country_data.loc[country_data['Var'] == 'nuclear_twh', 'Value']
-        elecgen_TWh['Hydro'] = country_data.loc[country_data['Var'] == 'hydro_twh', 'Value']
-        elecgen_TWh['Wind'] = country_data.loc[country_data['Var'] == 'wind_twh', 'Value']
-        elecgen_TWh['Solar'] = country_data.loc[country_data['Var'] == 'solar_twh', 'Value']
-        elecgen_TWh['Bio, Geo'] = country_data.loc[country_data['Var'] == 'biogeo_twh', 'Value']
-        elecgen_TWh['Other'] = country_data.loc[country_data['Var'] == 'electbyfuel_other', 'Value']
-        # Replace any NaNs with 0.
-        with pd.option_context('future.no_silent_downcasting', True):
-            elecgen_TWh.fillna(0, inplace=True)
 
-        # Calculate categories.
-        elecgen_TWh['Fossil Fuels'] = (elecgen_TWh['Coal'] + elecgen_TWh['Oil'] + elecgen_TWh['Gas'])
-        elecgen_TWh['Wind and Solar'] = elecgen_TWh['Wind'] + elecgen_TWh['Solar']
-        elecgen_TWh['Renewables'] = (elecgen_TWh['Wind'] + elecgen_TWh['Solar'] + elecgen_TWh['Hydro'])
-        elecgen_TWh['Bio, Geo and Other'] = elecgen_TWh['Bio, Geo'] + elecgen_TWh['Other']
-
-        # Calculate unpublished quantity for the country.
-        # Extract country total from data.
-        elecgen_TWh['Total Country'] = country_data.loc[country_data['Var'] == 'elect_twh', 'Value']
-        # Calculate sum of elec gen by individual fuels in data.
-        elecgen_TWh['Sum Fuels'] = (
-                elecgen_TWh['Coal']
-                + elecgen_TWh['Oil']
-                + elecgen_TWh['Gas']
-                + elecgen_TWh['Nuclear']
-                + elecgen_TWh['Hydro']
-                + elecgen_TWh['Wind']
-                + elecgen_TWh['Solar']
-                + elecgen_TWh['Bio, Geo and Other']
-        )
-        # Calculate annual unpublished quantity.
-        elecgen_TWh['Unpublished'] = (elecgen_TWh['Total Country'] - elecgen_TWh['Sum Fuels'])
-
-        # Replace very small quantities with 0, for purpose of plotting.
-        elecgen_TWh['Coal'] = np.where(elecgen_TWh['Coal'] < 0.1, 0, elecgen_TWh['Coal'])
-        elecgen_TWh['Oil'] = np.where(elecgen_TWh['Oil'] < 0.1, 0, elecgen_TWh['Oil'])
-        elecgen_TWh['Gas'] = np.where(elecgen_TWh['Gas'] < 0.1, 0, elecgen_TWh['Gas'])
-        elecgen_TWh['Nuclear'] = np.where(elecgen_TWh['Nuclear'] < 0.1, 0, elecgen_TWh['Nuclear'])
-        elecgen_TWh['Hydro'] = np.where(elecgen_TWh['Hydro'] < 0.1, 0, elecgen_TWh['Hydro'])
-        elecgen_TWh['Wind'] = np.where(elecgen_TWh['Wind'] < 0.1, 0, elecgen_TWh['Wind'])
-        elecgen_TWh['Solar'] = np.where(elecgen_TWh['Solar'] < 0.1, 0, elecgen_TWh['Solar'])
-        elecgen_TWh['Bio, Geo and Other'] = np.where(elecgen_TWh['Bio, Geo and Other'] <
-                                                     0.1, 0, elecgen_TWh['Bio, Geo and Other'])
-        elecgen_TWh['Unpublished'] = np.where(elecgen_TWh['Unpublished'] < 0.1, 0, elecgen_TWh['Unpublished'])
+        # Replace very small quantities with 0, for purpose of plotting. Categories above are calculated beforehand,
+        # from the unclipped quantities.
+        clipped_columns = ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydro', 'Wind', 'Solar', 'Bio, Geo and Other',
+                           'Unpublished']
+        clipped_values = elecgen_TWh[clipped_columns].to_numpy()
+        elecgen_TWh[clipped_columns] = np.where(clipped_values < 0.1, 0, clipped_values)
     else:
         print('Country not in EI data.\n')
         incl_ei_flag = False
@@ -662,6 +770,33 @@ def populate_energy_system(country, ei_data, co2_by_sector_Mt, tfc_TJ, pop_data)
     )
 
 
+########################################################################################################################
+#
+# Function: extract_ei_table()
+#
+# Description:
+# Extracts all columns of a table listed in registry user_globals.EI_TABLES for a country and specified years, using a
+# single slice of the EI cube. Variables of each column are summed, then each column is converted to the table's units.
+# As when aligning series to the years, a column is NaN for years in which any of its variables has no data.
+#
+########################################################################################################################
+def extract_ei_table(ei_cube, country, table, years):
+    columns = user_globals.EI_TABLES[table]
+    year_positions = np.array([ei_cube.year_index[year] for year in years], dtype=int)
+    country_values = ei_cube.values[ei_cube.country_index[country]][:, year_positions]
+
+    # Gather rows of all variables in order, with a NaN row for any variable absent from EI data.
+    ei_vars = [var for ei_vars, factor in columns.values() for var in ei_vars]
+    var_positions = np.array([ei_cube.var_index.get(var, -1) for var in ei_vars], dtype=int)
+    var_values = np.where((var_positions >= 0)[:, np.newaxis], country_values[var_positions], np.nan)
+
+    # Sum rows of each column's variables, then convert units.
+    column_starts = np.cumsum([0] + [len(ei_vars) for ei_vars, factor in columns.values()])[:-1]
+    factors = np.array([factor for ei_vars, factor in columns.values()], dtype=float)
+    column_values = np.add.reduceat(var_values, column_starts, axis=0) * factors[:, np.newaxis]
+    return pd.DataFrame(column_values.T, index=years, columns=list(columns))
+
+
 ########################################################################################################################
 #
 # Function: populate_major_emitter_co2_energy_dataframe()
@@ -670,55 +805,62 @@ def populate_energy_system(country, ei_data, co2_by_sector_Mt, tfc_TJ, pop_data)
 # For major emitters, construct dataframe of fossil fuel CO2 emissions and primary energy data.
 #
 ########################################################################################################################
-def populate_major_emitter_co2_energy_dataframe(major_emitters, ei_data):
-    # Initialise loop counter
-    n = 0
-    # For each large emitting country -
-    for country in major_emitters:
-        # Generate multi index indices for dataframe
-        parameters = ['ffco2_Mt', 'primary_PJ_coal', 'primary_PJ_oil', 'primary_PJ_gas']
-        country_name = []
-        for i in range(4):
-            country_name = country_name + [country]
-        arrays = [country_name, parameters]
-        indices = pd.MultiIndex.from_arrays(arrays, names=('Country', 'Parameter'))
-
-        # Assemble data
-        country_energy_data = ei_data.loc[ei_data['Country'] == country]
-        ffco2_Mt = country_energy_data.loc[country_energy_data['Var'] == 'co2_combust_mtco2', 'Value']
-        primary_PJ_coal = (
-                country_energy_data.loc[country_energy_data['Var'] == 'coal_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ_oil = (
-                country_energy_data.loc[country_energy_data['Var'] == 'oil_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
-        primary_PJ_gas = (
-                country_energy_data.loc[country_energy_data['Var'] == 'gas_tes_ej', 'Value']
-                * user_globals.Constant.EJ_TO_PJ.value
-        )
+def populate_major_emitter_co2_energy_dataframe(major_emitters, ei_cube):
+    # Parameters of each country, with the EI variable and the factor converting it to the parameter's units.
+    parameters = {
+        'ffco2_Mt': ('co2_combust_mtco2', 1),
+        'primary_PJ_coal': ('coal_tes_ej', user_globals.Constant.EJ_TO_PJ.value),
+        'primary_PJ_oil': ('oil_tes_ej', user_globals.Constant.EJ_TO_PJ.value),
+        'primary_PJ_gas': ('gas_tes_ej', user_globals.Constant.EJ_TO_PJ.value),
+    }
+
+    # Slice all parameters of all major emitters from the EI cube at once, as an array of shape (countries, parameters,
+    # years). Rows of countries or variables absent from EI data are NaN.
+    country_positions = np.array([ei_cube.country_index.get(country, -1) for country in major_emitters], dtype=int)
+    var_positions = np.array([ei_cube.var_index.get(ei_var, -1) for ei_var, factor in parameters.values()], dtype=int)
+    factors = np.array([factor for ei_var, factor in parameters.values()], dtype=float)
+    found = ((country_positions >= 0)[:, np.newaxis] & (var_positions >= 0)[np.newaxis, :])[:, :, np.newaxis]
+    cube_positions = np.ix_(country_positions, var_positions)
+    values = np.where(found, ei_cube.values[cube_positions], np.nan) * factors[np.newaxis, :, np.newaxis]
+    present = found & ei_cube.present[cube_positions]
+
+    # Arrange as (Country, Parameter) x Year, for years in which any parameter of any country has a value.
+    years = present.any(axis=(0, 1))
+    indices = pd.MultiIndex.from_product([list(major_emitters), list(parameters)], names=('Country', 'Parameter'))
+    return pd.DataFrame(values[:, :, years].reshape(len(indices), -1), index=indices,
+                        columns=pd.Index(ei_cube.years[years], name='Year'))
 
-        # Name each data series
-        ffco2_Mt.name = 'ffco2_Mt'
-        primary_PJ_coal.name = 'primary_PJ_coal'
-        primary_PJ_oil.name = 'primary_PJ_oil'
-        primary_PJ_gas.name = 'primary_PJ_gas'
-
-        # Concatenate series to create a dataframe
-        dataframe = pd.concat([ffco2_Mt, primary_PJ_coal, primary_PJ_oil, primary_PJ_gas], axis=1)
-        # Transpose
-        dataframe = dataframe.T
-        # Replace index with multi index generated above
-        dataframe.index = indices
-        # Create parent dataframe
-        if n == 0:
-            major_emitter_co2_energy_dataframe = dataframe
-        else:
-            major_emitter_co2_energy_dataframe = pd.concat([major_emitter_co2_energy_dataframe, dataframe])
-        # Increment loop counter
-        n += 1
-    return major_emitter_co2_energy_dataframe
+
+########################################################################################################################
+#
+# Function: major_producer_production()
+#
+# Description:
+# Collates annual production of a fuel (EI variable) by the major producers listed in a treemap dataframe generated by
+# process.world_fossil_fuel_production(), with a column per producer labelled with its share. Production of all
+# countries is sliced from the EI cube as a single Year x Country dataframe, from which the major producers are
+# selected, and production by all other countries is the residual of the World total. EI data isn't modified.
+# Production is converted to the units plotted by multiplying by each of factors in turn.
+#
+########################################################################################################################
+def major_producer_production(ei_cube, producers, ei_var, *factors):
+    # Restore original country names that may have been shortened earlier for display purposes.
+    names = countries.restore_original_country_name(producers['Name'])
+    labels = names + ' ' + producers['Value'].astype(str) + '%'
+
+    production = ei_cube.var_frame(ei_var)
+    for factor in factors:
+        production = production * factor
+
+    # Select major producers, for years in which any of them has a value. 'Other' isn't in EI data, so is initially 0.
+    major_production = production.reindex(columns=names)
+    major_production = major_production.loc[major_production.notna().any(axis=1)].fillna(0)
+
+    # Calculate production by all other countries by summing that from major producers and subtracting from World total.
+    other_production = production['Total World'].reindex(major_production.index) - major_production.sum(axis=1)
+    major_production.columns = labels.to_list()
+    major_production[labels[names == 'Other'].to_list()] = other_production.to_numpy()[:, np.newaxis]
+    return major_production
 
 
 ########################################################################################################################
@@ -730,103 +872,22 @@ def populate_major_emitter_co2_energy_dataframe(major_emitters, ei_data):
 #
 ########################################################################################################################
 def major_fossil_fuel_production(major_coal_producers, major_oil_producers, major_gas_producers,
-                                                  ei_data):
+                                                  ei_cube):
     # Identify names of major producing countries.
-    major_coal_producing_country_names = major_coal_producers['Name']
-    major_oil_producing_country_names = major_oil_producers["Name"]
-    major_gas_producing_country_names = major_gas_producers["Name"]
-    major_coal_producers_color_list = countries.assign_chart_colors(major_coal_producing_country_names)
-    major_oil_producers_color_list = countries.assign_chart_colors(major_oil_producing_country_names)
-    major_gas_producers_color_list = countries.assign_chart_colors(major_gas_producing_country_names)
-
-    # Restore original country names that may have been shortened earlier for display purposes.
-    major_coal_producing_country_names = countries.restore_original_country_name(major_coal_producing_country_names)
-    major_oil_producing_country_names = countries.restore_original_country_name(major_oil_producing_country_names)
-    major_gas_producing_country_names = countries.restore_original_country_name(major_gas_producing_country_names)
+    major_coal_producers_color_list = countries.assign_chart_colors(major_coal_producers['Name'])
+    major_oil_producers_color_list = countries.assign_chart_colors(major_oil_producers['Name'])
+    major_gas_producers_color_list = countries.assign_chart_colors(major_gas_producers['Name'])
 
     # 1. Coal
-    # Extract coal production values
-    coal_production_EJ = ei_data.loc[ei_data['Var'] == 'coalprod_ej', ('Country', 'Value')]
-    major_coal_production_EJ = pd.DataFrame()
-    for name in major_coal_producing_country_names:
-        country_coal_production_EJ = coal_production_EJ.loc[coal_production_EJ['Country'] == name]
-        country_coal_production_EJ = country_coal_production_EJ.drop(columns=['Country'])
-        country_share = major_coal_producers.loc[major_coal_producers['Name'] == name, 'Value']
-        label = name+' '+str(country_share.item())+'%'
-        if name == 'Other':
-            label_other = label
-        country_coal_production_EJ = country_coal_production_EJ.rename(columns={'Value':label})
-        major_coal_production_EJ = pd.concat([major_coal_production_EJ, country_coal_production_EJ], axis = 1)
-    major_coal_production_EJ = major_coal_production_EJ.fillna(0)
+    major_coal_production_EJ = major_producer_production(ei_cube, major_coal_producers, 'coalprod_ej')
 
-    # Calculate production by all other countries by summing that from major producers and subtracting from World total.
-    major_coal_production_EJ['Major Sum'] = major_coal_production_EJ.sum(1)
-    world_coal_production_EJ = ei_data.loc[(ei_data['Var'] == 'coalprod_ej') &
-                                           (ei_data['Country'] == 'Total World'), 'Value']
-    major_coal_production_EJ['World'] = world_coal_production_EJ
-    major_coal_production_EJ[label_other] = major_coal_production_EJ['World'] - major_coal_production_EJ['Major Sum']
-
-    # Drop columns 'Major Sum' and 'World' because they won't be plotted.
-    major_coal_production_EJ = major_coal_production_EJ.drop(columns=['Major Sum', 'World'])
-
-    # 2. Extract oil production values
-    oil_production_mt = ei_data.loc[ei_data['Var'] == 'oilprod_mt', ('Country', 'Value')]
-    oil_production_temp = oil_production_mt
-    oil_production_temp['Value'] = (oil_production_temp['Value'] *
-                                    1e6 *
-                                    user_globals.Constant.TOE_TO_GJ.value *
-                                    user_globals.Constant.GJ_TO_EJ.value)
-    oil_production_EJ = oil_production_temp
-    major_oil_production_EJ = pd.DataFrame()
-    for name in major_oil_producing_country_names:
-        country_oil_production_EJ = oil_production_EJ.loc[oil_production_EJ['Country'] == name]
-        country_oil_production_EJ = country_oil_production_EJ.drop(columns=['Country'])
-        country_share = major_oil_producers.loc[major_oil_producers['Name'] == name, 'Value']
-        label = name+' '+str(country_share.item())+'%'
-        if name == 'Other':
-            label_other = label
-        country_oil_production_EJ = country_oil_production_EJ.rename(columns={'Value': label})
-        major_oil_production_EJ = pd.concat([major_oil_production_EJ, country_oil_production_EJ], axis=1)
-    major_oil_production_EJ = major_oil_production_EJ.fillna(0)
+    # 2. Oil, converted from Mt to EJ.
+    major_oil_production_EJ = major_producer_production(ei_cube, major_oil_producers, 'oilprod_mt', 1e6,
+                                                        user_globals.Constant.TOE_TO_GJ.value,
+                                                        user_globals.Constant.GJ_TO_EJ.value)
 
-    # Calculate production by all other countries by summing that from major producers and subtracting from World total.
-    major_oil_production_EJ['Major Sum'] = major_oil_production_EJ.sum(1)
-    world_oil_production_mt = ei_data.loc[(ei_data['Var'] == 'oilprod_mt') &
-                                          (ei_data['Country'] == 'Total World'), 'Value']
-    world_oil_production_temp = world_oil_production_mt
-    world_oil_production_temp = (world_oil_production_temp *
-                                 1e6 *
-                                 user_globals.Constant.TOE_TO_GJ.value *
-                                 user_globals.Constant.GJ_TO_EJ.value)
-    major_oil_production_EJ['World'] = world_oil_production_temp
-    major_oil_production_EJ[label_other] = major_oil_production_EJ['World'] - major_oil_production_EJ['Major Sum']
-
-    # Drop columns 'Major Sum' and 'World' because they won't be plotted.
-    major_oil_production_EJ = major_oil_production_EJ.drop(columns=['Major Sum', 'World'])
-
-    # Extract gas production values
-    gas_production_EJ = ei_data.loc[ei_data['Var'] == 'gasprod_ej', ('Country', 'Value')]
-    major_gas_production_EJ = pd.DataFrame()
-    for name in major_gas_producing_country_names:
-        country_gas_production_EJ = gas_production_EJ.loc[gas_production_EJ['Country'] == name]
-        country_gas_production_EJ = country_gas_production_EJ.drop(columns=['Country'])
-        country_share = major_gas_producers.loc[major_gas_producers['Name'] == name, 'Value']
-        label = name+' '+str(country_share.item())+'%'
-        if name == 'Other':
-            label_other = label
-        country_gas_production_EJ = country_gas_production_EJ.rename(columns={'Value': label})
-        major_gas_production_EJ = pd.concat([major_gas_production_EJ, country_gas_production_EJ], axis=1)
-    major_gas_production_EJ = major_gas_production_EJ.fillna(0)
-
-    # Calculate production by all other countries by summing that from major producers and subtracting from World total.
-    major_gas_production_EJ['Major Sum'] = major_gas_production_EJ.sum(1)
-    world_gas_production_EJ = ei_data.loc[(ei_data['Var'] == 'gasprod_ej') &
-                                          (ei_data['Country'] == 'Total World'), 'Value']
-    major_gas_production_EJ['World'] = world_gas_production_EJ
-    major_gas_production_EJ[label_other] = major_gas_production_EJ['World'] - major_gas_production_EJ['Major Sum']
-
-    # Drop columns 'Major Sum' and 'World' because they won't be plotted.
-    major_gas_production_EJ = major_gas_production_EJ.drop(columns=['Major Sum', 'World'])
+    # 3. Gas
+    major_gas_production_EJ = major_producer_production(ei_cube, major_gas_producers, 'gasprod_ej')
 
     return user_globals.Major_Fossil_Fuel_Production_Consumption(
         major_coal_producers,
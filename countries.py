@@ -50,14 +50,10 @@ def translate_country_name(ei_name):
 # Shortens country name for chart.treemap() functions.
 #
 ########################################################################################################################
-def ffprod_shorten_country(df1, df2, df3):
-    df1.replace('Russian Federation', 'Russia', inplace=True)
-    df2.replace('Russian Federation', 'Russia', inplace=True)
-    df3.replace('Russian Federation', 'Russia', inplace=True)
-    df1.replace('United Arab Emirates', 'UAE', inplace=True)
-    df2.replace('United Arab Emirates', 'UAE', inplace=True)
-    df3.replace('United Arab Emirates', 'UAE', inplace=True)
-    return df1, df2, df3
+def ffprod_shorten_country(names):
+    names = names.replace('Russian Federation', 'Russia')
+    names = names.replace('United Arab Emirates', 'UAE')
+    return names
 
 ########################################################################################################################
 #
@@ -68,8 +64,8 @@ def ffprod_shorten_country(df1, df2, df3):
 #
 ########################################################################################################################
 def restore_original_country_name(names):
-    names.replace('Russia', 'Russian Federation', inplace=True)
-    names.replace('UAE', 'United Arab Emirates', inplace=True)
+    names = names.replace('Russia', 'Russian Federation')
+    names = names.replace('UAE', 'United Arab Emirates')
     return names
 
 ########################################################################################################################
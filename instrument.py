@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+
+#Created on Sun Oct 18 17:05:48 2026
+"""
+
+########################################################################################################################
+#
+# Module: instrument.py
+#
+# Description:
+# Measures the wall time, CPU time and, optionally, peak traced memory of each stage of a run and each chart saved,
+# so that changes in performance between code changes or data releases can be found. Measurements are only made once
+# enabled by configure(), and are saved as a JSON run report, with a summary printed at the end of the run.
+#
+########################################################################################################################
+
+# Import Python modules.
+import contextlib
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+# Whether measurements are recorded, and whether memory allocations are traced, by this process. Set by configure().
+enabled = False
+trace_memory = False
+
+# Measurements recorded by this process and not yet collected, as dictionaries (see measure()).
+records = []
+
+# Measurements in progress, outermost first, each as a list of its record, the traced memory at its start, and the
+# highest traced memory so far.
+open_measurements = []
+
+# Number of stages and charts listed in the summary printed by print_summary().
+SUMMARY_ROWS = 15
+
+
+########################################################################################################################
+#
+# Function: configure()
+#
+# Description:
+# Enables or disables measurement in this process. Tracing memory allocations with tracemalloc slows Python code
+# considerably, so times measured while tracing memory are only comparable with others measured the same way.
+#
+########################################################################################################################
+def configure(enable, trace):
+    global enabled, trace_memory
+    enabled = enable
+    trace_memory = enable is True and trace is True
+    if trace_memory is True and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif trace_memory is not True and tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+########################################################################################################################
+#
+# Function: settings()
+#
+# Description:
+# Returns the arguments of configure() giving this process's settings, so that they can be applied in worker processes.
+#
+########################################################################################################################
+def settings():
+    return enabled, trace_memory
+
+
+########################################################################################################################
+#
+# Function: measure()
+#
+# Description:
+# Context manager measuring the code run within it, which yields a dictionary recording the measurement. The caller may
+# add other measures to it, such as a chart's artist count. On exit, the dictionary gains the wall time and CPU time
+# in seconds, and, if memory is traced, the peak traced memory in bytes above that at the start. The record names the
+# measurement in progress around it, if any, as its parent. Nothing is measured unless enabled.
+#
+########################################################################################################################
+@contextlib.contextmanager
+def measure(kind, name):
+    if enabled is not True:
+        yield {}
+        return
+
+    record = {'kind': kind, 'name': name, 'pid': os.getpid()}
+    if open_measurements:
+        record['parent'] = open_measurements[-1][0]['name']
+    memory = 0
+    if trace_memory is True:
+        # tracemalloc records a single peak, so the peak reached so far is passed to the enclosing measurement before
+        # it's reset for this one.
+        memory, peak = tracemalloc.get_traced_memory()
+        if open_measurements:
+            open_measurements[-1][2] = max(open_measurements[-1][2], peak)
+        tracemalloc.reset_peak()
+    open_measurements.append([record, memory, memory])
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield record
+    finally:
+        record['wall_s'] = time.perf_counter() - wall_start
+        record['cpu_s'] = time.process_time() - cpu_start
+        record, memory, highest = open_measurements.pop()
+        if trace_memory is True:
+            highest = max(highest, tracemalloc.get_traced_memory()[1])
+            record['peak_bytes'] = highest - memory
+            if open_measurements:
+                open_measurements[-1][2] = max(open_measurements[-1][2], highest)
+            tracemalloc.reset_peak()
+        records.append(record)
+
+
+########################################################################################################################
+#
+# Function: note()
+#
+# Description:
+# Records an event without measuring it, such as a task whose memoized output was reused, if measurement is enabled.
+#
+########################################################################################################################
+def note(kind, name, **fields):
+    if enabled is True:
+        record = {'kind': kind, 'name': name, 'pid': os.getpid()}
+        if open_measurements:
+            record['parent'] = open_measurements[-1][0]['name']
+        record.update(fields)
+        records.append(record)
+
+
+########################################################################################################################
+#
+# Function: collect()
+#
+# Description:
+# Returns the records of this process not yet collected, from the position given, and removes them. Worker processes
+# return those of each task with its output, starting from the number held before the task, since forked processes
+# also hold the records of the main process made before they started.
+#
+########################################################################################################################
+def collect(start=0):
+    collected = records[start:]
+    del records[start:]
+    return collected
+
+
+########################################################################################################################
+#
+# Function: save_report()
+#
+# Description:
+# Saves the records of a run as a JSON file, with the options of the run and the versions of Python and the platform,
+# so that reports of separate runs can be compared.
+#
+########################################################################################################################
+def save_report(path, run_records, options):
+    report = {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'options': options,
+        'trace_memory': trace_memory,
+        'records': run_records,
+    }
+    directory = os.path.dirname(path)
+    if directory != '':
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(report, f, indent=1)
+
+
+########################################################################################################################
+#
+# Function: shorten()
+#
+# Description:
+# Returns text no longer than width, replacing the start of longer text with '...', so that the ends of names such as
+# chart paths remain visible in the summary.
+#
+########################################################################################################################
+def shorten(text, width):
+    return text if len(text) <= width else '...' + text[len(text) - width + 3:]
+
+
+########################################################################################################################
+#
+# Function: megabytes()
+#
+# Description:
+# Returns a number of bytes in the record as a string of megabytes for the summary, or '-' if it wasn't measured.
+#
+########################################################################################################################
+def megabytes(record, field):
+    return '{:.1f}'.format(record[field] / 1e6) if field in record else '-'
+
+
+########################################################################################################################
+#
+# Function: print_summary()
+#
+# Description:
+# Prints the stages and charts of a run that took longest, with their total and CPU times, peak traced memory, and for
+# stages, the number and size of charts saved. Time saving each chart is included in the time of plotting it.
+#
+########################################################################################################################
+def print_summary(run_records):
+    stages = [record for record in run_records if record['kind'] in ('run', 'stage', 'task') and 'wall_s' in record]
+    charts = [record for record in run_records if record['kind'] == 'chart' and 'wall_s' in record]
+    saves = {record['parent']: record for record in run_records if record['kind'] == 'save'}
+    reused = [record['name'] for record in run_records if record['kind'] == 'task' and 'wall_s' not in record]
+    unchanged = [record['name'] for record in run_records if record['kind'] == 'chart' and 'wall_s' not in record]
+
+    print('\nRun summary. Times in seconds, memory and output in MB.')
+    row = '{:<48}{:>9}{:>9}{:>9}{:>8}{:>9}'
+    print(row.format('Stage', 'Wall', 'CPU', 'Peak', 'Charts', 'Output'))
+    for record in sorted(stages, key=lambda record: record['wall_s'], reverse=True)[:SUMMARY_ROWS]:
+        stage_charts = [chart for chart in charts if chart.get('parent') == record['name']]
+        output_bytes = {'bytes': sum(chart.get('bytes', 0) for chart in stage_charts)}
+        print(row.format(shorten(record['kind'] + ' ' + record['name'], 48), '{:.2f}'.format(record['wall_s']),
+                         '{:.2f}'.format(record['cpu_s']), megabytes(record, 'peak_bytes'), len(stage_charts),
+                         megabytes(output_bytes, 'bytes') if stage_charts else '-'))
+
+    if charts:
+        print('\n' + row.format('Chart', 'Wall', 'Save', 'CPU', 'Artists', 'Output'))
+        for record in sorted(charts, key=lambda record: record['wall_s'], reverse=True)[:SUMMARY_ROWS]:
+            save = saves.get(record['name'], {})
+            print(row.format(shorten(record['name'], 48), '{:.2f}'.format(record['wall_s']),
+                             '{:.2f}'.format(save['wall_s']) if 'wall_s' in save else '-',
+                             '{:.2f}'.format(record['cpu_s']), record.get('artists', '-'),
+                             megabytes(record, 'bytes')))
+    print('\nCharts plotted: ' + str(len(charts)) + ', unchanged: ' + str(len(unchanged)) + '. Tasks run: ' +
+          str(len([record for record in stages if record['kind'] == 'task'])) + ', reused: ' + str(len(reused)) + '.')
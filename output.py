@@ -19,14 +19,159 @@ from warnings import warn
 ########################################################################################################################
 
 # Import Python modules.
-import matplotlib.pyplot as plt
 import pandas as pd
 import decimal
+import importlib.util
+import json
 import os
+import shutil
+import sys
 
 # Import user modules.
 import user_globals
-import chart
+import countries
+import cache
+import instrument
+
+
+########################################################################################################################
+#
+# Function: lazy_import()
+#
+# Description:
+# Returns a module that's only loaded when one of its attributes is first used.
+#
+########################################################################################################################
+def lazy_import(name):
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# chart.py imports Matplotlib and mpl_extra, and applies chart style settings, so it's only loaded when the first chart
+# is plotted. Runs that only collate or save data don't import plotting libraries.
+chart = lazy_import('chart')
+
+# Directory in which folders of charts and data are saved. Set by set_output_root(). Relative paths are relative to the
+# working directory, which by default contains the folders.
+output_root = ''
+
+# Name of the file in each folder of charts recording the fingerprint of each chart saved there (see save_chart()).
+MANIFEST_FILENAME = '.manifest.json'
+
+
+########################################################################################################################
+#
+# Function: set_output_root()
+#
+# Description:
+# Sets the directory in which folders of charts and data are saved.
+#
+########################################################################################################################
+def set_output_root(path):
+    global output_root
+    output_root = path
+
+
+########################################################################################################################
+#
+# Function: load_manifest()
+#
+# Description:
+# Returns the fingerprints of charts saved in a folder, by filename. Empty if there's no manifest, or it's unreadable.
+#
+########################################################################################################################
+def load_manifest(fig_dir):
+    try:
+        with open(os.path.join(fig_dir, MANIFEST_FILENAME)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+########################################################################################################################
+#
+# Function: save_manifest()
+#
+# Description:
+# Saves the fingerprints of charts saved in a folder, writing to a temporary file first so that an interrupted run
+# never leaves a truncated manifest behind.
+#
+########################################################################################################################
+def save_manifest(fig_dir, manifest):
+    path = os.path.join(fig_dir, MANIFEST_FILENAME)
+    with open(path + '.tmp', 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(path + '.tmp', path)
+
+
+########################################################################################################################
+#
+# Function: save_chart()
+#
+# Description:
+# Plots a chart by calling chart_function, a function of chart.py returning the chart's figure, with the arguments
+# given, and saves it as an SVG file, cropped to its contents if tight is True. The chart's fingerprint combines the
+# data and parameters plotted, the name of chart_function and chart.style_fingerprint(), which covers the code of
+# chart.py, and is recorded in the manifest of the chart's folder.
+# Plotting is skipped if the file exists and its fingerprint is unchanged, so a run only re-renders charts whose
+# content would change. Delete a chart, or its folder's manifest, to force it to be re-rendered. Charts are always
+# plotted if Constant.DISPLAY_CHARTS is True.
+# Plotting and saving are measured by instrument.measure(), with the number of artists in the figure and the size of
+# the file saved, when measurement is enabled.
+#
+########################################################################################################################
+def save_chart(fig_path, chart_function, *args, tight=True, **kwargs):
+    fig_dir, filename = os.path.split(fig_path)
+    fingerprint = cache.data_hash((chart_function.__name__, chart.style_fingerprint(), args,
+                                   sorted(kwargs.items()), tight))
+    manifest = load_manifest(fig_dir)
+    if (user_globals.Constant.DISPLAY_CHARTS.value is not True and manifest.get(filename) == fingerprint and
+            os.path.exists(fig_path)):
+        instrument.note('chart', fig_path, unchanged=True)
+        return
+
+    with instrument.measure('chart', fig_path) as record:
+        fig = chart_function(*args, **kwargs)
+        with instrument.measure('save', fig_path):
+            if tight is True:
+                fig.savefig(fig_path, format='svg', bbox_inches='tight', pad_inches=0.2)
+            else:
+                fig.savefig(fig_path, format='svg')
+        if instrument.enabled is True:
+            record['function'] = chart_function.__name__
+            record['artists'] = len(fig.findobj())
+            record['bytes'] = os.path.getsize(fig_path)
+    chart.show_figure(fig)
+    manifest[filename] = fingerprint
+    save_manifest(fig_dir, manifest)
+
+
+########################################################################################################################
+#
+# Function: link_chart()
+#
+# Description:
+# Makes a chart saved in one folder also appear in another, as a hard link to the same file, or a copy where hard links
+# aren't supported (e.g. across file systems). Nothing is done if fig_path is already a link to the chart. The link is
+# made under a temporary name first, so that it replaces any existing file in one step.
+#
+########################################################################################################################
+def link_chart(source_path, fig_path):
+    if os.path.exists(fig_path) and os.path.samefile(source_path, fig_path):
+        return
+    if os.path.exists(fig_path + '.tmp'):
+        os.remove(fig_path + '.tmp')
+    try:
+        os.link(source_path, fig_path + '.tmp')
+    except OSError:
+        shutil.copyfile(source_path, fig_path + '.tmp')
+    os.replace(fig_path + '.tmp', fig_path)
 
 
 ########################################################################################################################
@@ -38,7 +183,7 @@ import chart
 #
 ########################################################################################################################
 def world_co2_charts(global_carbon):
-    fig_dir = 'charts CO2/'
+    fig_dir = os.path.join(output_root, 'charts CO2/')
     os.makedirs(fig_dir, exist_ok=True)  # Save co2 charts in this directory.
 
     # CHART 1: Annual atmospheric CO2 concentration and growth.
@@ -68,7 +213,9 @@ determined from NOAA Global Monitoring Laboratory measurements. Version 2026-07
 https://doi.org/10.15138/9N0H-ZH07.\n\
 By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energy-data.\n\
 Data: https://gml.noaa.gov/ccgg/trends/gl_data.html.'
-    chart.line_column(
+    save_chart(
+        os.path.join(fig_dir, '1 co2 conc.svg'),
+        chart.line_column,
         co2_ppm,
         co2_change,
         color1,
@@ -86,15 +233,6 @@ Data: https://gml.noaa.gov/ccgg/trends/gl_data.html.'
         concentration_text,
         footer_text,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '1 co2 conc.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     # CHART 2: Annual CO2 emissions shares of sources for most recent year (not only fossil fuel CO2 emissions).
     print(
@@ -121,7 +259,9 @@ Projected values of Flaring and Other for '
                    ' data is shown. Cement includes cement carbonation.\n\
 By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energy-data.\n\
 Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu/impact/science/global-carbon-budget/2025.')
-    chart.treemap_2_subplots(
+    save_chart(
+        os.path.join(fig_dir, '2 co2 emission sources.svg'),
+        chart.treemap_2_subplots,
         global_carbon.emission_category_shares_fy,
         global_carbon.emission_source_shares_fy,
         title1,
@@ -130,15 +270,6 @@ Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu
         title,
         footer_text,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '2 co2 emission sources.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     # CHART 3: Annual fossil fuels and cement CO2 emissions.
     ffc_co2 = global_carbon.c_budget['Net FF and Cement']
@@ -174,7 +305,9 @@ Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu
         + ' MtCO2\n'
     )
 
-    chart.column_2_subplots(
+    save_chart(
+        os.path.join(fig_dir, '3 co2 annual emissions.svg'),
+        chart.column_2_subplots,
         ffc_co2,
         ffc_co2,
         co2_color,
@@ -192,15 +325,6 @@ Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu
         footer_text,
         False,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '3 co2 annual emissions.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     # CHART 4: Annual change of fossil fuels and cement CO2 emissions.
     series = global_carbon.c_budget['Net FF and Cement Change']
@@ -212,7 +336,9 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu/impact/science/global-carbon-budget/2025.')
     color = user_globals.Color.CO2_EMISSION.value
 
-    chart.column_grouped(
+    save_chart(
+        os.path.join(fig_dir, '4 co2 emissions change.svg'),
+        chart.column_grouped,
         country,
         title,
         ylabel,
@@ -220,15 +346,6 @@ Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu
         color,
         series1=series,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '4 co2 emissions change.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     # CHART 5: Annual coal, oil and gas CO2 emissions.
     coalco2 = global_carbon.c_budget['Coal']
@@ -250,7 +367,9 @@ Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu
     equiv_yscale = True
     start_yr = global_carbon.c_budget.index.min()
 
-    chart.column_3_subplots(
+    save_chart(
+        os.path.join(fig_dir, '5 co2 sep emissions.svg'),
+        chart.column_3_subplots,
         coalco2,
         oilco2,
         gasco2,
@@ -269,15 +388,6 @@ Data: Global Carbon Project, Friedlingstein et al (2025), https://www.icos-cp.eu
         equiv_yscale,
         8
     )
-    plt.savefig(
-        os.path.join(fig_dir, '5 co2 sep emissions.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     # CHART 6: Global CO2 emission pathways using remaining carbon budgets.
 
@@ -299,7 +409,9 @@ scenarios, and other sources of uncertainties.\n\
 Net-zero CO\u2082 by 2040 now exceeds the budget for 1.5\N{DEGREE SIGN}C, but net-zero CO\u2082 by 2050 is still\n\
 within the budget to limit warming to 1.7\N{DEGREE SIGN}C.'
 
-    chart.line_plot(
+    save_chart(
+        os.path.join(fig_dir, '6 co2 pathways using budget.svg'),
+        chart.line_plot,
         title,
         xlabel,
         ylabel,
@@ -313,16 +425,6 @@ within the budget to limit warming to 1.7\N{DEGREE SIGN}C.'
         series4=global_carbon.remaining_c_budget_data['2.0C / 1110 GtCO2']
     )
 
-    plt.savefig(
-        os.path.join(fig_dir, '6 co2 pathways using budget.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
-
 
 ########################################################################################################################
 #
@@ -333,7 +435,7 @@ within the budget to limit warming to 1.7\N{DEGREE SIGN}C.'
 #
 ########################################################################################################################
 def country_co2_charts(energy_system, global_carbon):
-    fig_dir = 'charts ' + energy_system.country + '/'
+    fig_dir = os.path.join(output_root, 'charts ' + energy_system.country + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save co2 charts in this directory.
 
     # CHART 1: Annual fossil fuel CO2 emissions alongside treemap of country shares.
@@ -408,7 +510,9 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: The Energy Institute Statistical Review of World Energy 2024, \
 https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
 
-    chart.column_treemap(
+    save_chart(
+        os.path.join(fig_dir, '1 ' + energy_system.country + ' ff co2.svg'),
+        chart.column_treemap,
         energy_system.ffco2_Mt['Value'],
         global_carbon.country_shares_fy,
         user_globals.Color.CO2_EMISSION.value,
@@ -423,20 +527,11 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
         additional_text1,
         footer_text,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '1 ' + energy_system.country + ' ff co2.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
     print(
         'National CO2 emission shares treemap, most recent year sum of shares = '
         + str(sum(global_carbon.country_shares_fy['Value']))
         + '%'
     )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     # CHART 2: Annual change of fossil fuel CO2 emissions.
 
@@ -447,7 +542,9 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: The Energy Institute Statistical Review of World Energy 2024, \
 https://www.energyinst.org/statistical-review/resources-and-data-downloads.'
 
-    chart.column_grouped(
+    save_chart(
+        os.path.join(fig_dir, '2 ' + energy_system.country + ' ff co2 change.svg'),
+        chart.column_grouped,
         energy_system.country,
         title,
         ylabel,
@@ -456,16 +553,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.'
         series1=energy_system.ffco2_Mt['Change'],
     )
 
-    plt.savefig(
-        os.path.join(fig_dir, '2 ' + energy_system.country + ' ff co2 change.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
-
 
 ########################################################################################################################
 #
@@ -476,7 +563,7 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.'
 #
 ########################################################################################################################
 def per_capita_emissions(energy_system):
-    fig_dir = 'charts ' + energy_system.country + '/'
+    fig_dir = os.path.join(output_root, 'charts ' + energy_system.country + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save CO2 charts in this directory.
 
     # CHART 3: Per capita fossil fuel CO2 emissions.
@@ -562,24 +649,20 @@ def per_capita_emissions(energy_system):
                        + "By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energy-data."
                        )
     ylabel = 'Tonne'
-    chart.column_subplot(energy_system.pc_tco2,
-                         energy_system.country_pc_tco2,
-                         energy_system.pc_associated_data['World PC tCO2'],
-                         'World',
-                         country,
-                         title,
-                         year,
-                         ylabel,
-                         footer_text,
-                         user_globals.Color.CO2_EMISSION.value,
-                         user_globals.Color.PER_CAPITA_HIGHLIGHT.value)
-    plt.savefig(
-        os.path.join(fig_dir, '3 ' + energy_system.country + ' per capita co2 emissions.svg'),
-        format='svg',
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
+    save_chart(os.path.join(fig_dir, '3 ' + energy_system.country + ' per capita co2 emissions.svg'),
+               chart.column_subplot,
+               energy_system.pc_tco2,
+               energy_system.country_pc_tco2,
+               energy_system.pc_associated_data['World PC tCO2'],
+               'World',
+               country,
+               title,
+               year,
+               ylabel,
+               footer_text,
+               user_globals.Color.CO2_EMISSION.value,
+               user_globals.Color.PER_CAPITA_HIGHLIGHT.value,
+               tight=False)
 
 
 ########################################################################################################################
@@ -591,7 +674,7 @@ def per_capita_emissions(energy_system):
 #
 ########################################################################################################################
 def co2_by_sector_chart(energy_system):
-    fig_dir = 'charts ' + energy_system.country + '/'
+    fig_dir = os.path.join(output_root, 'charts ' + energy_system.country + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save co2 charts in this directory.
 
     # CHART 4: National fossil fuel CO2 emissions by sector.
@@ -648,7 +731,9 @@ Data: IEA World Energy Balances, https://www.iea.org/data-and-statistics/data-to
 Glossary: https://iea.blob.core.windows.net/assets/9d6a5b6e-a231-4645-8764-b0a1bf6dabe6/\
 GreenhouseGasEmissionsfromEnergy_Documentation_2026.pdf')
 
-    chart.column_8_subplots(
+    save_chart(
+        os.path.join(fig_dir, '4 ' + country + ' sector co2.svg'),
+        chart.column_8_subplots,
         sec1,
         sec2,
         sec3,
@@ -681,15 +766,6 @@ GreenhouseGasEmissionsfromEnergy_Documentation_2026.pdf')
         footer_text,
         True,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '4 ' + country + ' sector co2.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
 
 ########################################################################################################################
@@ -697,12 +773,13 @@ GreenhouseGasEmissionsfromEnergy_Documentation_2026.pdf')
 # Function: world_ffprod_shares()
 #
 # Description:
-# Controls plotting of global fossil fuel production shares by country. Country is included as an input argument so
-# that chart is saved in the folder of the country being profiled.
+# Controls plotting of global fossil fuel production shares by country. The chart doesn't depend on the country being
+# profiled, so it's saved once in the folder of world fossil fuel producer charts, and linked into each country's
+# folder by link_world_ffprod_charts(). Returns the path of the chart.
 #
 ########################################################################################################################
-def world_ffprod_shares(coal_prods, oil_prods, gas_prods, country):
-    fig_dir = 'charts ' + country + '/'
+def world_ffprod_shares(coal_prods, oil_prods, gas_prods):
+    fig_dir = os.path.join(output_root, 'charts Fossil Fuel Producers/')
     os.makedirs(fig_dir, exist_ok=True)  # Save chart in this directory.
 
     # CHART 6: Tree-maps of national shares of fossil fuel production.
@@ -729,9 +806,10 @@ def world_ffprod_shares(coal_prods, oil_prods, gas_prods, country):
 
     # Generate list of countries with production shares greater than list above. Use Python data class Set that doesn't
     # allow duplicates; no need to use for loops.
-    country_list = set(coal_prods.Name)
-    country_list.update(oil_prods.Name)
-    country_list.update(gas_prods.Name)
+    # Names shortened for treemap labels are listed in full.
+    country_list = set(countries.restore_original_country_name(coal_prods.Name))
+    country_list.update(countries.restore_original_country_name(oil_prods.Name))
+    country_list.update(countries.restore_original_country_name(gas_prods.Name))
     # Remove 'Other', sort list into alphabetical order and add commas between set elements.
     country_list.remove('Other')
     country_list = sorted(country_list)
@@ -769,7 +847,10 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: The Energy Institute Statistical Review of World Energy 2024, \
 https://www.energyinst.org/statistical-review/resources-and-data-downloads."
 
-    chart.treemap_3_subplots(
+    fig_path = os.path.join(fig_dir, '6 prod ff shares.svg')
+    save_chart(
+        fig_path,
+        chart.treemap_3_subplots,
         coal_prods,  # Dataframe 1
         oil_prods,  # Dataframe 2
         gas_prods,  # Dataframe 3
@@ -782,15 +863,7 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads."
         footer_upper_text,
         footer_lower_text,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '6 ' + country + ' prod ff shares.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
+    return fig_path
 
 
 ########################################################################################################################
@@ -798,11 +871,12 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads."
 # Function: world_ffprod_stacked()
 #
 # Description:
-# Plots stacked area charts of major coal, oil and gas producing countries.
+# Plots stacked area charts of major coal, oil and gas producing countries. As with world_ffprod_shares(), the chart is
+# saved once, and its path returned.
 #
 ########################################################################################################################
-def world_ffprod_stacked(country_folder_name, major_ffprod_data):
-    fig_dir = 'charts ' + country_folder_name + '/'
+def world_ffprod_stacked(major_ffprod_data):
+    fig_dir = os.path.join(output_root, 'charts Fossil Fuel Producers/')
     os.makedirs(fig_dir, exist_ok=True)  # Save chart in this directory.
 
     # CHART 7: Stacked area chart of national fossil fuel production trends.
@@ -841,9 +915,10 @@ def world_ffprod_stacked(country_folder_name, major_ffprod_data):
 
     # Generate list of countries with production shares greater than list above. Use Python data class Set that doesn't
     # allow duplicates; no need to use for loops.
-    country_list = set(major_ffprod_data.major_coal_producers.Name)
-    country_list.update(major_ffprod_data.major_oil_producers.Name)
-    country_list.update(major_ffprod_data.major_gas_producers.Name)
+    # Names shortened for treemap labels are listed in full.
+    country_list = set(countries.restore_original_country_name(major_ffprod_data.major_coal_producers.Name))
+    country_list.update(countries.restore_original_country_name(major_ffprod_data.major_oil_producers.Name))
+    country_list.update(countries.restore_original_country_name(major_ffprod_data.major_gas_producers.Name))
     # Remove 'Other', sort list into alphabetical order and add commas between set elements.
     country_list.remove('Other')
     country_list = sorted(country_list)
@@ -887,7 +962,10 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: The Energy Institute Statistical Review of World Energy 2024, \
 https://www.energyinst.org/statistical-review/resources-and-data-downloads."
 
-    chart.stacked_area_3_subplots(
+    fig_path = os.path.join(fig_dir, '7 prod ff stacked.svg')
+    save_chart(
+        fig_path,
+        chart.stacked_area_3_subplots,
         major_ffprod_data.major_coal_production_EJ,
         major_ffprod_data.major_coal_producers_color_list,
         major_ffprod_data.major_oil_production_EJ,
@@ -906,16 +984,23 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads."
         True,
         10,
     )
+    return fig_path
 
-    plt.savefig(
-        os.path.join(fig_dir, '7 ' + country_folder_name + ' prod ff stacked.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
+
+########################################################################################################################
+#
+# Function: link_world_ffprod_charts()
+#
+# Description:
+# Includes the world fossil fuel producer charts saved by world_ffprod_shares() and world_ffprod_stacked() in the folder
+# of the country being profiled, named as if plotted there.
+#
+########################################################################################################################
+def link_world_ffprod_charts(shares_path, stacked_path, country):
+    fig_dir = os.path.join(output_root, 'charts ' + country + '/')
+    os.makedirs(fig_dir, exist_ok=True)  # Save charts in this directory.
+    link_chart(shares_path, os.path.join(fig_dir, '6 ' + country + ' prod ff shares.svg'))
+    link_chart(stacked_path, os.path.join(fig_dir, '7 ' + country + ' prod ff stacked.svg'))
 
 
 ########################################################################################################################
@@ -931,7 +1016,7 @@ def country_ffprod_primaryenergy_charts(energy_system):
         return None
     country = energy_system.country
 
-    fig_dir = 'charts ' + country + '/'
+    fig_dir = os.path.join(output_root, 'charts ' + country + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save charts in this directory.
 
     # CHART 5: National fossil fuel production trends.
@@ -997,7 +1082,9 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.")
     x_axis_interval = 10
     equiv_scale = True
 
-    chart.column_3_subplots(
+    save_chart(
+        os.path.join(fig_dir, '5 ' + country + ' prod ff sep.svg'),
+        chart.column_3_subplots,
         ffprod_coal,
         ffprod_oil,
         ffprod_gas,
@@ -1016,15 +1103,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.")
         equiv_scale,
         10
     )
-    plt.savefig(
-        os.path.join(fig_dir, '5 ' + country + ' prod ff sep.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     ####################################################################################################################
     # PRIMARY ENERGY: Annual quantity of fossil fuels.
@@ -1086,7 +1164,9 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.'
     x_axis_interval = 10
     equiv_yscale = True
 
-    chart.column_3_subplots(
+    save_chart(
+        os.path.join(fig_dir, '8 ' + country + ' pe ff qty.svg'),
+        chart.column_3_subplots,
         peq1,
         peq2,
         peq3,
@@ -1105,15 +1185,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.'
         equiv_yscale,
         10
     )
-    plt.savefig(
-        os.path.join(fig_dir, '8 ' + country + ' pe ff qty.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     ####################################################################################################################
     # PRIMARY ENERGY: Annual change of fossil fuels.
@@ -1160,7 +1231,9 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.'
     color2 = user_globals.Color.OIL.value
     color3 = user_globals.Color.GAS.value
 
-    chart.column_grouped_2_subplots(
+    save_chart(
+        os.path.join(fig_dir, '9 ' + country + ' pe sep ff change.svg'),
+        chart.column_grouped_2_subplots,
         country,
         title,
         ylabel_top,
@@ -1175,15 +1248,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.'
         series2=pe2,
         series3=pe3,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '9 ' + country + ' pe sep ff change.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
 
 ########################################################################################################################
@@ -1198,7 +1262,7 @@ def country_finalenergy_elec_charts(energy_system):
     country = energy_system.country
     if energy_system.finalenergy_PJ is None:
         return None
-    fig_dir = 'charts ' + country + '/'
+    fig_dir = os.path.join(output_root, 'charts ' + country + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save co2 charts in this directory.
     ####################################################################################################################
     # FINAL ENERGY AND ELECTRICITY COMBINED: Shares for most recent year.
@@ -1232,7 +1296,9 @@ Energy Consumption data: IEA World Energy Balances, \
 https://www.iea.org/data-and-statistics/data-tools/energy-statistics-data-browser?country\
 WORLD&fuel=Energy%20consumption&indicator=TFCbySource."
 
-        chart.treemap_1_subplot(
+        save_chart(
+            os.path.join(fig_dir, '11 ' + country + ' fe elec shares.svg'),
+            chart.treemap_1_subplot,
             energy_system.consumption_final_shares,
             title1,
             country,
@@ -1275,7 +1341,9 @@ https://www.iea.org/data-and-statistics/data-tools/energy-statistics-data-browse
 Electricity Generation data: The Energy Institute 2026 Statistical Review of World Energy, \
 https://www.energyinst.org/statistical-review/resources-and-data-downloads.")
 
-        chart.treemap_2_subplots(
+        save_chart(
+            os.path.join(fig_dir, '11 ' + country + ' fe elec shares.svg'),
+            chart.treemap_2_subplots,
             energy_system.finalenergy_fy_shares,
             energy_system.elecgen_fuel_fy_shares,
             title1,
@@ -1284,15 +1352,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.")
             title,
             footer_text,
         )
-    plt.savefig(
-        os.path.join(fig_dir, '11 ' + country + ' fe elec shares.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
 
 ########################################################################################################################
@@ -1307,7 +1366,7 @@ def country_finalenergy_charts(energy_system):
     country = energy_system.country
     if energy_system.finalenergy_PJ is None:
         return None
-    fig_dir = 'charts ' + country + '/'
+    fig_dir = os.path.join(output_root, 'charts ' + country + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save co2 charts in this directory.
 
     # CHART 10: National final energy quantity by fuel.
@@ -1392,7 +1451,9 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: IEA World Energy Balances, https://www.iea.org/data-and-statistics/data-tools/energy-statistics-data-browser?\
 country=WORLD&fuel=Energy%20consumption&indicator=TFCbySource.')
 
-    chart.column_6_subplots(
+    save_chart(
+        os.path.join(fig_dir, '10 ' + country + ' fe qty.svg'),
+        chart.column_6_subplots,
         feq1,
         feq2,
         feq3,
@@ -1419,15 +1480,6 @@ country=WORLD&fuel=Energy%20consumption&indicator=TFCbySource.')
         footer_text,
         True,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '10 ' + country + ' fe qty.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
 
 ########################################################################################################################
@@ -1443,7 +1495,7 @@ country=WORLD&fuel=Energy%20consumption&indicator=TFCbySource.')
 def country_elecgen_charts(energy_system):
     global unpublished_data
     country = energy_system.country
-    fig_dir = 'charts ' + country + '/'
+    fig_dir = os.path.join(output_root, 'charts ' + country + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save co2 charts in this directory.
 
     # CHART 12: Country electricity generation quantity by fuel.
@@ -1515,7 +1567,9 @@ doesn't equal Total electricity generation,\ndue to unpublished data for "
         else:
             unpublished_text = ''
 
-        chart.column_11_subplots(
+        save_chart(
+            os.path.join(fig_dir, '12 ' + country + ' elec fuel qty.svg'),
+            chart.column_11_subplots,
             energy_system.elecgen_TWh['Total Country'],
             energy_system.elecgen_TWh['Nuclear'],
             energy_system.elecgen_TWh['Fossil Fuels'],
@@ -1559,16 +1613,6 @@ doesn't equal Total electricity generation,\ndue to unpublished data for "
             True,
         )
 
-    if energy_system.elecgen_TWh is not None:
-        plt.savefig(
-            os.path.join(fig_dir, '12 ' + country + ' elec fuel qty.svg'),
-            format='svg',
-            bbox_inches='tight',
-            pad_inches=0.2, )
-        if user_globals.Constant.DISPLAY_CHARTS.value is True:
-            plt.show()
-        plt.close()
-
     ####################################################################################################################
     # ELECTRICITY: Annual change of generation by fuel.
     ####################################################################################################################
@@ -1585,7 +1629,9 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: The Energy Institute Statistical Review of World Energy 2024, \
 https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
 
-        chart.column_grouped_2_subplots(
+        save_chart(
+            os.path.join(fig_dir, '13 ' + country + ' elec fuel change.svg'),
+            chart.column_grouped_2_subplots,
             country,
             title,
             ylabel_top,
@@ -1608,15 +1654,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
             series6=energy_system.elecgen_TWh['Wind and Solar Change'],
             series8=energy_system.elecgen_TWh['Bio, Geo and Other Change'],
         )
-        plt.savefig(
-            os.path.join(fig_dir, '13 ' + country + ' elec fuel change.svg'),
-            format='svg',
-            bbox_inches='tight',
-            pad_inches=0.2,
-        )
-        if user_globals.Constant.DISPLAY_CHARTS.value is True:
-            plt.show()
-        plt.close()
 
     ####################################################################################################################
     # ELECTRICITY: Annual share of generation by fuel.
@@ -1675,7 +1712,9 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.")
             + '\n'
         )
 
-        chart.line_10_subplots(
+        save_chart(
+            os.path.join(fig_dir, '14 ' + country + ' elec fuel share trends.svg'),
+            chart.line_10_subplots,
             elec_share1,
             elec_share2,
             elec_share3,
@@ -1714,16 +1753,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.")
             True,
         )
 
-        plt.savefig(
-            os.path.join(fig_dir, '14 ' + country + ' elec fuel share trends.svg'),
-            format='svg',
-            bbox_inches='tight',
-            pad_inches=0.2,
-        )
-        if user_globals.Constant.DISPLAY_CHARTS.value is True:
-            plt.show()
-        plt.close()
-
 
 ########################################################################################################################
 #
@@ -1735,7 +1764,7 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.")
 #
 ########################################################################################################################
 def major_emitter_charts(energy_system, global_carbon, major_emitter_df):
-    fig_dir = 'charts Major Emitters' + '/'
+    fig_dir = os.path.join(output_root, 'charts Major Emitters' + '/')
     os.makedirs(fig_dir, exist_ok=True)  # Save charts in this directory.
 
     # Chart 0: World CO2 Emissions from fossil fuel combustion line plot and country share treemap.
@@ -1795,7 +1824,9 @@ By Shane White, whitesha@protonmail.com, https://github.com/shanewhi/world-energ
 Data: The Energy Institute Statistical Review of World Energy 2024,\n\
 https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
 
-    chart.line_treemap(
+    save_chart(
+        os.path.join(fig_dir, '0 ' + ' ff co2.svg'),
+        chart.line_treemap,
         energy_system.ffco2_Gt['Value'],
         global_carbon.country_shares_fy,
         user_globals.Color.CO2_EMISSION.value,
@@ -1810,16 +1841,6 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
         additional_text1,
         footer_text,
     )
-    plt.savefig(
-        os.path.join(fig_dir, '0 ' + ' ff co2.svg'),
-        format='svg',
-        bbox_inches='tight',
-        pad_inches=0.2,
-    )
-
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
 
     # CHARTS 1 and above: Major emitter national CO2 emission line plot and pairing coal, oil and gas primary energy
     # line plots.
@@ -1830,7 +1851,10 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
         country_name = country
         if country_name == 'US':
             country_name = 'United States'
-        chart.line_2_subplots(
+        print(country_name)
+        save_chart(
+            os.path.join(fig_dir, str(counter) + ' ' + country_name + '.svg'),
+            chart.line_2_subplots,
             major_emitter_df.loc[(country, 'ffco2_Mt')],
             major_emitter_df.loc[(country, 'primary_PJ_coal')],
             major_emitter_df.loc[(country, 'primary_PJ_oil')],
@@ -1844,17 +1868,13 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
             1965,
             10,
             10,
+            tight=False,
         )
-        print(country_name)
-        plt.savefig(
-            os.path.join(fig_dir, str(counter) + ' ' + country_name + '.svg'),
-            format='svg',
-        )
-        if user_globals.Constant.DISPLAY_CHARTS.value is True:
-            plt.show()
-        plt.close()
 
-    chart.legend_for_major_emitter_charts(
+    counter += 1
+    save_chart(
+        os.path.join(fig_dir, str(counter) + ' legend' + '.svg'),
+        chart.legend_for_major_emitter_charts,
         major_emitter_df.loc[(country, 'ffco2_Mt')],
         major_emitter_df.loc[(country, 'primary_PJ_coal')],
         major_emitter_df.loc[(country, 'primary_PJ_oil')],
@@ -1863,12 +1883,21 @@ https://www.energyinst.org/statistical-review/resources-and-data-downloads.')
         user_globals.Color.COAL.value,
         user_globals.Color.OIL.value,
         user_globals.Color.GAS.value,
+        tight=False,
     )
-    counter += 1
-    plt.savefig(
-        os.path.join(fig_dir, str(counter) + ' legend' + '.svg'),
-        format='svg',
-    )
-    if user_globals.Constant.DISPLAY_CHARTS.value is True:
-        plt.show()
-    plt.close()
+
+
+########################################################################################################################
+#
+# Function: rankings()
+#
+# Description:
+# Saves annual shares and rankings of countries, and overtakes between consecutive years, as CSV files for use by
+# year-by-year views of rankings.
+#
+########################################################################################################################
+def rankings(country_rankings):
+    data_dir = os.path.join(output_root, 'data Rankings/')
+    os.makedirs(data_dir, exist_ok=True)  # Save rankings in this directory.
+    country_rankings.cube.to_csv(data_dir + 'Rankings.csv')
+    country_rankings.overtakes.to_csv(data_dir + 'Overtakes.csv', index=False)
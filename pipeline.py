@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+
+#Created on Sun Oct 18 15:40:12 2026
+"""
+
+########################################################################################################################
+#
+# Module: pipeline.py
+#
+# Description:
+# Runs the stages of chart generation as an explicit graph of tasks (user_globals.Task), each declaring the tasks whose
+# outputs are its inputs. Only the tasks required by the targets requested are run, and independent branches run
+# concurrently across worker processes. The output of each memoized task is saved in the cache directory, keyed by the
+# task's fingerprint, which combines the task's name, function and fixed arguments, the content of its source files
+# and of the user modules, and the fingerprints of its inputs. Later runs reuse the output while the fingerprint is
+# unchanged. When tasks run in worker processes, the outputs of other tasks used as inputs are saved in a temporary
+# directory for the run, so that each worker loads each output at most once, rather than being sent it with every task.
+# Each task run is measured by instrument.measure() when measurement is enabled, and the records of worker processes
+# are returned to the main process.
+#
+########################################################################################################################
+
+# Import Python modules.
+import concurrent.futures
+import hashlib
+import importlib
+import os
+import re
+import tempfile
+
+# Import user modules.
+import user_globals
+import cache
+import instrument
+
+# Outputs of tasks already loaded or computed by this process, keyed by cache key, or path in the run's temporary
+# directory. Each worker process has its own copy, so shared outputs such as the EI cube are loaded by a worker once,
+# rather than sent with every task.
+loaded_outputs = {}
+
+
+########################################################################################################################
+#
+# Function: code_fingerprint()
+#
+# Description:
+# Returns a digest of the content of the source files of the modules named, so that memoized outputs are recalculated
+# after code changes.
+#
+########################################################################################################################
+def code_fingerprint(module_names):
+    sha = hashlib.sha256()
+    for module_name in module_names:
+        sha.update(cache.file_hash(importlib.import_module(module_name).__file__).encode())
+    return sha.hexdigest()
+
+
+########################################################################################################################
+#
+# Function: required_tasks()
+#
+# Description:
+# Returns the names of the tasks required to produce the targets, in an order in which every task follows its inputs.
+# Raises ValueError if a task's input isn't a task, or if inputs form a cycle.
+#
+########################################################################################################################
+def required_tasks(tasks, targets):
+    ordered = []
+    visiting = set()
+
+    def visit(name):
+        if name in ordered:
+            return
+        if name not in tasks:
+            raise ValueError('Unknown pipeline task: ' + name)
+        if name in visiting:
+            raise ValueError('Pipeline tasks form a cycle at: ' + name)
+        visiting.add(name)
+        for input_name in tasks[name].inputs.values():
+            visit(input_name)
+        visiting.remove(name)
+        ordered.append(name)
+
+    for target in targets:
+        visit(target)
+    return ordered
+
+
+########################################################################################################################
+#
+# Function: task_fingerprints()
+#
+# Description:
+# Calculates the fingerprint of each task listed, which must be in the order returned by required_tasks().
+#
+########################################################################################################################
+def task_fingerprints(tasks, names, code):
+    fingerprints = {}
+    for name in names:
+        task = tasks[name]
+        sha = hashlib.sha256(code.encode())
+        sha.update(repr((task.name, task.function.__module__, task.function.__qualname__)).encode())
+        sha.update(repr(sorted(task.args.items())).encode())
+        for source in task.sources:
+            try:
+                sha.update(cache.file_hash(source).encode())
+            except FileNotFoundError:
+                sha.update(('missing ' + source).encode())
+        for argument, input_name in sorted(task.inputs.items()):
+            sha.update((argument + fingerprints[input_name]).encode())
+        fingerprints[name] = sha.hexdigest()
+    return fingerprints
+
+
+########################################################################################################################
+#
+# Function: output_key()
+#
+# Description:
+# Returns the cache key of a task's output, from its name and fingerprint.
+#
+########################################################################################################################
+def output_key(name, fingerprint):
+    return cache.cache_key('task-' + re.sub(r'[^A-Za-z0-9]+', '-', name), fingerprint)
+
+
+########################################################################################################################
+#
+# Function: run_task()
+#
+# Description:
+# Runs a task's function, in a worker process or the main process. Inputs are references returned by earlier calls:
+# either ('value', output), ('memo', key) for a memoized output, or ('stored', path) for an output saved in the run's
+# temporary directory. Saved outputs are loaded unless already held by this process. The output is memoized if a key
+# is given, or else saved to the path in the run's temporary directory if given. Measurement is configured with the
+# settings of the main process (see instrument.settings()). Returns a reference to the task's output in the same form,
+# and the records of measurements made while running it.
+#
+########################################################################################################################
+def run_task(name, function, inputs, args, key, path, settings):
+    instrument.configure(*settings)
+    start = len(instrument.records)
+    with instrument.measure('task', name):
+        kwargs = dict(args)
+        for argument, (kind, value) in inputs.items():
+            if kind != 'value':
+                if value not in loaded_outputs:
+                    loaded_outputs[value] = cache.load_object(value) if kind == 'memo' else cache.read_object(value)
+                value = loaded_outputs[value]
+            kwargs[argument] = value
+        output = function(**kwargs)
+        if key is not None:
+            cache.save_object(key, output)
+            loaded_outputs[key] = output
+            reference = 'memo', key
+        elif path is not None:
+            cache.write_object(path, output)
+            loaded_outputs[path] = output
+            reference = 'stored', path
+        else:
+            reference = 'value', output
+    return reference, instrument.collect(start)
+
+
+########################################################################################################################
+#
+# Function: run()
+#
+# Description:
+# Runs the tasks required to produce the targets, each as soon as all of its inputs are available, across the number of
+# worker processes specified (None uses one per CPU). Memoized tasks whose output is already saved for their current
+# fingerprint aren't run. Tasks run one at a time in the main process if there's only one worker. Outputs are memoized
+# only if user_globals.Constant.CACHE_DIR is set. Otherwise, with more than one worker, outputs of tasks used as
+# inputs by other tasks, other than targets, are saved in a temporary directory deleted after the run. The user modules
+# named form part of every task's fingerprint. Returns a reference to the output of each task run or reused, as
+# returned by run_task(), which for outputs saved in the temporary directory is no longer valid. An exception raised by
+# a task is raised here. Records of measurements made by tasks are added to those of the main process.
+#
+########################################################################################################################
+def run(tasks, targets, workers, code_modules):
+    tasks = {task.name: task for task in tasks}
+    names = required_tasks(tasks, targets)
+    with instrument.measure('stage', 'fingerprint tasks'):
+        fingerprints = task_fingerprints(tasks, names, code_fingerprint(code_modules))
+    memoize = user_globals.Constant.CACHE_DIR.value is not None
+    keys = {name: output_key(name, fingerprints[name]) if memoize and tasks[name].memoize else None for name in names}
+
+    # Work back from the targets to find the tasks that must run, skipping those whose output is already memoized, and
+    # those only supplying them.
+    memoized = {name for name in names if keys[name] is not None and cache.object_exists(keys[name])}
+    needed = set(targets)
+    for name in reversed(names):
+        if name in needed and name not in memoized:
+            needed.update(tasks[name].inputs.values())
+    outputs = {}
+    for name in names:
+        if name in needed and name in memoized:
+            print('Reusing memoized output of task: ' + name)
+            instrument.note('task', name, reused=True)
+            outputs[name] = ('memo', keys[name])
+    pending = [name for name in names if name in needed and name not in memoized]
+    if workers is None:
+        workers = os.cpu_count() or 1
+    # Outputs used by other tasks, which workers load from the run's temporary directory rather than being sent them.
+    shared ={input_name for name in pending for input_name in tasks[name].inputs.values()} - set(targets)
+    store = tempfile.TemporaryDirectory(prefix='pipeline_') if workers > 1 else None
+
+    # Returns the calls of pending tasks whose inputs are all available, removing them from those pending.
+    def ready_calls():
+        calls = []
+        for name in [name for name in pending if all(i in outputs for i in tasks[name].inputs.values())]:
+            pending.remove(name)
+            task = tasks[name]
+            inputs = {argument: outputs[input_name] for argument, input_name in task.inputs.items()}
+            path = None
+            if store is not None and keys[name] is None and name in shared:
+                path = os.path.join(store.name, output_key(name, fingerprints[name]) + '.pkl')
+            calls.append((name, (name, task.function, inputs, task.args, keys[name], path, instrument.settings())))
+        return calls
+
+    # Stores the output reference of a task run, and the records of its measurements.
+    def finish(name, result):
+        outputs[name], task_records = result
+        instrument.records.extend(task_records)
+
+    if store is None:
+        while pending:
+            for name, call in ready_calls():
+                finish(name, run_task(*call))
+    else:
+        with store, concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while pending or running:
+                for name, call in ready_calls():
+                    running[executor.submit(run_task, *call)] = name
+                done, not_done = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    finish(running.pop(future), future.result())
+    return outputs
@@ -18,6 +18,7 @@
 
 # Import Python modules.
 import math
+import numpy as np
 import pandas as pd
 
 # Import user modules.
@@ -34,15 +35,12 @@ import countries
 # the final year of data.
 #
 ########################################################################################################################
-def calc_country_shares_fy(data):
-    # Extract CO2 emissions from fossil fuel combustion for all years.
-    ffco2_Mt = data.loc[data['Var'] == 'co2_combust_mtco2']
-
+def calc_country_shares_fy(ei_cube):
     # Identify most recent year.
-    final_yr = max(data.index)
+    final_yr = ei_cube.years[-1]
 
-    # Filter for data of most recent year.
-    ffco2_Mt_fy = ffco2_Mt.loc[ffco2_Mt.index == final_yr]
+    # Extract CO2 emissions from fossil fuel combustion of all countries for most recent year.
+    ffco2_Mt_fy = ei_cube.year_frame('co2_combust_mtco2', final_yr)
 
     # Reindex dataframe to country so that those starting with 'Total' can be
     # dropped. Record World total prior.
@@ -77,13 +75,7 @@ def calc_country_shares_fy(data):
 ########################################################################################################################
 def carbon_emissions(cdata, share_data):
     # Calculate changes and shares.
-    min_year = min(cdata.index)
-    max_year = max(cdata.index)
-    change_yrs = range(min_year + 1, max_year + 1)
-    for yr in change_yrs:
-        cdata.loc[yr, 'Net FF and Cement Change'] = (
-                cdata.loc[yr, 'Net FF and Cement'] - cdata.loc[yr - 1, 'Net FF and Cement']
-        )
+    cdata['Net FF and Cement Change'] = annual_change(cdata['Net FF and Cement'])
     cdata['Total'] = cdata['Net FF and Cement'] + cdata['Land Use Change']
 
     cdata['Fossil Fuel Share'] = (
@@ -232,111 +224,144 @@ def id_major_ffco2_emitters(global_carbon):
 # Function: world_fossil_fuel_production()
 #
 # Description:
-# Calculate shares of fossil fuel production by country, and construct dataframes for each fossil fuel suitable for
-# chart.treemap1x3().
-#
-########################################################################################################################
-def world_fossil_fuel_production(coal, oil, gas, total_coal, total_oil, total_gas):
-    # Drop all rows with Country value 'Total', leaving only countries. Identify latest
-    # production values, rank them, and calculate shares.
-    # 1. Coal
-    coal_producers = coal[~coal.Country.str.contains('Total')]
-    coal_producers_fy = coal_producers.loc[
-        coal_producers.index == max(coal_producers.index)
-        ]
-    coal_producer_shares = coal_producers_fy.copy()
-    coal_producer_shares['Value'] = round(
-        coal_producer_shares['Value'] / total_coal * 100, 1
-    )
+# Calculate shares of world production by country in the final year of data, for every ranking listed in
+# user_globals.PRODUCER_SHARES, and construct a dataframe for each ranking suitable for chart.treemap1x3(). Rows of all
+# ranked EI variables are stacked and processed together, so that adding a ranking only requires adding it to the
+# registry.
+#
+########################################################################################################################
+def world_fossil_fuel_production(data, rankings):
+    ranking_names = {ei_var: name for name, (ei_var, threshold, color) in rankings.items()}
+    thresholds = {name: threshold for name, (ei_var, threshold, color) in rankings.items()}
+    ranked_rows = data['Var'].isin(list(ranking_names))
+    stacked = data.loc[ranked_rows, ['Country', 'Value']].reset_index()
+    stacked['Ranking'] = data.loc[ranked_rows, 'Var'].astype(str).map(ranking_names).values
+
+    # Identify latest year of each ranking, and its world total, in order to calculate shares of each country's value.
+    final_years = stacked.groupby('Ranking', sort=False)['Year'].max()
+    stacked = stacked.loc[stacked['Year'] == stacked['Ranking'].map(final_years)]
+    world_value = stacked['Value'].where(stacked['Country'] == 'Total World')
+    stacked['World Value'] = world_value.groupby(stacked['Ranking'], sort=False).transform('max')
+
+    # Drop all rows with Country value 'Total', leaving only countries, then calculate and rank shares. A stable sort
+    # keeps the order of EI data for countries with equal shares.
+    producers = stacked.loc[~stacked['Country'].str.contains('Total').astype(bool)].copy()
+    producers['Country'] = countries.ffprod_shorten_country(producers['Country'].astype(str))
+    producers['Share'] = round(producers['Value'] / producers['World Value'] * 100, 1)
+    producers = producers.sort_values(by=['Share'], ascending=False, kind='stable')
+    large_producers = producers.loc[producers['Share'] >= producers['Ranking'].map(thresholds)]
+    large_producers_by_ranking = dict(list(large_producers.groupby('Ranking', sort=False)))
+
+    # Generate dataframes required for treemap charts, with the remaining producers combined as 'Other'.
+    producer_shares = {}
+    for name, (ei_var, threshold, color) in rankings.items():
+        large = large_producers_by_ranking.get(name, large_producers.iloc[:0])
+        shares = pd.DataFrame({
+            'Name': large['Country'].tolist() + ['Other'],
+            'Value': large['Share'].tolist() + [round(100 - sum(large['Share']), 1)],
+        })
+        shares['Color'] = color
+        shares['Label'] = fit_treemap_labels(shares['Name'], shares['Value'], 1)
+        shares['Year'] = final_years[name]
+        producer_shares[name] = shares
+
+    return producer_shares
 
-    coal_producer_shares = coal_producer_shares.sort_values(
-        by=['Value'], ascending=False
-    )
-    large_coal_producers = coal_producer_shares[
-        coal_producer_shares['Value']
-        >= user_globals.Constant.COAL_SHARE_RANK_THRESHOLD.value
-        ]
-    other_coal_producers = pd.DataFrame(
-        index=[max(coal_producers.index)], columns=['Country', 'Var', 'Value', 'Year']
-    )
-    other_coal_producers.index.name = 'Year'
-    other_coal_producers['Country'] = 'Other'
-    other_coal_producers['Var'] = 'coalprod_ej'
-    other_coal_producers['Value'] = round(100 - sum(large_coal_producers['Value']), 1)
-    all_coal_producers = pd.concat([large_coal_producers, other_coal_producers])
-
-    # 2. Oil
-    oil_producers = oil[~oil.Country.str.contains('Total')]
-    oil_producers_fy = oil_producers.loc[
-        oil_producers.index == max(oil_producers.index)
-        ]
-    oil_producer_shares = oil_producers_fy.copy()
-    oil_producer_shares['Value'] = round(oil_producers_fy['Value'] / total_oil * 100, 1)
-    oil_producer_shares = oil_producer_shares.sort_values(by=['Value'], ascending=False)
-    large_oil_producers = oil_producer_shares[
-        oil_producer_shares['Value']
-        >= user_globals.Constant.OIL_SHARE_RANK_THRESHOLD.value
-        ]
-    other_oil_producers = pd.DataFrame(
-        index=[max(oil_producers.index)], columns=['Country', 'Var', 'Value', 'Year']
-    )
-    other_oil_producers.index.name = 'Year'
-    other_oil_producers['Country'] = 'Other'
-    other_oil_producers['Var'] = 'oilprod_ej'
-    other_oil_producers['Value'] = round(100 - sum(large_oil_producers['Value']), 1)
-    all_oil_producers = pd.concat([large_oil_producers, other_oil_producers])
-
-    # 3. Gas
-    gas_producers = gas[~gas.Country.str.contains('Total')]
-    gas_producers_fy = gas_producers.loc[
-        gas_producers.index == max(gas_producers.index)
-        ]
-    gas_producer_shares = gas_producers_fy.copy()
-    gas_producer_shares['Value'] = round(gas_producers_fy['Value'] / total_gas * 100, 1)
-    gas_producer_shares = gas_producer_shares.sort_values(by=['Value'], ascending=False)
-    large_gas_producers = gas_producer_shares[
-        gas_producer_shares['Value']
-        >= user_globals.Constant.GAS_SHARE_RANK_THRESHOLD.value
-        ]
-    other_gas_producers = pd.DataFrame(
-        index=[max(gas_producers.index)], columns=['Country', 'Var', 'Value', 'Year']
-    )
-    other_gas_producers.index.name = 'Year'
-    other_gas_producers['Country'] = 'Other'
-    other_gas_producers['Var'] = 'gasprod_ej'
-    other_gas_producers['Value'] = round(100 - sum(large_gas_producers['Value']), 1)
-    all_gas_producers = pd.concat([large_gas_producers, other_gas_producers])
-    all_coal_producers, all_oil_producers, all_gas_producers = (
-        countries.ffprod_shorten_country(
-            all_coal_producers, all_oil_producers, all_gas_producers
-        )
-    )
 
-    # Generate dataframes required for treemap charts.
-    coal_prod_shares = pd.DataFrame(columns=['Name', 'Value', 'Color', 'Label', 'Year'])
-    oil_prod_shares = pd.DataFrame(columns=['Name', 'Value', 'Color', 'Label', 'Year'])
-    gas_prod_shares = pd.DataFrame(columns=['Name', 'Value', 'Color', 'Label', 'Year'])
+########################################################################################################################
+#
+# Function: ranking_cube()
+#
+# Description:
+# For every year from start_yr, calculates each country's share of the world total of each metric (an EI variable), and
+# ranks countries by it. Countries are those with an ISO code in EI data, which excludes regions and totals. Values of
+# all metrics and years are sliced from the EI cube at once, and ranked by a single groupby over the entire history.
+#
+########################################################################################################################
+def ranking_cube(ei_cube, metrics, start_yr):
+    metrics = {metric: ei_var for metric, ei_var in metrics.items() if ei_var in ei_cube.var_index}
+    var_positions = [ei_cube.var_index[ei_var] for ei_var in metrics.values()]
+    year_positions = np.flatnonzero(ei_cube.years >= start_yr)
+    values = ei_cube.values[:, var_positions][:, :, year_positions]
+    world_values = values[ei_cube.country_index['Total World']]
+    is_country = pd.notna(ei_cube.iso) & (ei_cube.countries != 'Total World')
+
+    # Arrange values and shares of countries as Year x Country x Metric, dropping those without a value.
+    country_values = values[is_country]
+    country_shares = country_values / world_values * 100
+    index = pd.MultiIndex.from_product([ei_cube.years[year_positions], ei_cube.countries[is_country], list(metrics)],
+                                       names=['Year', 'Country', 'Metric'])
+    cube = pd.DataFrame({
+        'Value': country_values.transpose(2, 0, 1).ravel(),
+        'Share': country_shares.transpose(2, 0, 1).ravel(),
+    }, index=index).dropna(subset=['Value'])
+
+    # Rank countries of each metric in each year, from largest (1) to smallest.
+    cube['Rank'] = cube.groupby(level=['Year', 'Metric'])['Value'].rank(ascending=False, method='min').astype(int)
+    return cube
+
 
-    coal_prod_shares['Name'] = all_coal_producers['Country'].values
-    oil_prod_shares['Name'] = all_oil_producers['Country'].values
-    gas_prod_shares['Name'] = all_gas_producers['Country'].values
+########################################################################################################################
+#
+# Function: ranking_overtakes()
+#
+# Description:
+# From a ranking cube generated by ranking_cube(), identifies every country that rose above another in a ranking from
+# one year to the next. Rankings of all years and metrics are compared at once, as an array of shape
+# (years, metrics, countries), with countries absent from a ranking in either year excluded.
+#
+########################################################################################################################
+def ranking_overtakes(cube):
+    years = cube.index.get_level_values('Year').unique().sort_values()
+    metrics = cube.index.get_level_values('Metric').unique()
+    ranks = cube['Rank'].unstack('Country').reindex(pd.MultiIndex.from_product([years, metrics]))
+    country_names = ranks.columns.to_numpy()
+    ranks = ranks.to_numpy(dtype=float).reshape(len(years), len(metrics), len(country_names))
+
+    # A country overtook another if it was ranked below it in the previous year, and above it in the following year.
+    previous, following = ranks[:-1], ranks[1:]
+    overtook = ((previous[:, :, :, np.newaxis] > previous[:, :, np.newaxis, :])
+                & (following[:, :, :, np.newaxis] < following[:, :, np.newaxis, :]))
+    y, m, c, o = np.nonzero(overtook)
+    overtakes = pd.DataFrame({
+        'Year': years.to_numpy()[y + 1],
+        'Metric': metrics.to_numpy()[m],
+        'Country': country_names[c],
+        'Rank': following[y, m, c].astype(int),
+        'Overtaken': country_names[o],
+        'Overtaken Rank': following[y, m, o].astype(int),
+    })
+    return overtakes.sort_values(by=['Year', 'Metric', 'Rank', 'Overtaken Rank'], kind='stable', ignore_index=True)
 
-    coal_prod_shares['Value'] = all_coal_producers['Value'].values
-    oil_prod_shares['Value'] = all_oil_producers['Value'].values
-    gas_prod_shares['Value'] = all_gas_producers['Value'].values
 
-    coal_prod_shares['Color'] = user_globals.Color.COAL.value
-    oil_prod_shares['Color'] = user_globals.Color.OIL.value
-    gas_prod_shares['Color'] = user_globals.Color.GAS.value
+########################################################################################################################
+#
+# Function: annual_change()
+#
+# Description:
+# Calculates the change of each year's values (series or dataframe indexed by year) from the previous calendar year.
+# The change is NaN for the first year, and for any year following a year missing from the index.
+#
+########################################################################################################################
+def annual_change(data):
+    return data - data.reindex(data.index - 1).to_numpy()
 
-    coal_prod_shares['Label'] = fit_treemap_labels(coal_prod_shares['Name'], coal_prod_shares['Value'], 1)
-    oil_prod_shares['Label'] = fit_treemap_labels(oil_prod_shares['Name'], oil_prod_shares['Value'], 1)
-    gas_prod_shares['Label'] = fit_treemap_labels(gas_prod_shares['Name'], gas_prod_shares['Value'], 1)
-    coal_prod_shares['Year'] = max(coal.index)
-    oil_prod_shares['Year'] = max(coal.index)
-    gas_prod_shares['Year'] = max(coal.index)
 
-    return coal_prod_shares, oil_prod_shares, gas_prod_shares
+########################################################################################################################
+#
+# Function: changes_and_shares()
+#
+# Description:
+# For each specified column of a dataframe indexed by year, adds the columns '<column> Share', being the percentage
+# share of total_column, and '<column> Change', being the annual change. Calculated for all columns at once.
+#
+########################################################################################################################
+def changes_and_shares(df, columns, total_column):
+    shares = df[columns].div(df[total_column], axis=0) * 100
+    changes = annual_change(df[columns])
+    for column in columns:
+        df[column + ' Share'] = shares[column]
+        df[column + ' Change'] = changes[column]
 
 
 ########################################################################################################################
@@ -348,12 +373,7 @@ def world_fossil_fuel_production(coal, oil, gas, total_coal, total_oil, total_ga
 #
 ########################################################################################################################
 def ffco2_change(df):
-    min_year = min(df.index)
-    max_year = max(df.index)
-    change_yrs = range(min_year + 1, max_year + 1)
-
-    for yr in change_yrs:
-        df.loc[yr, 'Change'] = df.loc[yr, 'Value'] - df.loc[yr - 1, 'Value']
+    df['Change'] = annual_change(df['Value'])
 
 
 ########################################################################################################################
@@ -411,104 +431,12 @@ def sector_co2(energy_system):
 ########################################################################################################################
 def primary_energy(energy_system):
     # Calculate annual shares and changes.
-    min_year = min(energy_system.primary_PJ.index)
-    max_year = max(energy_system.primary_PJ.index)
-    change_yrs = range(min_year + 1, max_year + 1)
-
-    # Coal.
-    if not energy_system.primary_PJ['Coal'].empty:
-        energy_system.primary_PJ['Coal Share'] = (
-                (energy_system.primary_PJ['Coal'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Coal Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Coal']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Coal']
-            )
-    # Oil.
-    if not energy_system.primary_PJ['Oil'].empty:
-        energy_system.primary_PJ['Oil Share'] = (
-                (energy_system.primary_PJ['Oil'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Oil Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Oil']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Oil']
-            )
-    # Gas.
-    if not energy_system.primary_PJ['Gas'].empty:
-        energy_system.primary_PJ['Gas Share'] = (
-                (energy_system.primary_PJ['Gas'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Gas Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Gas']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Gas']
-            )
-    # Nuclear.
-    if not energy_system.primary_PJ['Nuclear'].empty:
-        energy_system.primary_PJ['Nuclear Share'] = (
-                (energy_system.primary_PJ['Nuclear'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Nuclear Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Nuclear']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Nuclear']
-            )
-
-    # Hydro.
-    if not energy_system.primary_PJ['Hydro'].empty:
-        energy_system.primary_PJ['Hydro Share'] = (
-                (energy_system.primary_PJ['Hydro'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Hydro Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Hydro']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Hydro']
-            )
-    # Wind.
-    if not energy_system.primary_PJ['Wind'].empty:
-        energy_system.primary_PJ['Wind Share'] = (
-                (energy_system.primary_PJ['Wind'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Wind Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Wind']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Wind']
-            )
-    # Solar.
-    if not energy_system.primary_PJ['Solar'].empty:
-        energy_system.primary_PJ['Solar Share'] = (
-                (energy_system.primary_PJ['Solar'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Solar Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Solar']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Solar']
-            )
-
-    # Bio Geo and Other.
-    if not energy_system.primary_PJ['Bio, Geo and Other'].empty:
-        energy_system.primary_PJ['Bio, Geo and Other Share'] = (
-                (energy_system.primary_PJ['Bio, Geo and Other'] / energy_system.primary_PJ['Total']) * 100)
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Bio, Geo and Other Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Bio, Geo and Other']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Bio, Geo and Other']
-            )
-
-    # Fossil Fuels.
-    if not energy_system.primary_PJ['Fossil Fuels'].empty:
-        energy_system.primary_PJ['Fossil Fuels Share'] = (energy_system.primary_PJ['Fossil Fuels'] /
-                                                          energy_system.primary_PJ['Total']) * 100
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Fossil Fuels Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Fossil Fuels']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Fossil Fuels']
-            )
-
-    # Renewables.
-    if not energy_system.primary_PJ['Renewables'].empty:
-        energy_system.primary_PJ['Renewables Share'] = (energy_system.primary_PJ['Renewables'] /
-                                                        energy_system.primary_PJ['Total']) * 100
-        for yr in change_yrs:
-            energy_system.primary_PJ.loc[yr, 'Renewables Change'] = (
-                    energy_system.primary_PJ.loc[yr, 'Renewables']
-                    - energy_system.primary_PJ.loc[yr - 1, 'Renewables']
-            )
+    changes_and_shares(
+        energy_system.primary_PJ,
+        ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydro', 'Wind', 'Solar', 'Bio, Geo and Other', 'Fossil Fuels',
+         'Renewables'],
+        'Total',
+    )
 
 
 ########################################################################################################################
@@ -528,139 +456,13 @@ def electricity(energy_system):
         print('No electricity data for country in EI dataset.\n')
         return ()
 
-    min_year = min(energy_system.elecgen_TWh.index)
-    max_year = max(energy_system.elecgen_TWh.index)
-    change_yrs = range(min_year + 1, max_year + 1)
-
-    # Coal.
-    if not energy_system.elecgen_TWh['Coal'].empty:
-        energy_system.elecgen_TWh['Coal Share'] = (energy_system.elecgen_TWh['Coal'] /
-                                                   energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Coal Change'] = (energy_system.elecgen_TWh.loc[yr, 'Coal'] -
-                                                                energy_system.elecgen_TWh.loc[yr - 1, 'Coal'])
-        energy_system.elecgen_PWh['Coal'] = energy_system.elecgen_TWh['Coal'] * user_globals.Constant.TWH_TO_PWH.value
-
-    # Oil.
-    if not energy_system.elecgen_TWh['Oil'].empty:
-        energy_system.elecgen_TWh['Oil Share'] = (energy_system.elecgen_TWh['Oil'] /
-                                                  energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Oil Change'] = (energy_system.elecgen_TWh.loc[yr, 'Oil'] -
-                                                               energy_system.elecgen_TWh.loc[yr - 1, 'Oil'])
-        energy_system.elecgen_PWh['Oil'] = energy_system.elecgen_TWh['Oil'] * user_globals.Constant.TWH_TO_PWH.value
-
-    # Gas.
-    if not energy_system.elecgen_TWh['Gas'].empty:
-        energy_system.elecgen_TWh['Gas Share'] = (energy_system.elecgen_TWh['Gas'] /
-                                                  energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Gas Change'] = (energy_system.elecgen_TWh.loc[yr, 'Gas'] -
-                                                               energy_system.elecgen_TWh.loc[yr - 1, 'Gas'])
-        energy_system.elecgen_PWh['Gas'] = energy_system.elecgen_TWh['Gas'] * user_globals.Constant.TWH_TO_PWH.value
-
-    # Nuclear.
-    if not energy_system.elecgen_TWh['Nuclear'].empty:
-        energy_system.elecgen_TWh['Nuclear Share'] = (energy_system.elecgen_TWh['Nuclear'] /
-                                                      energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Nuclear Change'] = (energy_system.elecgen_TWh.loc[yr, 'Nuclear'] -
-                                                                   energy_system.elecgen_TWh.loc[yr - 1, 'Nuclear'])
-        energy_system.elecgen_PWh['Nuclear'] = (energy_system.elecgen_TWh['Nuclear'] *
-                                                user_globals.Constant.TWH_TO_PWH.value)
-
-    # Hydro.
-    if not energy_system.elecgen_TWh['Hydro'].empty:
-        energy_system.elecgen_TWh['Hydro Share'] = ((energy_system.elecgen_TWh['Hydro'] /
-                                                     energy_system.elecgen_TWh['Total Country']) * 100)
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Hydro Change'] = (energy_system.elecgen_TWh.loc[yr, 'Hydro']
-                                                                 - energy_system.elecgen_TWh.loc[yr - 1, 'Hydro'])
-        energy_system.elecgen_PWh['Hydro'] = energy_system.elecgen_TWh['Hydro'] * user_globals.Constant.TWH_TO_PWH.value
-
-    # Wind.
-    if not energy_system.elecgen_TWh['Wind'].empty:
-        energy_system.elecgen_TWh['Wind Share'] = (energy_system.elecgen_TWh['Wind']
-                                                   / energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Wind Change'] = (energy_system.elecgen_TWh.loc[yr, 'Wind']
-                                                                - energy_system.elecgen_TWh.loc[yr - 1, 'Wind'])
-        energy_system.elecgen_PWh['Wind'] = energy_system.elecgen_TWh['Wind'] * user_globals.Constant.TWH_TO_PWH.value
-
-    # Solar.
-    if not energy_system.elecgen_TWh['Solar'].empty:
-        energy_system.elecgen_TWh['Solar Share'] = (energy_system.elecgen_TWh['Solar'] /
-                                                    energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Solar Change'] = (energy_system.elecgen_TWh.loc[yr, 'Solar']
-                                                                 - energy_system.elecgen_TWh.loc[yr - 1, 'Solar'])
-        energy_system.elecgen_PWh['Solar'] = (energy_system.elecgen_TWh['Solar'] *
-                                              user_globals.Constant.TWH_TO_PWH.value)
-
-    # Bio Geo and Other.
-    if not energy_system.elecgen_TWh['Bio, Geo and Other'].empty:
-        energy_system.elecgen_TWh['Bio, Geo and Other Share'] = (energy_system.elecgen_TWh['Bio, Geo and Other'] /
-                                                                 energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Bio, Geo and Other Change'] = (
-                    energy_system.elecgen_TWh.loc[yr, 'Bio, Geo and Other']
-                    - energy_system.elecgen_TWh.loc[yr - 1, 'Bio, Geo and Other']
-            )
-        energy_system.elecgen_PWh['Bio, Geo and Other'] = (energy_system.elecgen_TWh['Bio, Geo and Other'] *
-                                                           user_globals.Constant.TWH_TO_PWH.value
-                                                           )
-
-    # Fossil Fuels.
-    if not energy_system.elecgen_TWh['Fossil Fuels'].empty:
-        energy_system.elecgen_TWh['Fossil Fuels Share'] = (energy_system.elecgen_TWh['Fossil Fuels']
-                                                           / energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Fossil Fuels Change'] = (
-                    energy_system.elecgen_TWh.loc[yr, 'Fossil Fuels']
-                    - energy_system.elecgen_TWh.loc[yr - 1, 'Fossil Fuels'])
-        energy_system.elecgen_PWh['Fossil Fuels'] = (energy_system.elecgen_TWh['Fossil Fuels'] *
-                                                     user_globals.Constant.TWH_TO_PWH.value)
-
-    # Wind and Solar.
-    if not energy_system.elecgen_TWh['Wind and Solar'].empty:
-        energy_system.elecgen_TWh['Wind and Solar Share'] = (energy_system.elecgen_TWh['Wind and Solar'] /
-                                                             energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Wind and Solar Change'] = (
-                    energy_system.elecgen_TWh.loc[yr, 'Wind and Solar']
-                    - energy_system.elecgen_TWh.loc[yr - 1, 'Wind and Solar'])
-        energy_system.elecgen_PWh['Wind and Solar'] = (
-                energy_system.elecgen_TWh['Wind and Solar'] * user_globals.Constant.TWH_TO_PWH.value)
-
-    # Renewables.
-    if not energy_system.elecgen_TWh['Renewables'].empty:
-        energy_system.elecgen_TWh['Renewables Share'] = (energy_system.elecgen_TWh['Renewables'] /
-                                                         energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Renewables Change'] = (
-                    energy_system.elecgen_TWh.loc[yr, 'Renewables'] -
-                    energy_system.elecgen_TWh.loc[yr - 1, 'Renewables'])
-        energy_system.elecgen_PWh['Renewables'] = (energy_system.elecgen_TWh['Renewables'] *
-                                                   user_globals.Constant.TWH_TO_PWH.value)
-
-    # Unpublished.
-    if not energy_system.elecgen_TWh['Unpublished'].empty:
-        energy_system.elecgen_TWh['Unpublished Share'] = (energy_system.elecgen_TWh['Unpublished'] /
-                                                          energy_system.elecgen_TWh['Total Country']) * 100
-        for yr in change_yrs:
-            energy_system.elecgen_TWh.loc[yr, 'Unpublished Change'] = (
-                    energy_system.elecgen_TWh.loc[yr, 'Unpublished']
-                    - energy_system.elecgen_TWh.loc[yr - 1, 'Unpublished'])
-        energy_system.elecgen_PWh['Unpublished'] = (energy_system.elecgen_TWh['Unpublished'] *
-                                                    user_globals.Constant.TWH_TO_PWH.value)
-
-    # Total.
-    for yr in change_yrs:
-        energy_system.elecgen_TWh.loc[yr, 'Total Change'] = (
-                energy_system.elecgen_TWh.loc[yr, 'Total Country']
-                - energy_system.elecgen_TWh.loc[yr - 1, 'Total Country'])
-    energy_system.elecgen_PWh['Total Country'] = (energy_system.elecgen_TWh['Total Country'] *
-                                                  user_globals.Constant.TWH_TO_PWH.value)
+    # Calculate annual shares and changes, and convert to PWh.
+    columns = ['Coal', 'Oil', 'Gas', 'Nuclear', 'Hydro', 'Wind', 'Solar', 'Bio, Geo and Other', 'Fossil Fuels',
+               'Wind and Solar', 'Renewables', 'Unpublished']
+    changes_and_shares(energy_system.elecgen_TWh, columns, 'Total Country')
+    energy_system.elecgen_TWh['Total Change'] = annual_change(energy_system.elecgen_TWh['Total Country'])
+    energy_system.elecgen_PWh = (energy_system.elecgen_TWh[columns + ['Total Country']] *
+                                 user_globals.Constant.TWH_TO_PWH.value)
 
     # To plot shares for final year, organise into dataframes of the prerequisite format.
     ff_elec_share_fy = energy_system.elecgen_TWh['Fossil Fuels Share'].iloc[-1]
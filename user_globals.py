@@ -17,11 +17,8 @@
 
 # Import Python modules.
 from enum import Enum
-import matplotlib.pyplot as plt
-
-# Set global font parameters.
-# If you add a font to the OS, be sure to delete all matplotlib's font cache files in ~/.matplotlib.
-plt.rcParams['font.sans-serif'] = 'Google Sans'
+import numpy as np
+import pandas as pd
 
 # Define custom class for organising fossil fuel CO2 emissions and atmospheric CO2 data
 class Global_Carbon:
@@ -101,6 +98,37 @@ class Energy_System:
         self.finalenergy_fy_shares = finalenergy_fy_shares
 
 
+# Define custom class for organising per capita fossil fuel CO2 emissions of all countries. These are the same for every
+# country profiled, so are calculated once per run.
+class Per_Capita_Emissions:
+    def __init__(
+            self,
+            pc_tco2,
+            # Per capita emissions of countries above threshold (sorted), 'Other' and 'World', in order plotted.
+            associated_data,
+            # Data used for footer text in per capita fossil fuel CO2 chart.
+            country_pc_tco2,
+            # Dataframe of countries appearing in both EI and population data, with their population, emissions, per
+            # capita emissions, and flags for World and countries plotted individually.
+            other_pc_tco2,
+            # Per capita emissions of population of countries not plotted individually.
+            world_pc_tco2,
+            # World per capita emissions, as series labelled 'World'.
+            pc_tco2_history,
+            # Annual per capita emissions of all countries in both EI and population data (rows are years, columns
+            # are EI country names).
+            pc_tco2_rank_history,
+            # Annual ranking of above countries by per capita emissions (1 is highest), excluding World.
+    ):
+        self.pc_tco2 = pc_tco2
+        self.associated_data = associated_data
+        self.country_pc_tco2 = country_pc_tco2
+        self.other_pc_tco2 = other_pc_tco2
+        self.world_pc_tco2 = world_pc_tco2
+        self.pc_tco2_history = pc_tco2_history
+        self.pc_tco2_rank_history = pc_tco2_rank_history
+
+
 # Define custom class for organising major fossil fuel production and consumption, instead of passing numerous variables
 # or creating a complicated data structure.
 class Major_Fossil_Fuel_Production_Consumption:
@@ -139,9 +167,116 @@ class Major_Fossil_Fuel_Production_Consumption:
         #self.major_gas_consumption_EJ = major_gas_consumption_EJ
 
 
+# Define custom class for organising annual shares and rankings of countries for the metrics listed in RANKING_METRICS,
+# for every year, and the overtakes in ranking between consecutive years.
+class Rankings:
+    def __init__(
+            self,
+            cube,
+            # Dataframe indexed by (Year, Country, Metric), with columns 'Value' (in units of EI data), 'Share'
+            # (percent of world total) and 'Rank' (1 is largest).
+            overtakes,
+            # Dataframe of every country that rose above another in a ranking from one year to the next, with columns
+            # 'Year', 'Metric', 'Country', 'Rank', 'Overtaken' and 'Overtaken Rank'.
+    ):
+        self.cube = cube
+        self.overtakes = overtakes
+
+
+# Define custom class of a stage of the task graph run by pipeline.run(). The task's function is called with the outputs
+# of other tasks and fixed arguments as keyword arguments.
+class Task:
+    def __init__(
+            self,
+            name,  # Unique name of task.
+            function,  # Module level function performing the task, so that it can be sent to a worker process.
+            inputs=None,  # Dictionary mapping each argument of function to the name of the task providing it.
+            args=None,  # Dictionary of fixed keyword arguments of function.
+            sources=(),  # Input files read by function, whose content is part of the task's fingerprint.
+            memoize=True,  # Whether the output is saved and reused while the fingerprint is unchanged. Tasks that
+            # only save charts aren't memoized.
+    ):
+        self.name = name
+        self.function = function
+        self.inputs = inputs if inputs is not None else {}
+        self.args = args if args is not None else {}
+        self.sources = sources
+        self.memoize = memoize
+
+
+# Define custom class holding the EI dataset pivoted into a dense Country x Var x Year cube, so that a country's annual
+# values of a variable are obtained by indexing rather than by filtering the entire dataset.
+class EI_Cube:
+    def __init__(
+            self,
+            countries,  # Country names, in order of first appearance in EI data.
+            variables,  # EI variable names (column 'Var'), in order of first appearance.
+            years,  # Sorted array of all years in EI data.
+            values,  # Float array of shape (countries, variables, years). NaN where no row exists.
+            present,  # Boolean array of same shape as values. True where EI data contains a row.
+            iso,  # ISO3166_alpha3 code of each country. NaN for regions and totals.
+    ):
+        self.countries = countries
+        self.variables = variables
+        self.years = years
+        self.values = values
+        self.present = present
+        self.iso = iso
+        # Lookup tables of country name, variable name and year to position in cube.
+        self.country_index = {name: i for i, name in enumerate(countries)}
+        self.var_index = {name: i for i, name in enumerate(variables)}
+        self.year_index = {year: i for i, year in enumerate(years)}
+
+    # Return a country's annual values of a variable as a year indexed series. As with filtering the EI dataset, only
+    # years for which EI data contains a row are included, and an empty series is returned if there's none.
+    def series(self, country, var):
+        if country not in self.country_index or var not in self.var_index:
+            return pd.Series(index=pd.Index([], dtype=self.years.dtype, name='Year'), name='Value', dtype=float)
+        c = self.country_index[country]
+        v = self.var_index[var]
+        mask = self.present[c, v]
+        return pd.Series(self.values[c, v, mask], index=pd.Index(self.years[mask], name='Year'), name='Value')
+
+    # Return all countries' annual values of a variable as a Year x Country dataframe, with NaN where EI data contains
+    # no row, including every year of a variable that isn't in EI data.
+    def var_frame(self, var):
+        index = pd.Index(self.years, name='Year')
+        if var not in self.var_index:
+            return pd.DataFrame(np.nan, index=index, columns=self.countries)
+        return pd.DataFrame(self.values[:, self.var_index[var], :].T, index=index, columns=self.countries)
+
+    # Return all countries' values of a variable for a single year, as a dataframe with the columns of the EI dataset.
+    def year_frame(self, var, year):
+        if var not in self.var_index or year not in self.year_index:
+            return pd.DataFrame(columns=['Country', 'ISO3166_alpha3', 'Var', 'Value'])
+        v = self.var_index[var]
+        y = self.year_index[year]
+        mask = self.present[:, v, y]
+        return pd.DataFrame({
+            'Country': self.countries[mask],
+            'ISO3166_alpha3': self.iso[mask],
+            'Var': var,
+            'Value': self.values[mask, v, y],
+        })
+
+
 # Define conversion coefficients (multiply for conversion) and presets.
 class Constant(Enum):
     DISPLAY_CHARTS = False  # Whether charts are output to monitor.
+    CACHE_DIR = 'cache'  # Directory of cached copies of imported datasets, reused while source files are unchanged. Set
+    # to None to disable caching.
+    EI_STRING_DTYPE = 'category'  # Dtype of the text columns of EI data (Country, Var, ISO3166_alpha3). 'category'
+    # stores each distinct string once and filters compare integer codes. Set to 'str' to import as Python strings.
+    EI_CHUNK_ROWS = 100000  # Rows of EI CSV file parsed at a time. Rows of unused variables are dropped from each
+    # chunk.
+    EI_FILENAME = 'Statistical Review of World Energy Narrow format.csv'  # Input files, read from working directory.
+    GCP_FILENAME = 'Global_Carbon_Budget_2025_v1.0.xlsx'
+    GCP_PATHWAYS_FILENAME = 's64_2024_LinearPathways.csv'
+    ESRL_CONC_FILENAME = 'co2_annmean_gl.csv'
+    ESRL_CHANGE_FILENAME = 'co2_gr_gl.csv'
+    WB_FILENAME = 'world_pop.csv'
+    PIPELINE_WORKERS = None  # Number of processes running independent tasks of the pipeline in parallel, such as the
+    # profiles of separate countries. None uses one per CPU. Tasks run one at a time in the main process if it's 1.
     CHART_START_YR_FOR_FFCO2_CEMENT = 1960 # Initial year of data for cement carbonation is 1959, so begin chart at 1960
     CHART_START_YR_FOR_MAJOR_EMITTERS = 1965  # Start year for plots of major emitter emissions and fossil fuel primary
     # energy.
@@ -149,6 +284,7 @@ class Constant(Enum):
     CHANGE_CHART_START_YR = 2010  # Start year of annual change charts.
     FF_PROD_START_YR = 1990  # Start year of fossil fuel production chart.
     FF_CONS_START_YR = 1990  # Start year of fossil fuel consumption chart.
+    RANKING_START_YR = 1965  # Start year of annual shares and rankings of countries (see RANKING_METRICS).
 
     C_TO_CO2 = 44 / 12
     k_TO_M = 1e-3
@@ -322,19 +458,66 @@ class Color(Enum):
     PER_CAPITA_HIGHLIGHT = 'magenta'
 
 
-# All prebuilt chart styles: https://python-charts.com/matplotlib/styles/#list
-# Python chart gallery: https://python-graph-gallery.com/
-# Matplotlib universal settings:
-# https://matplotlib.org/stable/api/matplotlib_configuration_api.html#matplotlib.rcParams
+# Registry of tables collated from EI data for a country. Each column maps to the EI variables (column 'Var' of EI data)
+# summed to obtain it, and the factor converting the sum to the units of the table. Tables are indexed by the years of
+# total primary energy ('tes_ej'), or of total electricity generation ('elect_twh') in the case of elecgen_TWh.
+EI_TABLES = {
+    'ffprod_PJ': {
+        'Coal': (('coalprod_ej',), Constant.EJ_TO_PJ.value),
+        'Oil': (('oilprod_mt',), 1e6 * Constant.TOE_TO_GJ.value * Constant.GJ_TO_PJ.value),
+        'Gas': (('gasprod_ej',), Constant.EJ_TO_PJ.value),
+    },
+    'primary_PJ': {
+        'Coal': (('coal_tes_ej',), Constant.EJ_TO_PJ.value),
+        'Oil': (('oil_tes_ej',), Constant.EJ_TO_PJ.value),
+        'Gas': (('gas_tes_ej',), Constant.EJ_TO_PJ.value),
+        'Nuclear': (('nuclear_tes_ej',), Constant.EJ_TO_PJ.value),
+        'Hydro': (('hydro_tes_ej',), Constant.EJ_TO_PJ.value),
+        'Wind': (('wind_tes_ej',), Constant.EJ_TO_PJ.value),
+        'Solar': (('solar_tes_ej',), Constant.EJ_TO_PJ.value),
+        'Bio, Geo and Other': (('biogeo_tes_ej', 'biofuels_tes_ej'), Constant.EJ_TO_PJ.value),
+    },
+    'elecgen_TWh': {
+        'Coal': (('electbyfuel_coal',), 1),
+        'Oil': (('electbyfuel_oil',), 1),
+        'Gas': (('electbyfuel_gas',), 1),
+        'Nuclear': (('nuclear_twh',), 1),
+        'Hydro': (('hydro_twh',), 1),
+        'Wind': (('wind_twh',), 1),
+        'Solar': (('solar_twh',), 1),
+        'Bio, Geo': (('biogeo_twh',), 1),
+        'Other': (('electbyfuel_other',), 1),
+    },
+}
 
+# Registry of rankings of world producers in the final year of EI data, calculated by
+# process.world_fossil_fuel_production() and each plotted as a treemap. Each ranking maps to the EI variable ranked, the
+# share (percent of world total) at or above which a country is shown individually rather than in 'Other', and the
+# color of its treemap.
+PRODUCER_SHARES = {
+    'Coal': ('coalprod_ej', Constant.COAL_SHARE_RANK_THRESHOLD.value, Color.COAL.value),
+    'Oil': ('oilprod_mt', Constant.OIL_SHARE_RANK_THRESHOLD.value, Color.OIL.value),
+    'Gas': ('gasprod_ej', Constant.GAS_SHARE_RANK_THRESHOLD.value, Color.GAS.value),
+}
 
-rc = {
-    'xtick.direction': 'out',
-    'xtick.color': 'grey',
-    'xtick.labelcolor': 'black',
-    'ytick.direction': 'out',
-    'ytick.color': 'grey',
-    'ytick.labelcolor': 'black',
+# Registry of metrics for which countries are ranked by share of world total, for every year from RANKING_START_YR. Each
+# metric maps to the EI variable ranked.
+RANKING_METRICS = {
+    'FFCO2 Emissions': 'co2_combust_mtco2',
+    'Coal Production': 'coalprod_ej',
+    'Oil Production': 'oilprod_mt',
+    'Gas Production': 'gasprod_ej',
 }
-plt.style.use(('bmh', rc))
 
+# Registry of EI variables used by collate.py and process.py, grouped by purpose. Only rows of these variables are
+# imported, so any variable newly used must be added here, or to EI_TABLES, PRODUCER_SHARES or RANKING_METRICS above.
+EI_VARS = {
+    'Fossil Fuel CO2': ('co2_combust_mtco2',),
+    'Fossil Fuel Production': ('coalprod_ej', 'oilprod_mt', 'gasprod_ej'),
+    'Primary Energy': ('tes_ej', 'coal_tes_ej', 'oil_tes_ej', 'gas_tes_ej'),
+    'Electricity Generation': ('elect_twh',),
+}
+EI_VARS.update({table: tuple(var for ei_vars, factor in columns.values() for var in ei_vars)
+                for table, columns in EI_TABLES.items()})
+EI_VARS['Producer Shares'] = tuple(ei_var for ei_var, threshold, color in PRODUCER_SHARES.values())
+EI_VARS['Rankings'] = tuple(RANKING_METRICS.values())
@@ -6,10 +6,16 @@
 #@author: shanewhite
 """
 
+# Import Python modules.
+import argparse
+
 # Import user modules.
 import collate
 import process
 import output
+import pipeline
+import instrument
+import user_globals
 
 ########################################################################################################################
 #
@@ -28,73 +34,300 @@ import output
 # output.py (controls sequence of calling chart functions)
 # chart.py (generic chart functions)
 # countries.py (translates country names for display in charts)
+# cache.py (caches imported datasets and pipeline task outputs)
+# pipeline.py (runs stages as a graph of tasks)
+# instrument.py (measures the time and memory of stages and charts)
 #
 #
 # Outputs: Charts shown at https://www.worldenergydata.org
 #
+# Usage: python world_energy_data.py [--countries COUNTRY ...] [--charts GROUP ...] [--output-dir DIR] [--workers N]
+#                                    [--report FILE [--trace-memory]]
+# Run with --help for details. By default, all charts are generated for the countries defined below.
+#
 ########################################################################################################################
 
-# Define countries to profile using tuple.
+# Define countries to profile using tuple. Used unless countries are specified on the command line.
 countries = ('Total World',)
 
-# 1. Import all data except IEA data, which is done on a per-country basis as it's contained in separate files provided
-# by user. This is done in profile(country) below.
-print('Importing and collating data.\n')
-gcp_data, gcp_co2_rcp_pathways, esrl_data, ei_data, wb_data = collate.import_gcp_esrl_ei_pop_data()
-
-# 2. Organise all CO2 related data as required for plots, and plot GCP and NOAA ESRL data.
-print('Processing CO2 data:\n')
-global_carbon = collate.co2_data(ei_data, gcp_data, gcp_co2_rcp_pathways, esrl_data)
-output.world_co2_charts(global_carbon)
-
-# 3. Generate dataframes of major coal, oil and gas producers as required for plot of shares for final year of data in
-# profile() below.
-print('\nIdentifying major fossil fuel producers:\n')
-major_coal_producers, major_oil_producers, major_gas_producers = collate.fossil_fuel_producer_shares(ei_data)
-major_fossil_fuel_producer_data = collate.major_fossil_fuel_production(
-    major_coal_producers,
-    major_oil_producers,
-    major_gas_producers,
-    # major_coal_consumers,
-    # major_oil_consumers,
-    # major_gas_consumers,
-    ei_data)
-
-# 4. Profile specified country, countries and or 'Total World'. This also includes plotting country shares of coal,
-# oil and gas production from above, and ensures this chart is included in each country, or world, profile's folder.
-def profile(country):
-    # Import country specific IEA data.
-    iea_co2_by_sector_Mt, iea_tfc_TJ = collate.import_iea_data(country)
+# Groups of charts that can be selected on the command line. Those in PROFILE_CHART_GROUPS are generated in each
+# country's profile.
+CHART_GROUPS = ('world-co2', 'rankings', 'co2', 'per-capita', 'ffprod', 'elecgen', 'finalenergy', 'sector',
+                'major-emitters')
+PROFILE_CHART_GROUPS = ('co2', 'per-capita', 'ffprod', 'elecgen', 'finalenergy', 'sector')
+
+# Functions of process.py called by collate.energy(), and the chart groups plotting their results. Each is only called
+# if one of its chart groups is selected.
+ENERGY_PROCESS_CHART_GROUPS = {
+    'primary_energy': ('ffprod',),
+    'electricity': ('elecgen', 'finalenergy'),
+    'sector_co2': ('sector',),
+    'final_energy': ('finalenergy',),
+}
+
+# User modules whose code determines collated data, so that memoized pipeline outputs are recalculated when they change.
+CODE_MODULES = ('collate', 'process', 'countries', 'cache', 'user_globals', __name__)
+
+
+########################################################################################################################
+#
+# Function: parse_args()
+#
+# Description:
+# Parses command line arguments selecting countries, chart groups, the output directory, the number of worker
+# processes and whether a run report is saved.
+#
+########################################################################################################################
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Creates charts for the site https://www.worldenergydata.org')
+    parser.add_argument('-c', '--countries', nargs='+', default=list(countries), metavar='COUNTRY',
+                        help="EI names of countries to profile, e.g. 'Total World' US China. Default: %(default)s.")
+    parser.add_argument('-g', '--charts', nargs='+', default=list(CHART_GROUPS), choices=CHART_GROUPS,
+                        metavar='GROUP', help='Groups of charts to generate, from: %(choices)s. Default: all.')
+    parser.add_argument('-o', '--output-dir', default='',
+                        help='Directory in which folders of charts are saved. Default: working directory.')
+    parser.add_argument('-w', '--workers', type=int, default=user_globals.Constant.PIPELINE_WORKERS.value,
+                        help='Number of processes running independent stages in parallel. Default: one per CPU.')
+    parser.add_argument('-r', '--report', metavar='FILE',
+                        help='Measure the time taken by each stage and chart, save the measurements to FILE as JSON '
+                             'and print a summary.')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='With --report, also measure peak memory allocated by Python, which slows the run.')
+    return parser.parse_args(argv)
+
+
+########################################################################################################################
+#
+# Functions: Pipeline tasks
+#
+# Description:
+# Each stage of chart generation below is run as a task by pipeline.run(), which calls it with the outputs of the tasks
+# it depends on (see tasks()). Tasks may run in separate worker processes, so those saving charts first set the output
+# directory of that process.
+#
+########################################################################################################################
+def collate_per_capita_emissions(ei_cube):
+    # Calculate per capita emissions of all countries, which are charted for every country profiled.
+    return collate.per_capita_emissions(ei_cube, collate.import_wb_data())
+
+
+def collate_global_carbon(ei_cube):
+    # Organise all CO2 related data as required for plots.
+    print('Processing CO2 data:\n')
+    gcp_data, gcp_co2_rcp_pathways = collate.import_gcp_data()
+    esrl_data = collate.import_esrl_data()
+    return collate.co2_data(ei_cube, gcp_data, gcp_co2_rcp_pathways, esrl_data)
+
+
+def world_co2_charts(global_carbon, output_root):
+    # Plot GCP and NOAA ESRL data.
+    output.set_output_root(output_root)
+    output.world_co2_charts(global_carbon)
+
+
+def collate_producer_shares(ei_data):
+    # Generate dataframes of major coal, oil and gas producers as required for plot of shares for final year of data.
+    print('\nIdentifying major fossil fuel producers:\n')
+    return collate.fossil_fuel_producer_shares(ei_data)
+
+
+def collate_producer_production(producer_shares, ei_cube):
+    major_coal_producers, major_oil_producers, major_gas_producers = producer_shares
+    return collate.major_fossil_fuel_production(
+        major_coal_producers,
+        major_oil_producers,
+        major_gas_producers,
+        # major_coal_consumers,
+        # major_oil_consumers,
+        # major_gas_consumers,
+        ei_cube)
+
+
+def world_ffprod_charts(producer_shares, producer_production, output_root):
+    # Plot major annual fossil fuel production (and at a later stage, consumption). Two versions will be plotted, the
+    # first being a simpler earlier version that may still be of use. These don't depend on the country profiled, so
+    # are plotted once, and the paths of the charts returned, to be included in each country, or world, profile's
+    # folder.
+    output.set_output_root(output_root)
+    major_coal_producers, major_oil_producers, major_gas_producers = producer_shares
+    return (output.world_ffprod_shares(major_coal_producers, major_oil_producers, major_gas_producers),
+            output.world_ffprod_stacked(producer_production))
+
+
+def collate_rankings(ei_cube):
+    # Calculate annual shares and rankings of countries for emissions and fossil fuel production.
+    print('\nRanking countries for all years:')
+    return collate.rankings(ei_cube)
+
+
+def save_rankings(country_rankings, output_root):
+    # Save rankings with overtakes between years.
+    output.set_output_root(output_root)
+    output.rankings(country_rankings)
+
+
+def collate_energy(ei_cube, country, iea, processes, pc_emissions=None):
     # Generate object containing all energy related data, in format suitable for plotting, for specified country.
-    country_energy_system = collate.energy(country, ei_data, iea_co2_by_sector_Mt, iea_tfc_TJ, wb_data)
+    # Country specific IEA data is imported, and the functions of process.py named in processes are called, if charts
+    # using them are selected.
+    if iea is True:
+        iea_co2_by_sector_Mt, iea_tfc_TJ = collate.import_iea_data(country)
+    else:
+        iea_co2_by_sector_Mt, iea_tfc_TJ = None, None
+    return collate.energy(country, ei_cube, iea_co2_by_sector_Mt, iea_tfc_TJ, pc_emissions, processes)
+
+
+def profile_charts(country_energy_system, chart_groups, output_root, global_carbon=None, ffprod_charts=None):
+    # Profile specified country, or 'Total World', generating the chart groups selected. This also includes the charts
+    # of country shares of coal, oil and gas production, plotted by world_ffprod_charts(), in each country, or world,
+    # profile's folder.
+    output.set_output_root(output_root)
+    print('\n\nGenerating charts for: ' + str(country_energy_system.country))
     if country_energy_system.incl_ei_flag is True:
-        output.country_co2_charts(country_energy_system, global_carbon)
-        output.per_capita_emissions(country_energy_system)
-        output.country_ffprod_primaryenergy_charts(country_energy_system)
-        output.country_elecgen_charts(country_energy_system)
-    if iea_co2_by_sector_Mt is not None:
+        if 'co2' in chart_groups:
+            output.country_co2_charts(country_energy_system, global_carbon)
+        if 'per-capita' in chart_groups:
+            output.per_capita_emissions(country_energy_system)
+        if 'ffprod' in chart_groups:
+            output.country_ffprod_primaryenergy_charts(country_energy_system)
+        if 'elecgen' in chart_groups:
+            output.country_elecgen_charts(country_energy_system)
+    if country_energy_system.sector_co2_Mt is not None and 'sector' in chart_groups:
         output.co2_by_sector_chart(country_energy_system)
-    if iea_tfc_TJ is not None and country_energy_system.incl_ei_flag is True:
+    if (country_energy_system.finalenergy_PJ is not None and country_energy_system.incl_ei_flag is True and
+            'finalenergy' in chart_groups):
         output.country_finalenergy_elec_charts(country_energy_system)
-    if iea_tfc_TJ is not None:
+    if country_energy_system.finalenergy_PJ is not None and 'finalenergy' in chart_groups:
         output.country_finalenergy_charts(country_energy_system)
-    # Plot major annual fossil fuel production (and at a later stage, consumption). Two versions will be plotted, the
-    # first being a simpler earlier version that may still be of use.
-    output.world_ffprod_shares(major_coal_producers, major_oil_producers, major_gas_producers,
-                               country_energy_system.country)
-    output.world_ffprod_stacked(country_energy_system.country, major_fossil_fuel_producer_data)
-
-for name in countries:
-    print('\n\nGenerating charts for: ' + str(name))
-    profile(name)
-
-# 5. Plot annual fossil fuel CO2 emissions and fossil fuel primary energy trends of Major Emitters in separate folder.
-# Identify major emitters.
-print('\n\nGenerating fossil fuel consumption charts of major emitting countries:\n')
-major_emitters = process.id_major_ffco2_emitters(global_carbon)
-# Collate major emitter data.
-major_emitter_dataframe = collate.populate_major_emitter_co2_energy_dataframe(major_emitters, ei_data)
-# Include plot of global CO2 emissions trend and shares in above folder.
-energy_system_world = collate.energy('Total World', ei_data, None, None, wb_data)
-# Plot world and major emitter charts.
-output.major_emitter_charts(energy_system_world, global_carbon, major_emitter_dataframe)
+    if 'ffprod' in chart_groups:
+        shares_path, stacked_path = ffprod_charts
+        output.link_world_ffprod_charts(shares_path, stacked_path, country_energy_system.country)
+
+
+def collate_major_emitters(global_carbon, ei_cube, pc_emissions=None):
+    # Identify major emitters and collate their data, with that of the world, whose global CO2 emissions trend and
+    # shares are included in the major emitters folder.
+    print('\n\nGenerating fossil fuel consumption charts of major emitting countries:\n')
+    major_emitters = process.id_major_ffco2_emitters(global_carbon)
+    major_emitter_dataframe = collate.populate_major_emitter_co2_energy_dataframe(major_emitters, ei_cube)
+    # Major emitter charts only use the world's CO2 emissions, so no energy calculations are needed.
+    energy_system_world = collate.energy('Total World', ei_cube, None, None, pc_emissions, processes=())
+    return energy_system_world, major_emitter_dataframe
+
+
+def major_emitter_charts(major_emitter_data, global_carbon, output_root):
+    # Plot annual fossil fuel CO2 emissions and fossil fuel primary energy trends of Major Emitters in separate folder,
+    # with world charts.
+    output.set_output_root(output_root)
+    energy_system_world, major_emitter_dataframe = major_emitter_data
+    output.major_emitter_charts(energy_system_world, global_carbon, major_emitter_dataframe)
+
+
+########################################################################################################################
+#
+# Function: tasks()
+#
+# Description:
+# Returns the pipeline tasks generating the chart groups selected for the countries specified, and the names of the
+# tasks saving charts, which are the targets run. Stages that only supply charts not selected are omitted. Each task
+# lists the input files it reads, so that memoized outputs are recalculated when files change. IEA data is imported by
+# each country's energy task, as it's contained in separate files provided by user.
+#
+########################################################################################################################
+def tasks(profile_names, selected, output_root):
+    chart_groups = tuple(sorted(selected))
+    task_list = [
+        # Import EI data, which collate.import_ei_data() caches itself, and pivot it into a Country x Var x Year cube,
+        # from which each country's data is sliced.
+        user_globals.Task('ei_data', collate.import_ei_data, sources=(user_globals.Constant.EI_FILENAME.value,),
+                          memoize=False),
+        user_globals.Task('ei_cube', collate.build_ei_cube, inputs={'ei_data': 'ei_data'}),
+    ]
+    targets = []
+    if 'per-capita' in selected:
+        task_list.append(user_globals.Task('pc_emissions', collate_per_capita_emissions, inputs={'ei_cube': 'ei_cube'},
+                                           sources=(user_globals.Constant.WB_FILENAME.value,)))
+    if selected & {'world-co2', 'co2', 'major-emitters'}:
+        task_list.append(user_globals.Task('global_carbon', collate_global_carbon, inputs={'ei_cube': 'ei_cube'},
+                                           sources=(user_globals.Constant.GCP_FILENAME.value,
+                                                    user_globals.Constant.GCP_PATHWAYS_FILENAME.value,
+                                                    user_globals.Constant.ESRL_CONC_FILENAME.value,
+                                                    user_globals.Constant.ESRL_CHANGE_FILENAME.value)))
+    if 'world-co2' in selected:
+        task_list.append(user_globals.Task('world_co2_charts', world_co2_charts,
+                                           inputs={'global_carbon': 'global_carbon'},
+                                           args={'output_root': output_root}, memoize=False))
+        targets.append('world_co2_charts')
+    if 'ffprod' in selected:
+        task_list.append(user_globals.Task('producer_shares', collate_producer_shares, inputs={'ei_data': 'ei_data'}))
+        task_list.append(user_globals.Task('producer_production', collate_producer_production,
+                                           inputs={'producer_shares': 'producer_shares', 'ei_cube': 'ei_cube'}))
+        task_list.append(user_globals.Task('world_ffprod_charts', world_ffprod_charts,
+                                           inputs={'producer_shares': 'producer_shares',
+                                                   'producer_production': 'producer_production'},
+                                           args={'output_root': output_root}, memoize=False))
+    if 'rankings' in selected:
+        task_list.append(user_globals.Task('rankings', collate_rankings, inputs={'ei_cube': 'ei_cube'}))
+        task_list.append(user_globals.Task('save_rankings', save_rankings, inputs={'country_rankings': 'rankings'},
+                                           args={'output_root': output_root}, memoize=False))
+        targets.append('save_rankings')
+
+    # Profile specified country, countries and or 'Total World'.
+    if selected & set(PROFILE_CHART_GROUPS):
+        iea = 'sector' in selected or 'finalenergy' in selected
+        processes = tuple(name for name, groups in ENERGY_PROCESS_CHART_GROUPS.items() if selected & set(groups))
+        for country in profile_names:
+            energy_inputs = {'ei_cube': 'ei_cube'}
+            if 'per-capita' in selected:
+                energy_inputs['pc_emissions'] = 'pc_emissions'
+            task_list.append(user_globals.Task('energy ' + country, collate_energy, inputs=energy_inputs,
+                                               args={'country': country, 'iea': iea, 'processes': processes},
+                                               sources=collate.iea_filenames(country) if iea else ()))
+            chart_inputs = {'country_energy_system': 'energy ' + country}
+            if 'co2' in selected:
+                chart_inputs['global_carbon'] = 'global_carbon'
+            if 'ffprod' in selected:
+                chart_inputs['ffprod_charts'] = 'world_ffprod_charts'
+            task_list.append(user_globals.Task('profile ' + country, profile_charts, inputs=chart_inputs,
+                                               args={'chart_groups': chart_groups, 'output_root': output_root},
+                                               memoize=False))
+            targets.append('profile ' + country)
+
+    if 'major-emitters' in selected:
+        emitter_inputs = {'global_carbon': 'global_carbon', 'ei_cube': 'ei_cube'}
+        if 'per-capita' in selected:
+            emitter_inputs['pc_emissions'] = 'pc_emissions'
+        task_list.append(user_globals.Task('major_emitters', collate_major_emitters, inputs=emitter_inputs))
+        task_list.append(user_globals.Task('major_emitter_charts', major_emitter_charts,
+                                           inputs={'major_emitter_data': 'major_emitters',
+                                                   'global_carbon': 'global_carbon'},
+                                           args={'output_root': output_root}, memoize=False))
+        targets.append('major_emitter_charts')
+    return task_list, targets
+
+
+########################################################################################################################
+#
+# Function: main()
+#
+# Description:
+# Runs the pipeline tasks generating the chart groups selected on the command line. Independent tasks, such as the
+# profiles of separate countries, run in parallel, and collated data is reused from earlier runs while its inputs are
+# unchanged. If a report is requested, the measurements of the run are saved and summarised.
+#
+########################################################################################################################
+def main(argv=None):
+    args = parse_args(argv)
+    instrument.configure(args.report is not None, args.trace_memory)
+    with instrument.measure('run', 'total'):
+        print('Importing and collating data.\n')
+        task_list, targets = tasks(args.countries, set(args.charts), args.output_dir)
+        pipeline.run(task_list, targets, args.workers, CODE_MODULES)
+    if args.report is not None:
+        run_records = instrument.collect()
+        instrument.save_report(args.report, run_records, vars(args))
+        instrument.print_summary(run_records)
+
+
+if __name__ == '__main__':
+    main()